@@ -0,0 +1,117 @@
+// SPDX-License-Identifier: GPL-3.0
+
+pragma solidity ^0.8.4;
+
+import "./WeightedRewardedAuction.sol";
+import "./tokens/AuctionableArchetype.sol";
+import "solady/src/utils/LibClone.sol";
+
+/**
+ * @dev Creates full auction stacks, an `AuctionableArchetype` collection
+ * and its `WeightedRewardedAuction` house, as minimal proxy clones that are
+ * initialized, linked and configured in a single transaction.
+ *
+ * The auction house implementation is deployed by the factory itself, so
+ * the factory is the `_deployer` of every clone and the only account that
+ * can initialize them. Both clones are owned by the caller once created.
+ */
+contract AuctionFactory {
+    /*´:°•.°+.*•´.*:˚.°*.˚•´.°:°•.°•.*•´.*:˚.°*.˚•´.°:°•.°+.*•´.*:*/
+    /*                           EVENTS                           */
+    /*.•°:°.´+˚.*°.˚:*.´•*.+°.•°:´*.´•*.•°.•°:°.´:•˚°.*°.˚:*.´+°.•*/
+
+    event StackCreated(address indexed owner, address nftContract, address auctionHouse);
+
+    /*´:°•.°+.*•´.*:˚.°*.˚•´.°:°•.°•.*•´.*:˚.°*.˚•´.°:°•.°+.*•´.*:*/
+    /*                          STORAGE                           */
+    /*.•°:°.´+˚.*°.˚:*.´•*.+°.•°:´*.´•*.•°.•°:°.´:•˚°.*°.˚:*.´+°.•*/
+
+    /**
+     * @dev Same parameters as `ScatterAuction.initialize`.
+     */
+    struct AuctionParams {
+        uint24 maxSupply;
+        uint96 reservePrice;
+        uint96 bidIncrement;
+        uint32 duration;
+        uint32 timeBuffer;
+    }
+
+    /**
+     * @dev Same parameters as `WeightedRewardedAuction.configureRewards`.
+     */
+    struct RewardsParams {
+        address rewardToken;
+        WeightedRewardedAuction.Ratio rewardRatio;
+        WeightedRewardedAuction.Ratio extraRatio;
+        bytes32 rewardableTokensHeldRoot;
+    }
+
+    /**
+     * @dev The `AuctionableArchetype` cloned for every collection.
+     */
+    address public immutable nftImplementation;
+
+    /**
+     * @dev The `WeightedRewardedAuction` cloned for every auction house.
+     */
+    address public immutable auctionImplementation;
+
+    /*´:°•.°+.*•´.*:˚.°*.˚•´.°:°•.°•.*•´.*:˚.°*.˚•´.°:°•.°+.*•´.*:*/
+    /*                        CONSTRUCTOR                         */
+    /*.•°:°.´+˚.*°.˚:*.´•*.+°.•°:´*.´•*.•°.•°:°.´:•˚°.*°.˚:*.´+°.•*/
+
+    /**
+     * @dev `AuctionableArchetype` has no deployer check, so any deployment
+     * can be used as `nftImplementation`.
+     */
+    constructor(address nftImplementation_) {
+        nftImplementation = nftImplementation_;
+        auctionImplementation = address(new WeightedRewardedAuction());
+    }
+
+    /*´:°•.°+.*•´.*:˚.°*.˚•´.°:°•.°•.*•´.*:˚.°*.˚•´.°:°•.°+.*•´.*:*/
+    /*              PUBLIC / EXTERNAL WRITE FUNCTIONS             */
+    /*.•°:°.´+˚.*°.˚:*.´•*.+°.•°:´*.´•*.•°.•°:°.´:•˚°.*°.˚:*.´+°.•*/
+
+    /**
+     * @dev Clones a collection and its auction house. `config.auctionHouse`
+     * is replaced by the new auction house, and royalties go to the caller
+     * unless `config.ownerAltPayout` is set.
+     */
+    function createStack(
+        string calldata name,
+        string calldata symbol,
+        Config calldata config,
+        AuctionParams calldata auction,
+        RewardsParams calldata rewards
+    ) external returns (address nftContract, address auctionHouse) {
+        nftContract = LibClone.clone(nftImplementation);
+        auctionHouse = LibClone.clone(auctionImplementation);
+
+        Config memory nftConfig = config;
+        nftConfig.auctionHouse = auctionHouse;
+        AuctionableArchetype(payable(nftContract)).initialize(name, symbol, nftConfig, msg.sender);
+
+        WeightedRewardedAuction house = WeightedRewardedAuction(auctionHouse);
+        house.initialize(
+            nftContract,
+            auction.maxSupply,
+            auction.reservePrice,
+            auction.bidIncrement,
+            auction.duration,
+            auction.timeBuffer
+        );
+        house.configureRewards(
+            rewards.rewardToken,
+            rewards.rewardRatio,
+            rewards.extraRatio,
+            rewards.rewardableTokensHeldRoot
+        );
+
+        AuctionableArchetype(payable(nftContract)).transferOwnership(msg.sender);
+        house.transferOwnership(msg.sender);
+
+        emit StackCreated(msg.sender, nftContract, auctionHouse);
+    }
+}
@@ -0,0 +1,37 @@
+// SPDX-License-Identifier: GPL-3.0
+
+pragma solidity ^0.8.4;
+
+/**
+ * @dev Aggregates many view calls on the auction, NFT and reward token
+ * contracts into a single `eth_call`.
+ */
+contract AuctionMulticall {
+
+	struct Call {
+		address target;
+		bytes callData;
+	}
+
+	struct Result {
+		bool success;
+		bytes returnData;
+	}
+
+	/**
+	 * @dev Failed calls don't revert the whole batch, they are returned
+	 * with `success` set to false.
+	 */
+	function aggregate(Call[] calldata calls)
+		external
+		view
+		returns (uint256 blockNumber, Result[] memory results)
+	{
+		blockNumber = block.number;
+		results = new Result[](calls.length);
+		for (uint256 i; i < calls.length; ++i) {
+			(results[i].success, results[i].returnData) =
+				calls[i].target.staticcall(calls[i].callData);
+		}
+	}
+}
@@ -0,0 +1,247 @@
+// SPDX-License-Identifier: GPL-3.0
+
+pragma solidity ^0.8.4;
+
+import "./ScatterAuction.sol";
+
+/**
+ * @dev `ScatterAuction` running up to `lotCount()` lots at the same time.
+ * Every lot has its own bidder, amount and end time, and gets settled and
+ * replaced by a new lot on its own with `settleLot`. The reserve price,
+ * bid increment, duration and time buffer are shared by all the lots.
+ *
+ * `_auctionData.nftId` is the last lot created, and `createBid(nftId)`
+ * bids on the live lot of `nftId`. `auctionData()` only carries the shared
+ * configuration: its bidder, amount, start and end times and `settled`
+ * describe no lot, read them with `liveLots` or `lot` instead. A lot that
+ * ends without bids keeps its NFT and runs again when settled.
+ */
+contract MultiLotAuction is ScatterAuction {
+    /*´:°•.°+.*•´.*:˚.°*.˚•´.°:°•.°•.*•´.*:˚.°*.˚•´.°:°•.°+.*•´.*:*/
+    /*                           EVENTS                           */
+    /*.•°:°.´+˚.*°.˚:*.´•*.+°.•°:´*.´•*.•°.•°:°.´:•˚°.*°.˚:*.´+°.•*/
+
+    event AuctionLotCountUpdated(uint256 lotCount);
+
+    /*´:°•.°+.*•´.*:˚.°*.˚•´.°:°•.°•.*•´.*:˚.°*.˚•´.°:°•.°+.*•´.*:*/
+    /*                          STORAGE                           */
+    /*.•°:°.´+˚.*°.˚:*.´•*.+°.•°:´*.´•*.•°.•°:°.´:•˚°.*°.˚:*.´+°.•*/
+
+    /**
+     * @dev A lot, packed in two slots: bids only write the first one,
+     * unless they extend the lot.
+     */
+    struct Lot {
+        // The address of the current highest bid.
+        address bidder;
+        // The current highest bid amount.
+        uint96 amount;
+        // The start time of the lot.
+        uint40 startTime;
+        // The end time of the lot.
+        uint40 endTime;
+        // ERC721 token ID. 0 if the slot is empty.
+        uint24 nftId;
+        // Whether or not the lot has been settled.
+        bool settled;
+    }
+
+    /**
+     * @dev The lot slots.
+     */
+    Lot[] internal _lots;
+
+    /**
+     * @dev Slot index plus one of every live lot, by NFT ID.
+     */
+    mapping(uint256 => uint256) internal _lotSlots;
+
+    /*´:°•.°+.*•´.*:˚.°*.˚•´.°:°•.°•.*•´.*:˚.°*.˚•´.°:°•.°+.*•´.*:*/
+    /*              PUBLIC / EXTERNAL VIEW FUNCTIONS              */
+    /*.•°:°.´+˚.*°.˚:*.´•*.+°.•°:´*.´•*.•°.•°:°.´:•˚°.*°.˚:*.´+°.•*/
+
+    /**
+     * @dev Returns the number of lots run at the same time.
+     */
+    function lotCount() external view returns (uint256) {
+        return _lots.length;
+    }
+
+    /**
+     * @dev Returns every lot that has not been settled yet, ended or not,
+     * so that a frontend needs a single call.
+     */
+    function liveLots() external view returns (Lot[] memory lots) {
+        uint256 n = _lots.length;
+        uint256 live;
+        for (uint256 i; i < n; ++i)
+            if (_isLive(_lots[i])) ++live;
+
+        lots = new Lot[](live);
+        live = 0;
+        for (uint256 i; i < n; ++i)
+            if (_isLive(_lots[i])) lots[live++] = _lots[i];
+    }
+
+    /**
+     * @dev Returns the live lot of `nftId`.
+     */
+    function lot(uint256 nftId) external view returns (Lot memory) {
+        uint256 slot = _lotSlots[nftId];
+        require(slot != 0, "Not a live lot.");
+        return _lots[slot - 1];
+    }
+
+    /**
+     * @dev Returns whether every live lot has ended, so that none of
+     * them takes bids anymore.
+     */
+    function hasEnded() public view override returns (bool) {
+        uint256 n = _lots.length;
+        for (uint256 i; i < n; ++i)
+            if (_isLive(_lots[i]) && block.timestamp < _lots[i].endTime) return false;
+        return true;
+    }
+
+    /*´:°•.°+.*•´.*:˚.°*.˚•´.°:°•.°•.*•´.*:˚.°*.˚•´.°:°•.°+.*•´.*:*/
+    /*              PUBLIC / EXTERNAL WRITE FUNCTIONS             */
+    /*.•°:°.´+˚.*°.˚:*.´•*.+°.•°:´*.´•*.•°.•°:°.´:•˚°.*°.˚:*.´+°.•*/
+
+    /**
+     * @dev Starts a new lot in every empty slot, while the max supply
+     * allows it. Returns the number of lots created.
+     */
+    function openLots() external returns (uint256 created) {
+        uint256 n = _lots.length;
+        for (uint256 i; i < n; ++i) {
+            if (_lots[i].nftId != 0 && !_lots[i].settled) continue;
+            if (!_openLot(i)) break;
+            ++created;
+        }
+    }
+
+    /**
+     * @dev Settles the ended lot of `nftId`, and replaces it with a new
+     * lot if the max supply allows it. A lot without bids is not sold:
+     * it keeps its NFT and starts again for another `duration`.
+     */
+    function settleLot(uint256 nftId) external {
+        uint256 slot = _lotSlots[nftId];
+        require(slot != 0, "Not a live lot.");
+        Lot storage lot_ = _lots[slot - 1];
+        require(block.timestamp >= lot_.endTime, "Auction still ongoing.");
+
+        address bidder = lot_.bidder;
+        uint256 amount = lot_.amount;
+        if (amount == 0) {
+            uint256 endTime = block.timestamp + _auctionData.duration;
+            lot_.startTime = SafeCastLib.toUint40(block.timestamp);
+            lot_.endTime = SafeCastLib.toUint40(endTime);
+            emit AuctionCreated(nftId, block.timestamp, endTime);
+            return;
+        }
+
+        lot_.settled = true;
+        delete _lotSlots[nftId];
+        emit AuctionSettled(nftId, bidder, amount);
+
+        // Replace the lot before the transfer, which calls the bidder: an
+        // `openLots` from there must not find the slot empty.
+        _openLot(slot - 1);
+
+        address nftContract = _auctionData.nftContract;
+        _payTreasury(nftContract, amount);
+        IAuctionedNFT(nftContract).safeTransferFrom(address(this), bidder, nftId);
+    }
+
+    /*´:°•.°+.*•´.*:˚.°*.˚•´.°:°•.°•.*•´.*:˚.°*.˚•´.°:°•.°+.*•´.*:*/
+    /*                   ADMIN WRITE FUNCTIONS                    */
+    /*.•°:°.´+˚.*°.˚:*.´•*.+°.•°:´*.´•*.•°.•°:°.´:•˚°.*°.˚:*.´+°.•*/
+
+    /**
+     * @dev Adds lot slots, up to `count`. Call `openLots` to start them.
+     * Slots can't be removed, as they may hold a live lot.
+     */
+    function setLotCount(uint8 count) external onlyOwner {
+        require(count >= _lots.length, "Cannot remove lots.");
+        while (_lots.length < count) _lots.push();
+        emit AuctionLotCountUpdated(count);
+    }
+
+    /*´:°•.°+.*•´.*:˚.°*.˚•´.°:°•.°•.*•´.*:˚.°*.˚•´.°:°•.°+.*•´.*:*/
+    /*                 INTERNAL / PRIVATE HELPERS                 */
+    /*.•°:°.´+˚.*°.˚:*.´•*.+°.•°:´*.´•*.•°.•°:°.´:•˚°.*°.˚:*.´+°.•*/
+
+    /**
+     * @dev Bids on the live lot of `nftId`. Lots are never created
+     * here, so the bid is always placed or reverted.
+     */
+    function _createBid(uint256 nftId, uint256 value) internal override returns (bool) {
+        uint256 slot = _lotSlots[nftId];
+        require(slot != 0, "Bid for wrong NFT ID.");
+        Lot storage lot_ = _lots[slot - 1];
+
+        address lastBidder = lot_.bidder;
+        uint256 amount = lot_.amount; // `uint96`.
+        uint256 endTime = lot_.endTime; // `uint40`.
+        require(block.timestamp < endTime, "Auction ended.");
+
+        if (amount == 0) {
+            require(value >= _auctionData.reservePrice, "Bid below reserve price.");
+        } else {
+            // Won't overflow. `amount` and `bidIncrement` are both stored as 96 bits.
+            require(value >= amount + _auctionData.bidIncrement, "Bid too low.");
+        }
+
+        lot_.bidder = msg.sender;
+        lot_.amount = SafeCastLib.toUint96(value); // Won't overflow on ETH mainnet.
+
+        uint256 timeBuffer = _auctionData.timeBuffer;
+        // Extend the lot if the bid was received within `timeBuffer` of its end time.
+        bool extended = timeBuffer != 0 && endTime < block.timestamp + timeBuffer;
+        emit AuctionBid(nftId, msg.sender, value, extended);
+
+        if (extended) {
+            lot_.endTime = SafeCastLib.toUint40(block.timestamp + timeBuffer);
+            emit AuctionExtended(nftId, block.timestamp + timeBuffer);
+        }
+
+        if (amount != 0) {
+            // Refund the last bidder.
+            _refund(lastBidder, amount);
+        }
+
+        return true;
+    }
+
+    /**
+     * @dev Starts the next lot in `slot`. Returns false when the
+     * max supply has been reached.
+     */
+    function _openLot(uint256 slot) internal returns (bool) {
+        uint256 nftId = uint256(_auctionData.nftId) + 1;
+        if (nftId > _auctionData.maxSupply) return false;
+
+        nftId = _mintLot(nftId);
+        _auctionData.nftId = SafeCastLib.toUint24(nftId);
+
+        uint256 endTime = block.timestamp + _auctionData.duration;
+        _lots[slot] = Lot({
+            bidder: address(1),
+            amount: 0,
+            startTime: SafeCastLib.toUint40(block.timestamp),
+            endTime: SafeCastLib.toUint40(endTime),
+            nftId: SafeCastLib.toUint24(nftId),
+            settled: false
+        });
+        _lotSlots[nftId] = slot + 1;
+
+        emit AuctionCreated(nftId, block.timestamp, endTime);
+
+        return true;
+    }
+
+    function _isLive(Lot storage lot_) internal view returns (bool) {
+        return lot_.nftId != 0 && !lot_.settled;
+    }
+}
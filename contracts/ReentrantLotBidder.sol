@@ -0,0 +1,25 @@
+// SPDX-License-Identifier: GPL-3.0
+
+pragma solidity ^0.8.4;
+
+import "./MultiLotAuction.sol";
+
+/**
+ * @dev Test bidder that calls `openLots` back when it receives a lot.
+ */
+contract ReentrantLotBidder {
+    MultiLotAuction public immutable auction;
+
+    constructor(MultiLotAuction auction_) {
+        auction = auction_;
+    }
+
+    function createBid(uint256 nftId) external payable {
+        auction.createBid{value: msg.value}(nftId);
+    }
+
+    function onERC721Received(address, address, uint256, bytes calldata) external returns (bytes4) {
+        auction.openLots();
+        return this.onERC721Received.selector;
+    }
+}
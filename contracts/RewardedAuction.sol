@@ -14,9 +14,13 @@ contract RewardedAuction is ScatterAuction, IHoldsShares {
 	mapping(address => bool) private _allowSharesUpdate;
 
 
-    function createBid(uint256 nftId) override public payable {
-		super.createBid(nftId);
-		_rewardTokenShares[msg.sender] += msg.value;
+	function _createBid(uint256 nftId, uint256 value)
+		internal
+		override
+		returns (bool placed)
+	{
+		placed = super._createBid(nftId, value);
+		if (placed) _rewardTokenShares[msg.sender] += value;
 	}
 	
 	// TODO test msg.sender
@@ -20,6 +20,12 @@ contract ScatterAuction is OwnableUpgradeable {
     event AuctionReservePriceUpdated(uint256 reservePrice);
     event AuctionBidIncrementUpdated(uint256 bidIncrement);
     event AuctionDurationUpdated(uint256 duration);
+    event AuctionCreditModeUpdated(bool creditMode);
+    event AuctionCreditWithdrawn(address indexed bidder, uint256 amount);
+    event AuctionDeferredTreasuryUpdated(bool deferredTreasury);
+    event AuctionTreasurySwept(uint256 amount);
+    event AuctionPremintBatchSizeUpdated(uint256 premintBatchSize);
+    event AuctionLotsPreminted(uint256 firstNftId, uint256 lastNftId);
 
     /*´:°•.°+.*•´.*:˚.°*.˚•´.°:°•.°•.*•´.*:˚.°*.˚•´.°:°•.°+.*•´.*:*/
     /*                          STORAGE                           */
@@ -37,6 +43,10 @@ contract ScatterAuction is OwnableUpgradeable {
      *   Currently, there is only 120,523,060 ETH in existence.
      *
      * - `uint40` is enough to represent timestamps up to year 36811 A.D.
+     *
+     * - `creditMode` and `deferredTreasury` fill the unused bytes of the
+     *   slot of `startTime`, which every bid and settlement already loads,
+     *   so checking them costs no extra cold storage read.
      */
     struct AuctionData {
 	    // The address of the current highest bid.
@@ -53,6 +63,12 @@ contract ScatterAuction is OwnableUpgradeable {
         uint24 maxSupply;
         // Whether or not the auction has been settled.
         bool settled;
+        // Whether outbid amounts are credited to the bidders
+        // instead of being sent back on every new bid.
+        bool creditMode;
+        // Whether settled proceeds are kept in `_pendingTreasury`
+        // instead of being sent to the NFT contract on every settlement.
+        bool deferredTreasury;
         // The ERC721 token contract.
 		// TODO refactor to "token"
         address nftContract;
@@ -74,6 +90,29 @@ contract ScatterAuction is OwnableUpgradeable {
      */
     AuctionData internal _auctionData;
 
+    /**
+     * @dev ETH owed to outbid bidders while `creditMode` is on.
+     * It can be spent on new bids or withdrawn at any time.
+     */
+    mapping(address => uint256) internal _credits;
+
+    /**
+     * @dev Settled proceeds not yet sent to the NFT contract,
+     * only touched in `deferredTreasury` mode.
+     */
+    uint96 internal _pendingTreasury;
+
+    /**
+     * @dev Last NFT ID minted ahead of its auction, see `premint`.
+     */
+    uint24 internal _premintedUntil;
+
+    /**
+     * @dev Number of lots minted at once when `_createAuction` runs out of
+     * pre-minted ones. 0 mints a single lot per auction.
+     */
+    uint16 public premintBatchSize;
+
     /**
      * @dev The address that deployed the contract.
      */
@@ -131,13 +170,49 @@ contract ScatterAuction is OwnableUpgradeable {
     function auctionData() external view returns (AuctionData memory data) {
         data = _auctionData;
         // Load some extra data regarding the NFT contract.
-        data.nftContractBalance = address(_auctionData.nftContract).balance;
+        data.nftContractBalance =
+            address(_auctionData.nftContract).balance + _pendingTreasury;
+    }
+
+    /**
+     * @dev Returns the last NFT ID already minted for a future auction.
+     */
+    function premintedUntil() external view returns (uint256) {
+        return _premintedUntil;
+    }
+
+    /**
+     * @dev Returns whether outbid amounts are credited instead of refunded.
+     */
+    function creditMode() external view returns (bool) {
+        return _auctionData.creditMode;
+    }
+
+    /**
+     * @dev Returns whether settled proceeds wait for `sweepTreasury`.
+     */
+    function deferredTreasury() external view returns (bool) {
+        return _auctionData.deferredTreasury;
+    }
+
+    /**
+     * @dev Returns the settled proceeds waiting for `sweepTreasury`.
+     */
+    function pendingTreasury() external view returns (uint256) {
+        return _pendingTreasury;
+    }
+
+    /**
+     * @dev Returns the credit `bidder` can spend or withdraw.
+     */
+    function creditOf(address bidder) external view returns (uint256) {
+        return _credits[bidder];
     }
 
     /**
      * @dev Returns whether the auction has ended.
      */
-    function hasEnded() public view returns (bool) {
+    function hasEnded() public view virtual returns (bool) {
         return block.timestamp >= _auctionData.endTime;
     }
 
@@ -152,79 +227,31 @@ contract ScatterAuction is OwnableUpgradeable {
      * The frontend should pass in the next `nftId` when the auction has ended.
      */
     function createBid(uint256 nftId) public payable virtual {
-        // To prevent gas under-estimation.
-        require(gasleft() > 150000);
-
-        /* ------- AUTOMATIC AUCTION CREATION AND SETTLEMENT -------- */
-
-        bool creationFailed;
-        if (_auctionData.startTime == 0) {
-            // If the first auction has not been created,
-            // try to create a new auction.
-            creationFailed = !_createAuction();
-        } else if (hasEnded()) {
-            if (_auctionData.settled) {
-                // If the auction has ended, and is settled, try to create a new auction.
-                creationFailed = !_createAuction();
-            } else {
-                // Otherwise, if the auction has ended, but is yet been settled, settle it.
-                _settleAuction();
-                // After settling the auction, try to create a new auction.
-                if (!_createAuction()) {
-                    // If the creation fails, it means that maxSupply was exceded
-                    // In this case, refund all the ETH sent and early return.
-                    SafeTransferLib.forceSafeTransferETH(msg.sender, msg.value);
-                    return;
-                }
-            }
-        }
-        // If the auction creation fails, we must revert to prevent any bids.
-        require(!creationFailed, "Cannot create auction.");
-
-        /* --------------------- BIDDING LOGIC ---------------------- */
-
-        address lastBidder = _auctionData.bidder;
-        uint256 amount = _auctionData.amount; // `uint96`.
-        uint256 endTime = _auctionData.endTime; // `uint40`.
-
-        // Ensures that the `nftId` is equal to the auction's.
-        // This prevents the following scenarios:
-        // - A bidder bids a high price near closing time, the next auction starts,
-        //   and the high bid gets accepted as the starting bid for the next auction.
-        // - A bidder bids for the next auction due to frontend being ahead of time,
-        //   but the current auction gets extended,
-        //   and the bid gets accepted for the current auction.
-        require(nftId == _auctionData.nftId, "Bid for wrong NFT ID.");
-
-        if (amount == 0) {
-            require(msg.value >= _auctionData.reservePrice, "Bid below reserve price.");
-        } else {
-            // Won't overflow. `amount` and `bidIncrement` are both stored as 96 bits.
-            require(msg.value >= amount + _auctionData.bidIncrement, "Bid too low.");
-        }
-
-        _auctionData.bidder = msg.sender;
-        _auctionData.amount = SafeCastLib.toUint96(msg.value); // Won't overflow on ETH mainnet.
+        _createBid(nftId, msg.value);
+    }
 
-        if (_auctionData.timeBuffer == 0) {
-            emit AuctionBid(nftId, msg.sender, msg.value, false);
-        } else {
-            // Extend the auction if the bid was received within `timeBuffer` of the auction end time.
-            uint256 extendedTime = block.timestamp + _auctionData.timeBuffer;
-            // Whether the current timestamp falls within the time extension buffer period.
-            bool extended = endTime < extendedTime;
-            emit AuctionBid(nftId, msg.sender, msg.value, extended);
+    /**
+     * @dev Same as `createBid`, but `credit` of the caller's credit is
+     * added to `msg.value`. If the bid gets refunded because the max
+     * supply was reached, the credit is given back.
+     */
+    function createBidWithCredit(uint256 nftId, uint256 credit) external payable {
+        uint256 available = _credits[msg.sender];
+        require(credit <= available, "Not enough credit.");
+        _credits[msg.sender] = available - credit;
 
-            if (extended) {
-                _auctionData.endTime = SafeCastLib.toUint40(extendedTime);
-                emit AuctionExtended(nftId, extendedTime);
-            }
-        }
+        if (!_createBid(nftId, msg.value + credit)) _credits[msg.sender] += credit;
+    }
 
-        if (amount != 0) {
-            // Refund the last bidder.
-            SafeTransferLib.forceSafeTransferETH(lastBidder, amount);
-        }
+    /**
+     * @dev Sends the caller all of its credit.
+     */
+    function withdrawCredit() external {
+        uint256 amount = _credits[msg.sender];
+        require(amount != 0, "No credit.");
+        _credits[msg.sender] = 0;
+        SafeTransferLib.safeTransferETH(msg.sender, amount);
+        emit AuctionCreditWithdrawn(msg.sender, amount);
     }
 
     /**
@@ -241,6 +268,19 @@ contract ScatterAuction is OwnableUpgradeable {
         _settleAuction();
     }
 
+    /**
+     * @dev Sends the settled proceeds kept while `deferredTreasury` is on
+     * to the NFT contract. Anyone may call it, as the ETH can only go
+     * to the NFT contract. Does nothing if there is nothing to send.
+     */
+    function sweepTreasury() public {
+        uint256 amount = _pendingTreasury;
+        if (amount == 0) return;
+        _pendingTreasury = 0;
+        SafeTransferLib.safeTransferETH(_auctionData.nftContract, amount);
+        emit AuctionTreasurySwept(amount);
+    }
+
     /*´:°•.°+.*•´.*:˚.°*.˚•´.°:°•.°•.*•´.*:˚.°*.˚•´.°:°•.°+.*•´.*:*/
     /*                   ADMIN WRITE FUNCTIONS                    */
     /*.•°:°.´+˚.*°.˚:*.´•*.+°.•°:´*.´•*.•°.•°:°.´:•˚°.*°.˚:*.´+°.•*/
@@ -280,6 +320,46 @@ contract ScatterAuction is OwnableUpgradeable {
         emit AuctionTimeBufferUpdated(timeBuffer);
     }
 
+    /**
+     * @dev Set whether outbid amounts are credited instead of refunded.
+     * Credit given before turning it off can still be spent or withdrawn.
+     */
+    function setCreditMode(bool enabled) external onlyOwner {
+        _auctionData.creditMode = enabled;
+        emit AuctionCreditModeUpdated(enabled);
+    }
+
+    /**
+     * @dev Set whether settled proceeds are accumulated and swept in bulk.
+     * Turning it off sweeps what is pending.
+     */
+    function setDeferredTreasury(bool enabled) external onlyOwner {
+        _auctionData.deferredTreasury = enabled;
+        emit AuctionDeferredTreasuryUpdated(enabled);
+        if (!enabled) sweepTreasury();
+    }
+
+    /**
+     * @dev Set the number of lots minted at once by `_createAuction`.
+     * ERC721A batch mints cost about the same as single ones,
+     * so the cost of minting gets spread over many auctions.
+     */
+    function setPremintBatchSize(uint16 batchSize) external onlyOwner {
+        premintBatchSize = batchSize;
+        emit AuctionPremintBatchSizeUpdated(batchSize);
+    }
+
+    /**
+     * @dev Mints the next `quantity` lots up front, so that the bidders
+     * starting their auctions don't pay for the mint.
+     */
+    function premint(uint256 quantity) external onlyOwner {
+        uint256 minted = _premintedUntil;
+        if (minted < _auctionData.nftId) minted = _auctionData.nftId;
+        require(minted + quantity <= _auctionData.maxSupply, "Exceeds max supply.");
+        _premint(quantity);
+    }
+
     /*´:°•.°+.*•´.*:˚.°*.˚•´.°:°•.°•.*•´.*:˚.°*.˚•´.°:°•.°+.*•´.*:*/
     /*                 EVENT EMITTERS FOR TESTING                 */
     /*.•°:°.´+˚.*°.˚:*.´•*.+°.•°:´*.´•*.•°.•°:°.´:•˚°.*°.˚:*.´+°.•*/
@@ -313,6 +393,99 @@ contract ScatterAuction is OwnableUpgradeable {
     /*                 INTERNAL / PRIVATE HELPERS                 */
     /*.•°:°.´+˚.*°.˚:*.´•*.+°.•°:´*.´•*.•°.•°:°.´:•˚°.*°.˚:*.´+°.•*/
 
+    /**
+     * @dev Bidding logic of `createBid`, for a bid of `value` wei.
+     * Returns whether the bid was placed. It is not when the auction
+     * got settled and the max supply was reached, in which case
+     * `msg.value` is sent back.
+     */
+    function _createBid(uint256 nftId, uint256 value) internal virtual returns (bool) {
+        // To prevent gas under-estimation.
+        require(gasleft() > 150000);
+
+        /* ------- AUTOMATIC AUCTION CREATION AND SETTLEMENT -------- */
+
+        bool creationFailed;
+        if (_auctionData.startTime == 0) {
+            // If the first auction has not been created,
+            // try to create a new auction.
+            creationFailed = !_createAuction();
+        } else if (hasEnded()) {
+            if (_auctionData.settled) {
+                // If the auction has ended, and is settled, try to create a new auction.
+                creationFailed = !_createAuction();
+            } else {
+                // Otherwise, if the auction has ended, but is yet been settled, settle it.
+                _settleAuction();
+                // After settling the auction, try to create a new auction.
+                if (!_createAuction()) {
+                    // If the creation fails, it means that maxSupply was exceded
+                    // In this case, refund all the ETH sent and early return.
+                    SafeTransferLib.forceSafeTransferETH(msg.sender, msg.value);
+                    return false;
+                }
+            }
+        }
+        // If the auction creation fails, we must revert to prevent any bids.
+        require(!creationFailed, "Cannot create auction.");
+
+        /* --------------------- BIDDING LOGIC ---------------------- */
+
+        address lastBidder = _auctionData.bidder;
+        uint256 amount = _auctionData.amount; // `uint96`.
+        uint256 endTime = _auctionData.endTime; // `uint40`.
+
+        // Ensures that the `nftId` is equal to the auction's.
+        // This prevents the following scenarios:
+        // - A bidder bids a high price near closing time, the next auction starts,
+        //   and the high bid gets accepted as the starting bid for the next auction.
+        // - A bidder bids for the next auction due to frontend being ahead of time,
+        //   but the current auction gets extended,
+        //   and the bid gets accepted for the current auction.
+        require(nftId == _auctionData.nftId, "Bid for wrong NFT ID.");
+
+        if (amount == 0) {
+            require(value >= _auctionData.reservePrice, "Bid below reserve price.");
+        } else {
+            // Won't overflow. `amount` and `bidIncrement` are both stored as 96 bits.
+            require(value >= amount + _auctionData.bidIncrement, "Bid too low.");
+        }
+
+        _auctionData.bidder = msg.sender;
+        _auctionData.amount = SafeCastLib.toUint96(value); // Won't overflow on ETH mainnet.
+
+        if (_auctionData.timeBuffer == 0) {
+            emit AuctionBid(nftId, msg.sender, value, false);
+        } else {
+            // Extend the auction if the bid was received within `timeBuffer` of the auction end time.
+            uint256 extendedTime = block.timestamp + _auctionData.timeBuffer;
+            // Whether the current timestamp falls within the time extension buffer period.
+            bool extended = endTime < extendedTime;
+            emit AuctionBid(nftId, msg.sender, value, extended);
+
+            if (extended) {
+                _auctionData.endTime = SafeCastLib.toUint40(extendedTime);
+                emit AuctionExtended(nftId, extendedTime);
+            }
+        }
+
+        if (amount != 0) {
+            // Refund the last bidder.
+            _refund(lastBidder, amount);
+        }
+
+        return true;
+    }
+
+    /**
+     * @dev Gives `amount` back to an outbid bidder, as credit
+     * in `creditMode` or in ETH otherwise.
+     */
+    function _refund(address bidder, uint256 amount) internal {
+        if (_auctionData.creditMode) _credits[bidder] += amount;
+        else SafeTransferLib.forceSafeTransferETH(bidder, amount);
+    }
+
     /**
      * @dev Create an auction.
      * Stores the auction details in the `auction` state variable
@@ -324,7 +497,7 @@ contract ScatterAuction is OwnableUpgradeable {
 	
         if (nftId > _auctionData.maxSupply) return false;
 
-        nftId = IAuctionedNFT(_auctionData.nftContract).mint();
+        nftId = _mintLot(nftId);
 	
         uint256 endTime = block.timestamp + _auctionData.duration;
 		
@@ -349,7 +522,7 @@ contract ScatterAuction is OwnableUpgradeable {
         uint256 nftId = _auctionData.nftId;
         address nftContract = _auctionData.nftContract;
 
-		payable(nftContract).transfer(amount);
+        _payTreasury(nftContract, amount);
         IAuctionedNFT(nftContract).safeTransferFrom(
 			address(this), bidder, nftId
 		);
@@ -359,6 +532,45 @@ contract ScatterAuction is OwnableUpgradeable {
         emit AuctionSettled(nftId, bidder, amount);
     }
 
+    /**
+     * @dev Mints lot `nftId`, or takes it from the pre-minted ones.
+     * Returns its token ID.
+     */
+    function _mintLot(uint256 nftId) internal returns (uint256) {
+        if (nftId <= _premintedUntil) return nftId;
+
+        uint256 batchSize = premintBatchSize;
+        if (batchSize == 0) return IAuctionedNFT(_auctionData.nftContract).mint();
+
+        // Never mints past `maxSupply`.
+        uint256 left = _auctionData.maxSupply - nftId + 1;
+        _premint(batchSize < left ? batchSize : left);
+        return nftId;
+    }
+
+    /**
+     * @dev Sends the proceeds of a lot to the NFT contract,
+     * or keeps them until `sweepTreasury` in `deferredTreasury` mode.
+     */
+    function _payTreasury(address nftContract, uint256 amount) internal {
+        if (_auctionData.deferredTreasury) {
+            // Won't overflow on ETH mainnet.
+            _pendingTreasury += SafeCastLib.toUint96(amount);
+        } else {
+            payable(nftContract).transfer(amount);
+        }
+    }
+
+    /**
+     * @dev Mints the next `quantity` lots to this contract.
+     * They are sold in order by the next auctions.
+     */
+    function _premint(uint256 quantity) internal {
+        uint256 lastNftId = IAuctionedNFT(_auctionData.nftContract).mintBatch(quantity);
+        _premintedUntil = SafeCastLib.toUint24(lastNftId);
+        emit AuctionLotsPreminted(lastNftId + 1 - quantity, lastNftId);
+    }
+
     /**
      * @dev Checks whether `reservePrice` is greater than 0.
      */
@@ -389,5 +601,11 @@ interface IAuctionedNFT {
      * @dev Allows the minter to mint a NFT to itself.
      */
     function mint() external returns (uint256 tokenId);
+
+    /**
+     * @dev Allows the minter to mint `quantity` NFTs to itself at once.
+     * Returns the last minted token ID.
+     */
+    function mintBatch(uint256 quantity) external returns (uint256 lastTokenId);
 }
 
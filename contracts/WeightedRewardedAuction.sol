@@ -19,9 +19,37 @@ contract WeightedRewardedAuction is ScatterAuction {
 	}
 
 	/**
-     * @dev Amount of eth bidded by an address.
+	 * @dev `Ratio`s as they are stored, packed in a single slot so
+	 * that they are read once per call. 56 bits per component leaves no
+	 * room for wider ratios next to `rootEpoch`. `rootEpoch` goes up every time
+	 * `configureRewards` changes the merkle root.
+	 */
+	struct RewardsConfig {
+		uint56 rewardX; uint56 rewardY;
+		uint56 extraX; uint56 extraY;
+		uint32 rootEpoch;
+	}
+
+	/**
+	 * @dev Rewards of a bidder, packed in a single slot.
+	 * `claimed` is kept set after the first claim, so later
+	 * bids update a non-zero slot.
+	 */
+	struct BidderRewards {
+		// Amount of eth bidded since the last claim.
+		uint96 shares;
+		// Whether or not the bidder claimed at least once.
+		bool claimed;
+		// Rewardable tokens held, as proven during `verifiedEpoch`.
+		uint96 verifiedHeld;
+		// Root epoch of the last verified proof, 0 if none.
+		uint32 verifiedEpoch;
+	}
+
+	/**
+     * @dev Rewards of every bidder.
      */
-    mapping(address => uint256) internal _rewardTokenShares;
+    mapping(address => BidderRewards) internal _bidderRewards;
 
 	/**
 	 * @dev Reward token held by this contract to redistribute
@@ -36,17 +64,13 @@ contract WeightedRewardedAuction is ScatterAuction {
 	address internal _rewardsBoosterStorage;
 	
 	/**
-     * @dev Ratio of reward tokens to give a bidder for every eth
-	 * bidded. 
+     * @dev `reward` is the ratio of reward tokens to give a bidder
+	 * for every eth bidded. `extra` is the decimal weight for extra
+	 * rewards based on rewardable tokens held, see
+	 * `rewardsBoosterStorage`. Set it to (0,0) if you want to disable
+	 * extra rewards.
      */
-	Ratio internal _rewardRatio = Ratio(1, 1);
-	
-	/**
-	 * @dev Decimal weight for extra rewards based on rewardable
-	 * tokens held. See `rewardsBoosterStorage`. Set to (0,0)
-	 * if you want to disable extra rewards.
-	 */
-	Ratio internal _extraRewardWeighing = Ratio(0, 0);
+	RewardsConfig internal _rewardsConfig = RewardsConfig(1, 1, 0, 0, 0);
 	
 	/**
 	 * @dev Merkle root that holds (address, rewardableTokensHeld) pairs.
@@ -54,13 +78,73 @@ contract WeightedRewardedAuction is ScatterAuction {
 	bytes32 public rewardableTokensHeldPerWalletRoot;
 
 
-    function createBid(uint256 nftId) override public payable {
-		super.createBid(nftId);
-		_rewardTokenShares[msg.sender] += msg.value;
+	function _createBid(uint256 nftId, uint256 value)
+		internal
+		override
+		returns (bool placed)
+	{
+		placed = super._createBid(nftId, value);
+		// Won't overflow on ETH mainnet.
+		if (placed) _bidderRewards[msg.sender].shares += SafeCastLib.toUint96(value);
 	}
 
 	function getSharesFor(address bidder) public view returns (uint256) {
-		return _rewardTokenShares[bidder];
+		return _bidderRewards[bidder].shares;
+	}
+
+	function hasClaimedRewards(address bidder) public view returns (bool) {
+		return _bidderRewards[bidder].claimed;
+	}
+
+	/**
+	 * @dev Rewardable tokens held by `bidder`, if it has already proven
+	 * them under the current merkle root. Claims then skip the proof.
+	 */
+	function getVerifiedHoldings(address bidder)
+		external
+		view
+		returns (bool verified, uint256 uniqueDerivsHeld)
+	{
+		BidderRewards memory rewards = _bidderRewards[bidder];
+		uint256 epoch = _rewardsConfig.rootEpoch;
+		if (epoch != 0 && rewards.verifiedEpoch == epoch)
+			return (true, rewards.verifiedHeld);
+	}
+
+	/**
+	 * @dev Bulk version of `getSharesFor`, to compute off-chain the rewards
+	 * of every bidder with a single call.
+	 */
+	function getSharesForMany(address[] calldata bidders)
+		external
+		view
+		returns (uint256[] memory shares)
+	{
+		shares = new uint256[](bidders.length);
+		for (uint256 i; i < bidders.length; ++i)
+			shares[i] = _bidderRewards[bidders[i]].shares;
+	}
+
+	/**
+	 * @dev Returns the configuration set by `configureRewards`.
+	 */
+	function getRewardsConfig()
+		external
+		view
+		returns (
+			address rewardToken,
+			Ratio memory rewardRatio,
+			Ratio memory extraRatio,
+			bytes32 rewardableTokensHeldRoot
+		)
+	{
+		RewardsConfig memory config = _rewardsConfig;
+		return (
+			_rewardToken,
+			Ratio(config.rewardX, config.rewardY),
+			Ratio(config.extraX, config.extraY),
+			rewardableTokensHeldPerWalletRoot
+		);
 	}
 
 	/**
@@ -73,35 +157,88 @@ contract WeightedRewardedAuction is ScatterAuction {
 		view 
 		returns (uint256) 
 	{
-		uint256 share = _rewardTokenShares[bidder];
-		uint256 baseAmount = share * _rewardRatio.x / _rewardRatio.y;
-
-		if (!extraRewardsSupported()) return baseAmount;
-
-		return baseAmount * (
-			1 + uniqueDerivsHeld * _extraRewardWeighing.x / _extraRewardWeighing.y
+		return _rewardsFor(
+			_bidderRewards[bidder].shares, uniqueDerivsHeld, _rewardsConfig
 		);
 	}
 
+	/**
+	 * @dev Once a proof has been verified, later claims under the same
+	 * merkle root use the cached `uniqueDerivsHeld`, and `proof` can be
+	 * left empty. See `getVerifiedHoldings`.
+	 */
 	function claimRewardTokensBasedOnShares(
 		bytes32[] memory proof, uint96 uniqueDerivsHeld
 	) public {
-		require(_rewardToken != address(0), "No reward token for this auction.");
-		require(_rewardTokenShares[msg.sender] > 0, "No reward tokens to claim.");
+		address rewardToken = _rewardToken;
+		require(rewardToken != address(0), "No reward token for this auction.");
+		BidderRewards memory rewards = _bidderRewards[msg.sender];
+		uint256 shares = rewards.shares;
+		require(shares > 0, "No reward tokens to claim.");
 
-		if (
-			extraRewardsSupported() &&
-			!checkBidderRewardableTokens(proof, msg.sender, uniqueDerivsHeld)
-		)
+		RewardsConfig memory config = _rewardsConfig;
+		if (!_extraRewardsSupported(config)) {
 			uniqueDerivsHeld = 0;
+		} else if (config.rootEpoch != 0 && rewards.verifiedEpoch == config.rootEpoch) {
+			uniqueDerivsHeld = rewards.verifiedHeld;
+		} else if (checkBidderRewardableTokens(proof, msg.sender, uniqueDerivsHeld)) {
+			rewards.verifiedHeld = uniqueDerivsHeld;
+			rewards.verifiedEpoch = config.rootEpoch;
+		} else {
+			uniqueDerivsHeld = 0;
+		}
 		
+		rewards.shares = 0;
+		rewards.claimed = true;
+		_bidderRewards[msg.sender] = rewards;
+		IERC20(rewardToken).transfer(
+			msg.sender, _rewardsFor(shares, uniqueDerivsHeld, config)
+		);
+	}
+
+	/**
+	 * @dev Pays many bidders their `getRewardsFor` amount in one call.
+	 * When extra rewards are enabled, the `(bidder, uniqueDerivsHeld)`
+	 * leaves of every bidder with `uniqueDerivsHeld > 0` are checked at
+	 * once with a single multiproof. Those bidders must come in the same
+	 * order as their leaves in the tree. Bidders without shares are skipped.
+	 */
+	function distributeRewards(
+		address[] calldata bidders,
+		uint96[] calldata uniqueDerivsHeld,
+		bytes32[] memory proof,
+		bool[] memory flags
+	) external onlyOwner {
 		IERC20 token = IERC20(_rewardToken);
-		token.transfer(msg.sender, getRewardsFor(msg.sender, uniqueDerivsHeld));
-		_rewardTokenShares[msg.sender] = 0;
+		require(address(token) != address(0), "No reward token for this auction.");
+		require(bidders.length == uniqueDerivsHeld.length, "Length mismatch.");
+
+		RewardsConfig memory config = _rewardsConfig;
+		if (_extraRewardsSupported(config))
+			require(_checkRewardableTokensMultiProof(
+				bidders, uniqueDerivsHeld, proof, flags
+			), "Invalid multiproof.");
+
+		for (uint256 i; i < bidders.length; ++i) {
+			address bidder = bidders[i];
+			BidderRewards memory rewards = _bidderRewards[bidder];
+			uint256 shares = rewards.shares;
+			if (shares == 0) continue;
+
+			rewards.shares = 0;
+			rewards.claimed = true;
+			// Holdings checked by the multiproof are cached as well.
+			if (uniqueDerivsHeld[i] != 0 && _extraRewardsSupported(config)) {
+				rewards.verifiedHeld = uniqueDerivsHeld[i];
+				rewards.verifiedEpoch = config.rootEpoch;
+			}
+			_bidderRewards[bidder] = rewards;
+			token.transfer(bidder, _rewardsFor(shares, uniqueDerivsHeld[i], config));
+		}
 	}
 
 	function extraRewardsSupported() public view returns (bool) {
-		return _extraRewardWeighing.x != 0 && _extraRewardWeighing.y != 0;
+		return _extraRewardsSupported(_rewardsConfig);
 	}
 	
 	function checkBidderRewardableTokens(
@@ -115,10 +252,60 @@ contract WeightedRewardedAuction is ScatterAuction {
 		);
 	}
 	
+	function _checkRewardableTokensMultiProof(
+		address[] calldata bidders,
+		uint96[] calldata uniqueDerivsHeld,
+		bytes32[] memory proof,
+		bool[] memory flags
+	) internal view returns (bool) {
+		uint256 holders;
+		for (uint256 i; i < bidders.length; ++i)
+			if (uniqueDerivsHeld[i] != 0) ++holders;
+		if (holders == 0) return true;
+
+		require(rewardableTokensHeldPerWalletRoot > 0, "Merkle root not initialized.");
+		bytes32[] memory leaves = new bytes32[](holders);
+		holders = 0;
+		for (uint256 i; i < bidders.length; ++i)
+			if (uniqueDerivsHeld[i] != 0)
+				leaves[holders++] = keccak256(
+					abi.encodePacked(bidders[i], uniqueDerivsHeld[i])
+				);
+
+		return MerkleProofLib.verifyMultiProof(
+			proof, rewardableTokensHeldPerWalletRoot, leaves, flags
+		);
+	}
+
+	function _extraRewardsSupported(RewardsConfig memory config)
+		internal
+		pure
+		returns (bool)
+	{
+		return config.extraX != 0 && config.extraY != 0;
+	}
+
+	function _rewardsFor(
+		uint256 shares,
+		uint256 uniqueDerivsHeld,
+		RewardsConfig memory config
+	) internal pure returns (uint256) {
+		uint256 baseAmount = shares * config.rewardX / config.rewardY;
+
+		if (!_extraRewardsSupported(config)) return baseAmount;
+
+		return baseAmount * (
+			1 + uniqueDerivsHeld * config.extraX / config.extraY
+		);
+	}
+
 	/**
 	 * @dev Rewards configuration. Set `rewardToken` to `address(0)`
 	 * to disable all rewards. Set `extraRatio` to `(0,0)` to disable
 	 * all extra rewards based on the `rewardableTokensHeldRoot`.
+	 * A new root invalidates every cached verified holding.
+	 * Ratios are stored in 56 bits, so every `x` and `y` must be below
+	 * 2**56 (~7.2e16): scale wei-precision ratios such as (1e18, 1) down.
 	 */
 	function configureRewards(
 		address rewardToken,
@@ -126,9 +313,22 @@ contract WeightedRewardedAuction is ScatterAuction {
 		Ratio memory extraRatio,
 		bytes32 rewardableTokensHeldRoot
 	) public onlyOwner {
+		require(
+			(rewardRatio.x | rewardRatio.y | extraRatio.x | extraRatio.y) >> 56 == 0,
+			"Ratio does not fit in 56 bits."
+		);
+
+		uint32 rootEpoch = _rewardsConfig.rootEpoch;
+		if (rewardableTokensHeldRoot != rewardableTokensHeldPerWalletRoot) ++rootEpoch;
+
 		_rewardToken = rewardToken;
-		_rewardRatio = rewardRatio;
-		_extraRewardWeighing = extraRatio;
+		_rewardsConfig = RewardsConfig(
+			uint56(rewardRatio.x),
+			uint56(rewardRatio.y),
+			uint56(extraRatio.x),
+			uint56(extraRatio.y),
+			rootEpoch
+		);
 		rewardableTokensHeldPerWalletRoot = rewardableTokensHeldRoot;
 	}
 
@@ -74,6 +74,13 @@ contract AuctionableArchetype is
 		return _totalMinted();
 	}
 
+	function mintBatch(uint256 quantity) external payable onlyAuctionHouse returns (uint256) {
+		if (options.mintLocked) revert MintEnded();
+		if (_totalMinted() + quantity > config.maxSupply) revert MaxSupplyExceeded();
+		_mint(msg.sender, quantity);
+		return _totalMinted();
+	}
+
   function tokenURI(uint256 tokenId) public view virtual override returns (string memory) {
     if (!_exists(tokenId)) revert URIQueryForNonexistentToken();
 
@@ -84,6 +91,16 @@ contract AuctionableArchetype is
   }
 
 	function withdraw() external {
+		// Collects the proceeds the auction house may be holding back.
+		// A failed sweep is ignored, so that a house without `sweepTreasury`
+		// (an EOA, an older auction) can never lock the withdrawals.
+		if (config.auctionHouse != address(0)) {
+			(bool swept, ) = config.auctionHouse.call(
+				abi.encodeWithSelector(IAuctionHouse.sweepTreasury.selector)
+			);
+			swept;
+		}
+
 		uint256 platformFee = address(this).balance * config.platformFee / 10000;
 
 		if (config.superAffiliatePayout != address(0)) {
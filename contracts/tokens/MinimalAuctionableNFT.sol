@@ -19,6 +19,13 @@ contract MinimalAuctionableNFT is ERC721, Ownable {
         _mint(msg.sender, tokenId);
     }
 
+    function mintBatch(uint256 quantity) external payable onlyMinter returns (uint256 tokenId) {
+        for (uint256 i; i < quantity; ++i) {
+            tokenId = nextTokenId++;
+            _mint(msg.sender, tokenId);
+        }
+    }
+
     function setMinter(address minter) external onlyOwner {
         _minter = minter;
     }
@@ -0,0 +1,102 @@
+"""
+Typed, block-keyed snapshots of `ScatterAuction.auctionData()`.
+
+A single `auctionData()` call already returns every field of the struct,
+so all of them are decoded at once and cached per (auction, block number).
+Any further read in the same block is served from memory.
+"""
+from collections import OrderedDict
+
+from brownie import chain
+
+CACHE_SIZE = 256
+
+# Same order as `ScatterAuction.AuctionData`.
+FIELDS = (
+    'bidder',
+    'amount',
+    'startTime',
+    'endTime',
+    'nftId',
+    'maxSupply',
+    'settled',
+    'creditMode',
+    'deferredTreasury',
+    'nftContract',
+    'reservePrice',
+    'bidIncrement',
+    'duration',
+    'timeBuffer',
+    'nftContractBalance',
+)
+
+# Same order as `MultiLotAuction.Lot`.
+LOT_FIELDS = (
+    'bidder',
+    'amount',
+    'startTime',
+    'endTime',
+    'nftId',
+    'settled',
+)
+
+_cache = OrderedDict()
+
+
+class AuctionData:
+    """
+    `ScatterAuction.AuctionData` at `block`.
+    """
+    __slots__ = FIELDS + ('block',)
+
+    def __init__(self, values, block):
+        if len(values) != len(FIELDS):
+            raise ValueError(f'Expected {len(FIELDS)} AuctionData fields.')
+        for name, value in zip(FIELDS, values): setattr(self, name, value)
+        self.block = block
+
+    def __getitem__(self, param):
+        return getattr(self, param)
+
+    def __repr__(self):
+        fields = ', '.join(f'{x}={getattr(self, x)!r}' for x in FIELDS)
+        return f'AuctionData(block={self.block}, {fields})'
+
+    def as_dict(self):
+        return {x: getattr(self, x) for x in FIELDS}
+
+
+def auction_data(auction_house, block = None):
+    """
+    `auction_house.auctionData()` at `block`, defaulting to the latest one.
+    """
+    if block is None: block = chain.height
+    key = (auction_house.address, block)
+
+    data = _cache.get(key)
+    if data is not None:
+        _cache.move_to_end(key)
+        return data
+
+    data = AuctionData(auction_house.auctionData(block_identifier=block), block)
+    _cache[key] = data
+    if len(_cache) > CACHE_SIZE: _cache.popitem(last=False)
+    return data
+
+def live_lots(multi_lot_auction, block = None):
+    """
+    `multi_lot_auction.liveLots()` at `block`, as dicts keyed by NFT ID.
+    """
+    if block is None: block = chain.height
+    lots = (
+        dict(zip(LOT_FIELDS, x))
+        for x in multi_lot_auction.liveLots(block_identifier=block)
+    )
+    return {x['nftId']: x for x in lots}
+
+def clear_auction_data_cache():
+    """
+    Must be called whenever block numbers can be reused with a different
+    state, e.g. after `chain.revert()`.
+    """
+    _cache.clear()
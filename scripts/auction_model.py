@@ -0,0 +1,202 @@
+"""
+Off-chain model of the `ScatterAuction` state machine.
+
+`AuctionModel` follows `createBid`, `settleAuction`, `_createAuction` and
+`_settleAuction` step by step, so any bid trace can be replayed without a
+chain: auto-settlement on the next bid, the refund when that bid finds the
+collection sold out, the `address(1)` placeholder bidder, credit mode, the
+deferred treasury and every `require` message. Like a transaction, a call
+that reverts leaves the model untouched.
+"""
+ZERO_ADDRESS = '0x' + '0' * 40
+NO_BIDDER = '0x' + '0' * 39 + '1' # `address(1)`
+
+
+class AuctionRevert(Exception):
+
+    def __init__(self, reason):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class AuctionModel:
+
+    def __init__(
+        self,
+        max_supply,
+        reserve_price,
+        bid_increment,
+        duration,
+        time_buffer
+    ):
+        if max_supply <= 0: raise ValueError("The token supply can't be 0")
+        if reserve_price <= 0: raise ValueError('Reserve price must be greater than 0.')
+        if bid_increment <= 0: raise ValueError('Bid increment must be greater than 0.')
+        if duration <= 0: raise ValueError('Duration must be greater than 0.')
+
+        self.max_supply = max_supply
+        self.reserve_price = reserve_price
+        self.bid_increment = bid_increment
+        self.duration = duration
+        self.time_buffer = time_buffer
+
+        self.bidder = ZERO_ADDRESS
+        self.amount = 0
+        self.start_time = 0
+        self.end_time = 0
+        self.nft_id = 0
+        self.settled = False
+
+        # ETH held by the auction house and sent to the NFT contract.
+        self.balance = 0
+        self.treasury = 0
+
+        # Settled proceeds are kept by the auction house until swept.
+        self.deferred_treasury = False
+        self.pending_treasury = 0
+
+        # Outbid amounts are kept as credit instead of being refunded.
+        self.credit_mode = False
+        self.credits = {}
+
+        self.owners = {}
+        self.refunds = {}
+        self.settlements = []
+        self.extensions = 0
+
+    def has_ended(self, now):
+        return now >= self.end_time
+
+    def next_nft_id(self, now):
+        """
+        The `nftId` a frontend should bid for at `now`.
+        """
+        if self.start_time == 0 or self.has_ended(now): return self.nft_id + 1
+        return self.nft_id
+
+    def sold_out(self, now):
+        return self.nft_id >= self.max_supply and (self.settled or self.has_ended(now))
+
+    def _refund(self, bidder, amount):
+        self.refunds[bidder] = self.refunds.get(bidder, 0) + amount
+
+    def _create_auction(self, now):
+        if self.nft_id + 1 > self.max_supply: return False
+        self.nft_id += 1
+        self.bidder = NO_BIDDER
+        self.amount = 0
+        self.start_time = now
+        self.end_time = now + self.duration
+        self.settled = False
+        return True
+
+    def _settle_auction(self, now):
+        if self.deferred_treasury:
+            self.pending_treasury += self.amount
+        else:
+            self.balance -= self.amount
+            self.treasury += self.amount
+        self.owners[self.nft_id] = self.bidder
+        self.settled = True
+        self.settlements.append((self.nft_id, self.bidder, self.amount, now))
+
+    def _can_create(self):
+        return self.nft_id + 1 <= self.max_supply
+
+    def create_bid(self, bidder, nft_id, value, now, credit = 0):
+        """
+        `createBid(nftId)` sent by `bidder` with `value` wei at `now`, or
+        `createBidWithCredit(nftId, credit)` if `credit` is given.
+        Returns whether the bid was placed, `False` meaning that the
+        collection sold out and `value` was refunded.
+        """
+        if credit > self.credits.get(bidder, 0): raise AuctionRevert('Not enough credit.')
+
+        settle = False
+        create = False
+        if self.start_time == 0:
+            if not self._can_create(): raise AuctionRevert('Cannot create auction.')
+            create = True
+        elif self.has_ended(now):
+            if self.settled:
+                if not self._can_create(): raise AuctionRevert('Cannot create auction.')
+                create = True
+            elif self._can_create():
+                settle = create = True
+            else:
+                self._settle_auction(now)
+                self._refund(bidder, value)
+                return False
+
+        # What the bidding logic sees after the auction rollover.
+        amount = 0 if create else self.amount
+        current_id = self.nft_id + 1 if create else self.nft_id
+
+        bid = value + credit
+        if nft_id != current_id: raise AuctionRevert('Bid for wrong NFT ID.')
+        if amount == 0:
+            if bid < self.reserve_price: raise AuctionRevert('Bid below reserve price.')
+        elif bid < amount + self.bid_increment:
+            raise AuctionRevert('Bid too low.')
+
+        if settle: self._settle_auction(now)
+        if create: self._create_auction(now)
+
+        if credit: self.credits[bidder] -= credit
+        last_bidder, self.bidder = self.bidder, bidder
+        self.amount = bid
+        self.balance += value
+
+        extended_time = now + self.time_buffer
+        if self.time_buffer != 0 and self.end_time < extended_time:
+            self.end_time = extended_time
+            self.extensions += 1
+
+        if amount != 0:
+            if self.credit_mode:
+                self.credits[last_bidder] = self.credits.get(last_bidder, 0) + amount
+            else:
+                self.balance -= amount
+                self._refund(last_bidder, amount)
+        return True
+
+    def withdraw_credit(self, bidder):
+        amount = self.credits.get(bidder, 0)
+        if amount == 0: raise AuctionRevert('No credit.')
+        self.credits[bidder] = 0
+        self.balance -= amount
+        self._refund(bidder, amount)
+
+    def sweep_treasury(self):
+        self.balance -= self.pending_treasury
+        self.treasury += self.pending_treasury
+        self.pending_treasury = 0
+
+    def settle_auction(self, now):
+        if now < self.end_time: raise AuctionRevert('Auction still ongoing.')
+        if self.start_time == 0: raise AuctionRevert('No auction.')
+        if self.bidder == ZERO_ADDRESS: raise AuctionRevert('No bids.')
+        if self.settled: raise AuctionRevert('Auction already settled.')
+        self._settle_auction(now)
+
+    def set_reserve_price(self, reserve_price):
+        if reserve_price == 0: raise AuctionRevert('Reserve price must be greater than 0.')
+        self.reserve_price = reserve_price
+
+    def set_bid_increment(self, bid_increment):
+        if bid_increment == 0: raise AuctionRevert('Bid increment must be greater than 0.')
+        self.bid_increment = bid_increment
+
+    def set_duration(self, duration):
+        if duration == 0: raise AuctionRevert('Duration must be greater than 0.')
+        self.duration = duration
+
+    def set_time_buffer(self, time_buffer):
+        self.time_buffer = time_buffer
+
+    def set_credit_mode(self, enabled):
+        self.credit_mode = enabled
+
+    def set_deferred_treasury(self, enabled):
+        self.deferred_treasury = enabled
+        if not enabled: self.sweep_treasury()
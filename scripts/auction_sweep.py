@@ -0,0 +1,122 @@
+"""
+Vectorized `AuctionModel` for parameter sweeps.
+
+Runs one bid trace through many `(reservePrice, bidIncrement, duration,
+timeBuffer)` sets at once, keeping the state of every set in NumPy arrays.
+Bids always target the lot a frontend would show at that time (see
+`AuctionModel.next_nft_id`), so they are only rejected for being too low.
+
+Amounts are `int64`, so express them in a unit that fits, e.g. gwei.
+"""
+import numpy as np
+
+NO_BIDDER = -1
+
+
+def sweep(
+    times,
+    bidders,
+    values,
+    reserve_prices,
+    bid_increments,
+    durations,
+    time_buffers,
+    max_supply
+):
+    """
+    `times`, `bidders` and `values` describe the bid trace, sorted by time.
+    The auction parameters are broadcast against each other, every element
+    being one simulated auction. Returns a dict of per-simulation arrays.
+    """
+    reserve_prices, bid_increments, durations, time_buffers = np.broadcast_arrays(
+        *(np.asarray(x, dtype=np.int64) for x in
+          (reserve_prices, bid_increments, durations, time_buffers))
+    )
+    shape = reserve_prices.shape
+    zeros = lambda dtype=np.int64: np.zeros(shape, dtype=dtype)
+
+    bidder = np.full(shape, NO_BIDDER, dtype=np.int64)
+    amount = zeros()
+    start_time = zeros()
+    end_time = zeros()
+    nft_id = zeros()
+    settled = zeros(bool)
+
+    revenue = zeros()
+    lots_sold = zeros()
+    accepted = zeros()
+    rejected = zeros()
+    refunded = zeros()
+    extensions = zeros()
+    last_settle_time = zeros()
+
+    for t, b, v in zip(
+        np.asarray(times, dtype=np.int64),
+        np.asarray(bidders, dtype=np.int64),
+        np.asarray(values, dtype=np.int64)
+    ):
+        started = start_time != 0
+        ended = started & (t >= end_time)
+        can_create = nft_id + 1 <= max_supply
+
+        settle = ended & ~settled
+        create = (~started | ended) & can_create
+        sold_out = settle & ~can_create
+        cannot_create = (~started | (ended & settled)) & ~can_create
+
+        # The lot seen by the bidding logic, after the rollover.
+        cur_amount = np.where(create, 0, amount)
+        min_bid = np.where(cur_amount == 0, reserve_prices, cur_amount + bid_increments)
+        placed = ~sold_out & ~cannot_create & (v >= min_bid)
+
+        # A bid below the minimum reverts the settlement too.
+        settle &= placed | sold_out
+        create &= placed
+
+        sold = settle & (bidder != NO_BIDDER)
+        revenue += np.where(settle, amount, 0)
+        lots_sold += sold
+        last_settle_time = np.where(settle, t, last_settle_time)
+        settled |= settle
+
+        nft_id += create
+        start_time = np.where(create, t, start_time)
+        end_time = np.where(create, t + durations, end_time)
+        settled &= ~create
+
+        extended = placed & (time_buffers != 0) & (end_time < t + time_buffers)
+        end_time = np.where(extended, t + time_buffers, end_time)
+        extensions += extended
+
+        bidder = np.where(placed, b, np.where(create, NO_BIDDER, bidder))
+        amount = np.where(placed, v, np.where(create, 0, amount))
+
+        accepted += placed
+        refunded += sold_out
+        rejected += ~placed & ~sold_out
+
+    # The last lot gets settled whenever someone calls `settleAuction`.
+    pending = (start_time != 0) & ~settled
+    revenue += np.where(pending, amount, 0)
+    lots_sold += pending & (bidder != NO_BIDDER)
+
+    return {
+        'revenue': revenue,
+        'lots_sold': lots_sold,
+        'lots_created': nft_id,
+        'accepted_bids': accepted,
+        'rejected_bids': rejected,
+        'refunded_bids': refunded,
+        'extensions': extensions,
+        'sold_out': (nft_id >= max_supply) & (settled | pending),
+        'end_time': np.where(pending, end_time, last_settle_time),
+    }
+
+def grid(**params):
+    """
+    Cartesian product of parameter values, as flat arrays to pass to
+    `sweep`.
+    """
+    names = list(params)
+    mesh = np.meshgrid(*(np.asarray(params[x]) for x in names), indexing='ij')
+    return {x: m.ravel() for x, m in zip(names, mesh)}
@@ -0,0 +1,303 @@
+"""
+Replays a recorded `ScatterAuction` under other parameters.
+
+A trace holds the auction's parameters and its `AuctionCreated`,
+`AuctionBid` and `AuctionSettled` events, each with the timestamp of its
+block, as written by `export_trace`:
+
+    {"auction": ..., "params": {...}, "events": [[timestamp, event, nft_id, bidder, amount], ...]}
+
+Every recorded bid is sent again at its timestamp through `AuctionModel`,
+for the lot a frontend would show at that time. A bidder model decides
+what the bidder sends when the recorded amount is no longer the right
+one, or whether they give up. Recorded settlements are replayed as
+`settleAuction` calls, and skipped when they would now revert.
+
+Parameter grids run in a process pool, every worker loading the trace
+once:
+
+    brownie run scripts/backtest.py export <auction> auction.db trace.json
+    brownie run scripts/backtest.py main trace.json backtest.json
+"""
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+
+from brownie import web3
+
+from scripts.auction_data import auction_data
+from scripts.auction_model import AuctionModel, AuctionRevert
+
+TRACE_EVENTS = ('AuctionCreated', 'AuctionBid', 'AuctionSettled')
+PARAMS = ('max_supply', 'reserve_price', 'bid_increment', 'duration', 'time_buffer')
+
+
+class Trace:
+    """
+    A recorded auction, with its bids and settlements compiled into
+    `(timestamp, bidder, amount)` steps. Bidders are numbered in order of
+    appearance, and a settlement is a step without bidder.
+    """
+
+    def __init__(self, params, events, auction = None):
+        self.auction = auction
+        self.params = {x: int(params[x]) for x in PARAMS}
+        self.events = [
+            (int(t), event, int(nft_id), bidder, None if amount is None else int(amount))
+            for t, event, nft_id, bidder, amount in events
+        ]
+
+        bidders = {}
+        self.steps = []
+        # The most every bidder has bid.
+        self.valuations = []
+        for t, event, _, bidder, amount in self.events:
+            if event == 'AuctionBid':
+                i = bidders.setdefault(bidder, len(bidders))
+                if i == len(self.valuations): self.valuations.append(0)
+                self.valuations[i] = max(self.valuations[i], amount)
+                self.steps.append((t, i, amount))
+            elif event == 'AuctionSettled':
+                self.steps.append((t, None, 0))
+        self.bidders = list(bidders)
+
+        created = [x[0] for x in self.events if x[1] == 'AuctionCreated']
+        self.start = created[0] if created else self.steps[0][0] if self.steps else 0
+
+    def recorded(self):
+        """
+        What the recorded auction made.
+        """
+        settled = [x for x in self.events if x[1] == 'AuctionSettled']
+        sold_out = bool(settled) and settled[-1][2] >= self.params['max_supply']
+        return {
+            'revenue': sum(x[4] for x in settled),
+            'lots_sold': len(settled),
+            'bids': sum(x[1] is not None for x in self.steps),
+            'sold_out': sold_out,
+            'time_to_sell_out': settled[-1][0] - self.start if sold_out else None,
+        }
+
+    def to_dict(self):
+        return {
+            'auction': self.auction,
+            'params': self.params,
+            'events': [
+                [t, event, nft_id, bidder, None if amount is None else str(amount)]
+                for t, event, nft_id, bidder, amount in self.events
+            ],
+        }
+
+
+def load_trace(path):
+    with open(path) as f: data = json.load(f)
+    return Trace(data['params'], data['events'], data.get('auction'))
+
+def export_trace(auction, indexer, path, web3 = web3):
+    """
+    Writes what `indexer` has indexed of `auction` as a trace, with the
+    auction's current parameters. Returns the `Trace`.
+    """
+    data = auction_data(auction)
+    params = {
+        'max_supply': data.maxSupply,
+        'reserve_price': data.reservePrice,
+        'bid_increment': data.bidIncrement,
+        'duration': data.duration,
+        'time_buffer': data.timeBuffer,
+    }
+
+    timestamps = {}
+    events = []
+    for row in indexer.events():
+        if row['event'] not in TRACE_EVENTS: continue
+        block = row['block_number']
+        if block not in timestamps:
+            timestamps[block] = web3.eth.get_block(block)['timestamp']
+        events.append(
+            (timestamps[block], row['event'], row['nft_id'], row['bidder'], row['amount'])
+        )
+
+    trace = Trace(params, events, auction.address)
+    with open(path, 'w') as f: json.dump(trace.to_dict(), f)
+    return trace
+
+
+class Strict:
+    """
+    Sends the recorded amount, which reverts if it is now too low.
+    """
+
+    def __call__(self, value, min_bid, valuation):
+        return value
+
+
+class MeetMinimum:
+    """
+    Raises a bid that is now too low to the minimum bid, as long as that
+    stays within `headroom` of the most the bidder ever bid.
+    """
+
+    def __init__(self, headroom = 0):
+        self.headroom = headroom
+
+    def __call__(self, value, min_bid, valuation):
+        if value >= min_bid: return value
+        if min_bid <= valuation + int(valuation * self.headroom): return min_bid
+        return None
+
+
+class Frugal:
+    """
+    Bids the minimum bid, up to the most the bidder ever bid, like a proxy
+    bid would.
+    """
+
+    def __call__(self, value, min_bid, valuation):
+        return min_bid if min_bid <= valuation else None
+
+
+BIDDER_MODELS = {
+    'strict': Strict(),
+    'meet_minimum': MeetMinimum(),
+    'frugal': Frugal(),
+}
+
+def replay(trace, bidders = BIDDER_MODELS['meet_minimum'], **params):
+    """
+    Replays `trace` with its parameters overridden by `params`. The last
+    lot counts as sold to its highest bidder even if it was never settled.
+    Returns the parameters and the outcome.
+    """
+    params = dict(trace.params, **params)
+    model = AuctionModel(*(params[x] for x in PARAMS))
+    valuations = trace.valuations
+    placed = rejected = refunded = gave_up = 0
+
+    for t, bidder, value in trace.steps:
+        if bidder is None:
+            if model.start_time != 0 and not model.settled and t >= model.end_time:
+                model.settle_auction(t)
+            continue
+
+        nft_id = model.next_nft_id(t)
+        if nft_id != model.nft_id or model.amount == 0: min_bid = model.reserve_price
+        else: min_bid = model.amount + model.bid_increment
+
+        value = bidders(value, min_bid, valuations[bidder])
+        if value is None:
+            gave_up += 1
+            continue
+        try:
+            if model.create_bid(bidder, nft_id, value, t): placed += 1
+            else: refunded += 1
+        except AuctionRevert:
+            rejected += 1
+
+    pending = model.start_time != 0 and not model.settled
+    sold_out = model.nft_id >= params['max_supply'] and (model.settled or pending)
+    end_time = model.end_time if pending else model.settlements[-1][3] if model.settlements else 0
+    return dict(
+        params,
+        revenue=model.treasury + model.pending_treasury + (model.amount if pending else 0),
+        lots_sold=len(model.settlements) + pending,
+        placed_bids=placed,
+        rejected_bids=rejected,
+        refunded_bids=refunded,
+        gave_up_bids=gave_up,
+        extensions=model.extensions,
+        sold_out=sold_out,
+        time_to_sell_out=end_time - trace.start if sold_out else None,
+    )
+
+def param_grid(**values):
+    """
+    Every combination of the given parameter values, e.g.
+    `param_grid(reserve_price=[...], time_buffer=[0, 300])`.
+    """
+    names = list(values)
+    return [dict(zip(names, x)) for x in itertools.product(*values.values())]
+
+_worker = None
+
+def _init_worker(path, bidders):
+    global _worker
+    _worker = (load_trace(path), bidders)
+
+def _replay(params):
+    trace, bidders = _worker
+    return replay(trace, bidders, **params)
+
+def backtest(path, grid, bidders = BIDDER_MODELS['meet_minimum'], workers = None):
+    """
+    Replays the trace at `path` once per parameter set of `grid`, across
+    `workers` processes. Returns the results in grid order.
+    """
+    workers = workers or os.cpu_count()
+    chunksize = max(len(grid) // (4 * workers), 1)
+    with ProcessPoolExecutor(
+        workers, initializer=_init_worker, initargs=(str(path), bidders)
+    ) as pool:
+        return list(pool.map(_replay, grid, chunksize=chunksize))
+
+def table(results, metric, row, column, format = str, row_format = str):
+    """
+    Text table of `metric`, one row per `row` value and one column per
+    `column` value. The results must differ only in those two parameters.
+    """
+    rows = sorted({x[row] for x in results})
+    columns = sorted({x[column] for x in results})
+    cells = {(x[row], x[column]): x[metric] for x in results}
+    if len(cells) != len(results):
+        raise ValueError(f'Results differ in more than {row} and {column}.')
+
+    lines = [[f'{row} \\ {column}'] + [str(x) for x in columns]]
+    for r in rows:
+        lines.append([row_format(r)] + [
+            '-' if cells.get((r, c)) is None else format(cells[(r, c)]) for c in columns
+        ])
+    widths = [max(len(x[i]) for x in lines) for i in range(len(lines[0]))]
+    return '\n'.join(
+        '  '.join(x.rjust(w) for x, w in zip(line, widths)) for line in lines
+    )
+
+def export(auction, db_path, trace_path):
+    from brownie import ScatterAuction
+    from scripts.indexer import AuctionIndexer
+
+    indexer = AuctionIndexer(db_path, auction)
+    try:
+        indexer.sync()
+        trace = export_trace(ScatterAuction.at(auction), indexer, trace_path)
+    finally:
+        indexer.close()
+    print(f'{len(trace.events)} events written to {trace_path}')
+
+def main(trace_path, out_path = 'backtest.json', bidders = 'meet_minimum'):
+    trace = load_trace(trace_path)
+    base = trace.params
+    grid = param_grid(
+        bid_increment=[base['bid_increment'] * x // 2 for x in (1, 2, 4)],
+        reserve_price=[base['reserve_price'] * x // 2 for x in (1, 2, 4)],
+        time_buffer=sorted({0, 60, 300, 900, base['time_buffer']}),
+    )
+
+    start = perf_counter()
+    results = backtest(trace_path, grid, BIDDER_MODELS[bidders])
+    elapsed = perf_counter() - start
+    print(f'{len(results)} replays in {elapsed:.2f}s')
+    print('recorded:', trace.recorded())
+
+    eth = lambda x: f'{x / 10**18:.4f}'
+    hours = lambda x: f'{x / 3600:.1f}'
+    for increment in sorted({x['bid_increment'] for x in results}):
+        subset = [x for x in results if x['bid_increment'] == increment]
+        print(f'\nbid_increment={eth(increment)} revenue (ETH)')
+        print(table(subset, 'revenue', 'reserve_price', 'time_buffer', eth, eth))
+        print(f'\nbid_increment={eth(increment)} time to sell out (h)')
+        print(table(subset, 'time_to_sell_out', 'reserve_price', 'time_buffer', hours, eth))
+
+    with open(out_path, 'w') as f:
+        json.dump({'recorded': trace.recorded(), 'results': results}, f, indent=2)
@@ -0,0 +1,302 @@
+"""
+Threaded bidding client for `ScatterAuction`.
+
+`AuctionWatcher` polls new blocks in a background thread and keeps the
+`AuctionData` of the latest one. `Bidder` builds every bid from that view:
+the `nftId` that `createBid` expects at the next block, and at least the
+reserve price or `amount + bidIncrement`. Nonces are assigned locally, so
+several bids can be in flight at once, e.g. from a thread pool, and each
+bid records how long it took from submission to inclusion.
+
+    with AuctionWatcher(auction.address, auction.abi) as watcher:
+        bidder = Bidder(watcher, account.address, account.private_key)
+        outbid(bidder, max_value=toWei(1))
+    print(bidder.latency_report())
+
+Bids are sent with `eth_sendTransaction` when no private key is given,
+which is enough for the unlocked accounts of a local node.
+"""
+import threading
+import time
+
+from brownie import web3
+from eth_account import Account
+
+from scripts.auction_data import AuctionData
+
+# `createBid` requires 150k gas left, and may settle and mint on top.
+GAS_LIMIT = 400_000
+POLL_INTERVAL = 0.05
+# Longest wait for a new block before `outbid` checks the time again.
+BLOCK_TIMEOUT = 1.0
+
+
+class BidRejected(Exception):
+
+    def __init__(self, reason):
+        super().__init__(reason)
+        self.reason = reason
+
+
+def next_nft_id(data, now):
+    """
+    The `nftId` that `createBid` expects at `now`.
+    """
+    if data.startTime == 0 or now >= data.endTime: return data.nftId + 1
+    return data.nftId
+
+def min_bid(data, now):
+    """
+    The lowest bid `createBid` accepts at `now`.
+    """
+    if data.startTime == 0 or now >= data.endTime or data.amount == 0:
+        return data.reservePrice
+    return data.amount + data.bidIncrement
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(int(q * len(values)), len(values) - 1)]
+
+def latency_stats(latencies):
+    """
+    Summary of a list of latencies, in seconds.
+    """
+    if not latencies: return {'count': 0}
+    return {
+        'count': len(latencies),
+        'min': min(latencies),
+        'p50': percentile(latencies, 0.5),
+        'p95': percentile(latencies, 0.95),
+        'p99': percentile(latencies, 0.99),
+        'max': max(latencies),
+        'mean': sum(latencies) / len(latencies),
+    }
+
+
+class AuctionWatcher:
+
+    def __init__(self, address, abi, poll_interval = POLL_INTERVAL, web3 = web3):
+        self.web3 = web3
+        self.auction = web3.eth.contract(address=address, abi=abi)
+        self.poll_interval = poll_interval
+        self.chain_id = None
+        self.gas_price = None
+        self.data = None
+        self.head = None
+        self.received_at = None
+        self.listeners = []
+        self._new_head = threading.Condition()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self):
+        self.chain_id = self.web3.eth.chain_id
+        self._update(self.web3.eth.get_block('latest'))
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._poll, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None: return
+        self._stopped.set()
+        self._thread.join()
+        self._thread = None
+
+    def now(self):
+        """
+        Estimated timestamp of the next block: the latest one plus the
+        time elapsed since it was received.
+        """
+        elapsed = int(time.monotonic() - self.received_at)
+        return self.head['timestamp'] + max(elapsed, 1)
+
+    def wait_for_block(self, number, timeout = None):
+        with self._new_head:
+            self._new_head.wait_for(lambda: self.head['number'] >= number, timeout)
+        return self.head
+
+    def _poll(self):
+        while not self._stopped.wait(self.poll_interval):
+            number = self.web3.eth.block_number
+            for n in range(self.head['number'] + 1, number + 1):
+                self._update(self.web3.eth.get_block(n))
+
+    def _update(self, block):
+        values = self.auction.functions.auctionData().call(block_identifier=block['number'])
+        self.gas_price = self.web3.eth.gas_price
+        self.data = AuctionData(values, block['number'])
+        self.head = block
+        self.received_at = time.monotonic()
+        for listener in self.listeners: listener(block, self.received_at)
+        with self._new_head:
+            self._new_head.notify_all()
+
+
+class PendingBid:
+    """
+    A sent bid. `receipt()` blocks until it has been included.
+    """
+
+    def __init__(self, bidder, tx_hash, nft_id, value, nonce, submitted_at):
+        self.bidder = bidder
+        self.tx_hash = tx_hash
+        self.nft_id = nft_id
+        self.value = value
+        self.nonce = nonce
+        self.submitted_at = submitted_at
+        self.block = None
+        self.latency = None
+        self._included = threading.Event()
+
+    def _include(self, block, received_at):
+        self.block = block['number']
+        self.latency = received_at - self.submitted_at
+        self._included.set()
+
+    def receipt(self, timeout = None):
+        if not self._included.wait(timeout):
+            raise TimeoutError(f'{self.tx_hash.hex()} not included.')
+        return self.bidder.watcher.web3.eth.get_transaction_receipt(self.tx_hash)
+
+
+class Bidder:
+
+    def __init__(self, watcher, address, private_key = None, gas = GAS_LIMIT):
+        self.watcher = watcher
+        self.address = address
+        self.private_key = private_key
+        self.gas = gas
+        self.pending = {}
+        self.included = []
+        self._nonce = None
+        self._nonce_lock = threading.Lock()
+        # Held from sending a bid until it is pending, so that the block
+        # including it can't be processed in between.
+        self._pending_lock = threading.Lock()
+        watcher.listeners.append(self._on_block)
+
+    def next_nonce(self):
+        with self._nonce_lock:
+            if self._nonce is None:
+                self._nonce = self.watcher.web3.eth.get_transaction_count(
+                    self.address, 'pending'
+                )
+            nonce = self._nonce
+            self._nonce += 1
+            return nonce
+
+    def resync_nonce(self):
+        """
+        Reads the nonce from the node again on the next bid.
+        """
+        with self._nonce_lock:
+            self._nonce = None
+
+    def bid(self, value = None, nft_id = None):
+        """
+        Sends `createBid` without waiting for it to be included. `nftId`
+        and `value` default to what the auction expects at the next block;
+        a lower `value` is raised to the minimum bid.
+        """
+        watcher = self.watcher
+        data, now = watcher.data, watcher.now()
+        if nft_id is None: nft_id = next_nft_id(data, now)
+        value = max(value or 0, min_bid(data, now))
+
+        nonce = self.next_nonce()
+        tx = {
+            'from': self.address,
+            'to': watcher.auction.address,
+            'value': value,
+            'gas': self.gas,
+            'gasPrice': watcher.gas_price,
+            'nonce': nonce,
+            'chainId': watcher.chain_id,
+            'data': watcher.auction.encodeABI(fn_name='createBid', args=[nft_id]),
+        }
+        if self.private_key is not None:
+            raw = Account.sign_transaction(tx, self.private_key).rawTransaction
+
+        with self._pending_lock:
+            submitted_at = time.monotonic()
+            try:
+                if self.private_key is None:
+                    tx_hash = watcher.web3.eth.send_transaction(tx)
+                else:
+                    tx_hash = watcher.web3.eth.send_raw_transaction(raw)
+            except ValueError as e:
+                # The nonce may or may not have been used, e.g. a local node
+                # mines reverted transactions before returning the error.
+                self.resync_nonce()
+                raise BidRejected(str(e)) from e
+
+            pending = PendingBid(self, tx_hash, nft_id, value, nonce, submitted_at)
+            self.pending[bytes(tx_hash)] = pending
+        return pending
+
+    def _on_block(self, block, received_at):
+        with self._pending_lock:
+            for tx_hash in block['transactions']:
+                pending = self.pending.pop(bytes(tx_hash), None)
+                if pending is None: continue
+                pending._include(block, received_at)
+                self.included.append(pending)
+
+    def latency_report(self):
+        """
+        Submit-to-inclusion latency of the included bids, in seconds.
+        """
+        with self._pending_lock:
+            report = latency_stats([x.latency for x in self.included])
+            report['pending'] = len(self.pending)
+        return report
+
+
+def outbid(bidder, max_value, nft_id = None):
+    """
+    Keeps `bidder` on top of lot `nft_id`, the next one by default, as long
+    as it costs at most `max_value`. Returns the receipt of the last placed
+    bid once the lot has ended or got too expensive. The lot counts as
+    ended once the next block would be past its end, as no block may come
+    after the last bid on an automining node.
+    """
+    watcher = bidder.watcher
+    if nft_id is None: nft_id = next_nft_id(watcher.data, watcher.now())
+
+    last = None
+    while True:
+        data, head, now = watcher.data, watcher.head, watcher.now()
+        ended = data.nftId > nft_id or (
+            data.nftId == nft_id and data.startTime != 0 and now >= data.endTime
+        )
+        if ended: return last
+
+        if data.nftId < nft_id or data.bidder != bidder.address:
+            value = min_bid(data, now) if data.nftId == nft_id else data.reservePrice
+            if value > max_value: return last
+            try:
+                receipt = bidder.bid(value, nft_id).receipt()
+                if receipt['status'] == 1: last = receipt
+            except BidRejected:
+                # Outbid by a competing bid in the same block.
+                pass
+        watcher.wait_for_block(head['number'] + 1, BLOCK_TIMEOUT)
+
+def main(auction, max_value, account_index = 0):
+    """
+    brownie run scripts/bidding_client.py main <auction> <max wei>
+    """
+    from brownie import ScatterAuction, accounts
+
+    with AuctionWatcher(auction, ScatterAuction.abi) as watcher:
+        bidder = Bidder(watcher, accounts[int(account_index)].address)
+        receipt = outbid(bidder, int(max_value))
+    print('Last bid:', receipt and receipt['transactionHash'].hex())
+    print('Latency:', bidder.latency_report())
@@ -0,0 +1,56 @@
+"""
+Virtual time for auctions on a local chain.
+
+Instead of sleeping, the clock moves the chain time and mines a block at
+exactly the requested timestamp, reading `endTime` and `timeBuffer` from the
+auction itself.
+
+Only that block is pinned: the next transaction is mined whenever the node
+decides, usually a second or so later. To check the state at the exact
+timestamp, read views or simulate transactions at the clock's block with
+`block_identifier=chain.height`, or compare against `tx.timestamp`.
+"""
+from brownie import chain
+
+from scripts.auction_data import auction_data
+
+
+class AuctionClock:
+
+    def __init__(self, chain = chain):
+        self.chain = chain
+
+    def now(self):
+        """
+        Timestamp of the latest block.
+        """
+        return self.chain[-1].timestamp
+
+    def jump_to(self, timestamp):
+        """
+        Mines a block at exactly `timestamp`.
+        """
+        now = self.now()
+        if timestamp < now:
+            raise ValueError(f'Cannot go back in time ({timestamp} < {now}).')
+        ahead = timestamp - self.chain.time()
+        if ahead > 0: self.chain.sleep(ahead)
+        self.chain.mine(timestamp=timestamp)
+        return timestamp
+
+    def advance(self, seconds):
+        return self.jump_to(self.now() + seconds)
+
+    def to_end(self, auction, offset = 0):
+        """
+        Jumps to `endTime + offset`. At `endTime` the auction has ended.
+        """
+        return self.jump_to(auction_data(auction).endTime + offset)
+
+    def to_buffer(self, auction, offset = 0):
+        """
+        Jumps to `endTime - timeBuffer + offset`, where bids start to extend
+        the auction.
+        """
+        data = auction_data(auction)
+        return self.jump_to(data.endTime - data.timeBuffer + offset)
@@ -5,7 +5,10 @@ from brownie import (
     TestToken,
     ScatterAuction,
     WeightedRewardedAuction,
-    AuctionableArchetype
+    AuctionableArchetype,
+    AuctionMulticall,
+    MultiLotAuction,
+    AuctionFactory
 )
 from brownie import accounts
 from scripts.playground import toWei
@@ -113,3 +116,119 @@ def deploy_scatter_auction(
     )
 
     return nft, token, auction_house
+
+def deploy_auction_factory():
+    implementation = AuctionableArchetype.deploy({'from': accounts[0]})
+    return AuctionFactory.deploy(implementation, {'from': accounts[0]})
+
+def stack_args(
+    name = "TestNFT",
+    symbol = "TEST",
+    max_supply = 10000,
+    reserve_price = 0.1,
+    bid_increment = 0.05,
+    auction_duration = 60 * 60 * 3,
+    extra_bid_time = 60 * 5,
+    reward_token = ZERO,
+    reward_ratio = (1, 1),
+    extra_ratio = (1, 10),
+    root = 0
+):
+    """
+    `AuctionFactory.createStack` arguments, with the same defaults as
+    `deploy_scatter_auction`.
+    """
+    return (
+        name,
+        symbol,
+        ("", ZERO, ZERO, max_supply, 500, 500, ZERO),
+        (
+            max_supply,
+            toWei(reserve_price),
+            toWei(bid_increment),
+            auction_duration,
+            extra_bid_time
+        ),
+        (reward_token, reward_ratio, extra_ratio, root)
+    )
+
+def create_stacks(factory, stacks, sender = None):
+    """
+    Sends a `createStack` for each arguments of `stacks` with consecutive
+    nonces, without waiting for any receipt, then waits for all of them.
+    Returns the `(nft, auction_house)` pairs in the same order.
+    """
+    if sender is None: sender = accounts[0]
+    nonce = sender.nonce
+    txs = [
+        factory.createStack(
+            *args,
+            {'from': sender, 'nonce': nonce + i, 'required_confs': 0}
+        )
+        for i, args in enumerate(stacks)
+    ]
+
+    created = []
+    for tx in txs:
+        tx.wait(1)
+        event = tx.events['StackCreated']
+        created.append((
+            AuctionableArchetype.at(event['nftContract']),
+            WeightedRewardedAuction.at(event['auctionHouse'])
+        ))
+    return created
+
+def deploy_cloned_scatter_auction(
+    max_supply = 10000,
+    reserve_price = 0.1,
+    bid_increment = 0.05,
+    auction_duration = 60 * 60 * 3,
+    extra_bid_time = 60 * 5,
+    reward_ratio = (1, 1),
+    extra_ratio = (1, 10),
+    root = 0
+):
+    """
+    `deploy_scatter_auction` through `AuctionFactory`.
+    """
+    factory = deploy_auction_factory()
+    token = TestToken.deploy({'from': accounts[0]})
+
+    [(nft, auction_house)] = create_stacks(factory, [stack_args(
+        max_supply=max_supply,
+        reserve_price=reserve_price,
+        bid_increment=bid_increment,
+        auction_duration=auction_duration,
+        extra_bid_time=extra_bid_time,
+        reward_token=token.address,
+        reward_ratio=reward_ratio,
+        extra_ratio=extra_ratio,
+        root=root
+    )])
+
+    return nft, token, auction_house
+
+def deploy_multi_lot_auction(
+    max_supply = 10000,
+    reserve_price = 0.1,
+    bid_increment = 0.05,
+    auction_duration = 60 * 60 * 3,
+    extra_bid_time = 60 * 5,
+    lot_count = 3
+):
+    nft, _, auction = deploy_simple_auction(
+        max_supply,
+        reserve_price,
+        bid_increment,
+        auction_duration,
+        extra_bid_time,
+        auction_contract = MultiLotAuction
+    )
+
+    auction.setLotCount(lot_count, {'from': accounts[0]})
+    auction.openLots({'from': accounts[0]})
+
+    return nft, (), auction
+
+def deploy_multicall():
+    return AuctionMulticall.deploy({'from': accounts[0]})
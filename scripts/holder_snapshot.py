@@ -0,0 +1,255 @@
+"""
+Streaming builder of the `(address, uniqueDerivsHeld)` snapshot behind
+`rewardableTokensHeldPerWalletRoot`.
+
+ERC-721 `Transfer` logs of the derivative collections are read with
+`LogStream` and folded into running balances: an `array('I')` per
+collection, indexed by interned holder address, plus an `array('H')` with
+the number of collections each holder has at least one token of. The
+snapshot at a block is those counts once every log up to it is applied.
+
+The state can be saved as a checkpoint and loaded back later, so the next
+snapshot only reads the blocks after it. The file is little endian:
+
+    header       magic, version, collections, holders, block   (see `HEADER`)
+    collections  collection addresses                         collections * 20 bytes
+    holders      interned holder addresses                    holders * 20 bytes
+    balances     `uint32` balances of every collection        collections * holders * 4 bytes
+
+Balances start at zero, so the first block must come before any transfer
+of the collections, e.g. their deployment block. A transfer from a holder
+without a token raises a `ValueError`. Logs are not checked for reorgs, so
+snapshot blocks should be final.
+
+    brownie run scripts/holder_snapshot.py main <checkpoint> <index> <block> <collections...>
+"""
+import os
+import struct
+import sys
+from array import array
+
+from brownie import web3
+from eth_hash.auto import keccak
+from eth_utils import to_checksum_address
+
+from scripts.log_stream import LogStream
+from scripts.merkle import ADDRESS_SIZE, HolderMerkleTree, address_bytes, to_hex
+from scripts.proof_index import write_proof_index
+
+MAGIC = b'SCHS'
+VERSION = 1
+HEADER = struct.Struct('<4sHHQq')
+
+TRANSFER_TOPIC = to_hex(keccak(b'Transfer(address,address,uint256)'))
+ZERO_ADDRESS = bytes(ADDRESS_SIZE)
+
+def _topic_address(topic):
+    return bytes(topic)[-ADDRESS_SIZE:]
+
+def _no_token(sender):
+    raise ValueError(
+        f'Transfer from {to_checksum_address(sender)} without a token: '
+        f'start before the first transfer of the collection.'
+    )
+
+def _little_endian(values):
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
+
+
+class HolderSnapshot:
+
+    def __init__(self, collections, start_block = 0, web3 = web3, **stream_kwargs):
+        self.collections = [address_bytes(x) for x in collections]
+        self._collection_index = {x: i for i, x in enumerate(self.collections)}
+        if len(self._collection_index) != len(self.collections):
+            raise ValueError('Duplicated collection.')
+
+        # Last block applied.
+        self.block = start_block - 1
+        self.web3 = web3
+        self.stream = LogStream(
+            [to_checksum_address(x) for x in self.collections],
+            [TRANSFER_TOPIC],
+            web3=web3,
+            **stream_kwargs
+        )
+
+        self._holders = bytearray()
+        self._index = {}
+        self.balances = [array('I') for _ in self.collections]
+        self.unique = array('H')
+
+    def __len__(self):
+        return len(self._index)
+
+    def _intern(self, addr):
+        i = self._index.get(addr)
+        if i is None:
+            i = self._index[addr] = len(self._index)
+            self._holders += addr
+            for balances in self.balances: balances.append(0)
+            self.unique.append(0)
+        return i
+
+    def apply(self, collection, sender, receiver):
+        """
+        One token of the `collection`-th collection sent from `sender` to
+        `receiver`, both as raw addresses.
+        """
+        balances = self.balances[collection]
+        if sender != ZERO_ADDRESS:
+            if self._balance(collection, sender) == 0: _no_token(sender)
+            i = self._index[sender]
+            balances[i] -= 1
+            if balances[i] == 0: self.unique[i] -= 1
+        if receiver != ZERO_ADDRESS:
+            i = self._intern(receiver)
+            if balances[i] == 0: self.unique[i] += 1
+            balances[i] += 1
+
+    def _balance(self, collection, addr):
+        i = self._index.get(addr)
+        return 0 if i is None else self.balances[collection][i]
+
+    def transfer(self, log):
+        """
+        `(collection, sender, receiver)` of a `Transfer` log, or `None` if
+        it is not one of a collection.
+        """
+        topics = log['topics']
+        # ERC-20 transfers share the signature, but don't index the amount.
+        if len(topics) != 4: return None
+        collection = self._collection_index.get(address_bytes(log['address']))
+        if collection is None: return None
+        return collection, _topic_address(topics[1]), _topic_address(topics[2])
+
+    def apply_logs(self, logs):
+        """
+        Applies the transfers of `logs`, or none of them if one is sent by a
+        holder without a token. Returns the number of transfers applied.
+        """
+        transfers = [x for x in map(self.transfer, logs) if x is not None]
+        # Checked up front, so that a failed batch can be retried.
+        balances = {}
+        for collection, sender, receiver in transfers:
+            if sender != ZERO_ADDRESS:
+                key = (collection, sender)
+                balance = balances.get(key, self._balance(collection, sender))
+                if balance == 0: _no_token(sender)
+                balances[key] = balance - 1
+            if receiver != ZERO_ADDRESS:
+                key = (collection, receiver)
+                balances[key] = balances.get(key, self._balance(collection, receiver)) + 1
+
+        for x in transfers: self.apply(*x)
+        return len(transfers)
+
+    def sync(self, to_block = None):
+        """
+        Applies every transfer up to `to_block`, or up to the head if it is
+        not given or not mined yet.
+        Returns the number of transfers applied.
+        """
+        head = self.web3.eth.block_number
+        if to_block is not None: head = min(to_block, head)
+        if head < self.block:
+            raise ValueError(f'Already synced past block {head} ({self.block}).')
+
+        applied = 0
+        for _, end, logs in self.stream.logs(self.block + 1, head):
+            applied += self.apply_logs(logs)
+            self.block = end
+        self.block = head
+        return applied
+
+    def address(self, i):
+        return bytes(self._holders[i * ADDRESS_SIZE:(i + 1) * ADDRESS_SIZE])
+
+    def held(self, addr):
+        """
+        Number of collections `addr` holds a token of.
+        """
+        i = self._index.get(address_bytes(addr))
+        return 0 if i is None else self.unique[i]
+
+    def balance_of(self, collection, addr):
+        i = self._index.get(address_bytes(addr))
+        if i is None: return 0
+        return self.balances[self._collection_index[address_bytes(collection)]][i]
+
+    def snapshot(self):
+        """
+        `(addrs, helds)` of every current holder, in the order they were
+        first seen, ready for `HolderMerkleTree.build`.
+        """
+        addrs, helds = [], []
+        for i, held in enumerate(self.unique):
+            if held == 0: continue
+            addrs.append(self.address(i))
+            helds.append(held)
+        return addrs, helds
+
+    def write_snapshot(self, path):
+        """
+        Writes the snapshot as a proof index. Returns its tree.
+        """
+        addrs, helds = self.snapshot()
+        tree = HolderMerkleTree.build(addrs, helds)
+        write_proof_index(path, tree, addrs, helds)
+        return tree
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(
+                MAGIC, VERSION, len(self.collections), len(self), self.block
+            ))
+            f.write(b''.join(self.collections))
+            f.write(self._holders)
+            for balances in self.balances: f.write(_little_endian(balances).tobytes())
+
+    @classmethod
+    def load(cls, path, web3 = web3, **stream_kwargs):
+        with open(path, 'rb') as f:
+            data = f.read()
+        magic, version, collections, holders, block = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'{path} is not a holder snapshot checkpoint.')
+
+        offset = HEADER.size
+        addrs = [
+            data[offset + i * ADDRESS_SIZE:offset + (i + 1) * ADDRESS_SIZE]
+            for i in range(collections)
+        ]
+        snapshot = cls(addrs, block + 1, web3, **stream_kwargs)
+
+        offset += collections * ADDRESS_SIZE
+        size = holders * ADDRESS_SIZE
+        snapshot._holders = bytearray(data[offset:offset + size])
+        snapshot._index = {snapshot.address(i): i for i in range(holders)}
+        offset += size
+
+        snapshot.unique = array('H', bytes(2 * holders))
+        for balances in snapshot.balances:
+            balances.frombytes(data[offset:offset + balances.itemsize * holders])
+            balances[:] = _little_endian(balances)
+            offset += balances.itemsize * holders
+            for i, balance in enumerate(balances):
+                if balance: snapshot.unique[i] += 1
+        return snapshot
+
+def main(checkpoint, index, block, *collections):
+    if os.path.exists(checkpoint):
+        snapshot = HolderSnapshot.load(checkpoint)
+        if collections and [address_bytes(x) for x in collections] != snapshot.collections:
+            raise ValueError(f'{checkpoint} is a checkpoint of other collections.')
+    else:
+        snapshot = HolderSnapshot(collections)
+
+    applied = snapshot.sync(int(block))
+    snapshot.save(checkpoint)
+    tree = snapshot.write_snapshot(index)
+    print(f'{applied} transfers applied, {len(tree)} holders at block {snapshot.block}')
+    print('Root:', to_hex(tree.root))
@@ -0,0 +1,229 @@
+"""
+Incremental SQLite index of the `ScatterAuction` lifecycle events.
+
+    AuctionCreated, AuctionBid, AuctionExtended, AuctionSettled
+
+Events are streamed with `LogStream` and written together with a per
+auction checkpoint, so a restarted indexer carries on from the last indexed
+block. The hashes of the checkpoint and of every block with events are kept
+for the last `REORG_DEPTH` blocks; when one of them no longer matches the
+chain, only the events after the last matching block are rolled back.
+"""
+import sqlite3
+
+from brownie import web3
+from web3 import Web3
+
+from scripts.log_stream import LogStream
+
+REORG_DEPTH = 128
+
+EVENTS = {
+    'AuctionCreated': 'AuctionCreated(uint256,uint256,uint256)',
+    'AuctionBid': 'AuctionBid(uint256,address,uint256,bool)',
+    'AuctionExtended': 'AuctionExtended(uint256,uint256)',
+    'AuctionSettled': 'AuctionSettled(uint256,address,uint256)',
+}
+
+TOPICS = {Web3.keccak(text=sig).hex(): name for name, sig in EVENTS.items()}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    auction TEXT NOT NULL,
+    block_number INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    tx_hash TEXT NOT NULL,
+    event TEXT NOT NULL,
+    nft_id INTEGER NOT NULL,
+    bidder TEXT,
+    amount TEXT,
+    start_time INTEGER,
+    end_time INTEGER,
+    extended INTEGER,
+    PRIMARY KEY (auction, block_number, log_index)
+);
+CREATE INDEX IF NOT EXISTS events_nft_id ON events (auction, nft_id);
+CREATE INDEX IF NOT EXISTS events_bidder ON events (bidder);
+CREATE TABLE IF NOT EXISTS blocks (
+    auction TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    PRIMARY KEY (auction, number)
+);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    auction TEXT PRIMARY KEY,
+    block INTEGER NOT NULL
+);
+"""
+
+def _hex(value):
+    return value if isinstance(value, str) else value.hex()
+
+def _words(data):
+    data = bytes.fromhex(_hex(data)[2:])
+    return [data[i:i+32] for i in range(0, len(data), 32)]
+
+def _uint(word):
+    return int.from_bytes(word, 'big')
+
+def _address(word):
+    return Web3.toChecksumAddress('0x' + word[12:].hex())
+
+def decode_log(log):
+    """
+    Decodes a raw auction log into an `events` row, without the auction
+    address. Returns `None` for any other event.
+    """
+    topics = [_hex(x) for x in log['topics']]
+    event = TOPICS.get(topics[0])
+    if event is None: return None
+
+    words = _words(log['data'])
+    row = {
+        'block_number': log['blockNumber'],
+        'log_index': log['logIndex'],
+        'tx_hash': _hex(log['transactionHash']),
+        'event': event,
+        'nft_id': int(topics[1], 16),
+        'bidder': None,
+        'amount': None,
+        'start_time': None,
+        'end_time': None,
+        'extended': None,
+    }
+    if event == 'AuctionCreated':
+        row['start_time'], row['end_time'] = _uint(words[0]), _uint(words[1])
+    elif event == 'AuctionBid':
+        row['bidder'], row['amount'] = _address(words[0]), str(_uint(words[1]))
+        row['extended'] = _uint(words[2])
+    elif event == 'AuctionExtended':
+        row['end_time'] = _uint(words[0])
+    else:
+        row['bidder'], row['amount'] = _address(words[0]), str(_uint(words[1]))
+    return row
+
+
+class AuctionIndexer:
+
+    def __init__(self, db_path, auction, start_block = 0, web3 = web3, **stream_kwargs):
+        self.auction = getattr(auction, 'address', auction)
+        self.start_block = start_block
+        self.web3 = web3
+        self.stream = LogStream(
+            [self.auction], [list(TOPICS)], web3=web3, **stream_kwargs
+        )
+        self.db = sqlite3.connect(db_path)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    @property
+    def checkpoint(self):
+        row = self.db.execute(
+            'SELECT block FROM checkpoints WHERE auction = ?', (self.auction,)
+        ).fetchone()
+        return self.start_block - 1 if row is None else row['block']
+
+    def _block_hash(self, number):
+        try:
+            return _hex(self.web3.eth.get_block(number)['hash'])
+        except Exception:
+            # Blocks past the current head after a reorg.
+            return None
+
+    def rollback(self, block):
+        """
+        Deletes everything indexed after `block`.
+        """
+        with self.db:
+            self.db.execute(
+                'DELETE FROM events WHERE auction = ? AND block_number > ?',
+                (self.auction, block)
+            )
+            self.db.execute(
+                'DELETE FROM blocks WHERE auction = ? AND number > ?',
+                (self.auction, block)
+            )
+            self.db.execute(
+                'INSERT OR REPLACE INTO checkpoints VALUES (?, ?)',
+                (self.auction, block)
+            )
+
+    def handle_reorg(self):
+        """
+        Rolls back to the newest stored block that is still canonical.
+        Returns the number of the block rolled back to, or `None`.
+        """
+        stored = self.db.execute(
+            'SELECT number, hash FROM blocks WHERE auction = ? ORDER BY number DESC',
+            (self.auction,)
+        ).fetchall()
+        for i, row in enumerate(stored):
+            if self._block_hash(row['number']) == row['hash']:
+                if i == 0: return None
+                self.rollback(row['number'])
+                return row['number']
+
+        if not stored: return None
+        # Reorged past everything we remember, start over.
+        self.rollback(self.start_block - 1)
+        return self.start_block - 1
+
+    def sync(self, to_block = None):
+        """
+        Indexes every new event up to `to_block`, or the head if it is
+        further. Returns the number of events indexed.
+        """
+        self.handle_reorg()
+        head = self.web3.eth.block_number
+        if to_block is not None: head = min(to_block, head)
+        indexed = 0
+
+        for start, end, logs in self.stream.logs(self.checkpoint + 1, head):
+            rows = [x for x in map(decode_log, logs) if x is not None]
+            hashes = {x['blockNumber']: _hex(x['blockHash']) for x in logs}
+            hashes[end] = self._block_hash(end)
+
+            with self.db:
+                self.db.executemany(
+                    'INSERT OR REPLACE INTO events VALUES ('
+                    ':auction, :block_number, :log_index, :tx_hash, :event, '
+                    ':nft_id, :bidder, :amount, :start_time, :end_time, :extended)',
+                    [dict(x, auction=self.auction) for x in rows]
+                )
+                self.db.executemany(
+                    'INSERT OR REPLACE INTO blocks VALUES (?, ?, ?)',
+                    [(self.auction, n, h) for n, h in hashes.items()]
+                )
+                self.db.execute(
+                    'INSERT OR REPLACE INTO checkpoints VALUES (?, ?)',
+                    (self.auction, end)
+                )
+            indexed += len(rows)
+
+        with self.db:
+            self.db.execute(
+                'DELETE FROM blocks WHERE auction = ? AND number < ? AND number < ?',
+                (self.auction, head - REORG_DEPTH, self.checkpoint)
+            )
+        return indexed
+
+    def events(self, event = None, nft_id = None, bidder = None):
+        query = 'SELECT * FROM events WHERE auction = ?'
+        params = [self.auction]
+        if event is not None:
+            query += ' AND event = ?'
+            params.append(event)
+        if nft_id is not None:
+            query += ' AND nft_id = ?'
+            params.append(nft_id)
+        if bidder is not None:
+            query += ' AND bidder = ?'
+            params.append(getattr(bidder, 'address', bidder))
+        query += ' ORDER BY block_number, log_index'
+        return [dict(x) for x in self.db.execute(query, params)]
+
+    def bids(self, nft_id = None, bidder = None):
+        return self.events('AuctionBid', nft_id, bidder)
@@ -0,0 +1,157 @@
+"""
+Load generator for `ScatterAuction` bids.
+
+Many funded local accounts bid at the same time through
+`scripts.bidding_client`, all from the same `AuctionData` view, like a crowd
+of bots racing for the end of an auction. The run is summarized as a JSON
+report: throughput, latency percentiles, how many bids were placed or
+reverted and why, and how many of them extended the auction.
+
+    brownie run scripts/load_test.py main 200 5 load_report.json
+
+`main` deploys with `deploy_simple_auction` and starts the load inside the
+`timeBuffer` window, where every placed bid extends the auction.
+"""
+import json
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from random import randint
+
+from brownie import accounts, chain
+from web3 import Web3
+
+from scripts.auction_data import auction_data
+from scripts.bidding_client import (
+    AuctionWatcher,
+    Bidder,
+    BidRejected,
+    latency_stats,
+    min_bid,
+    next_nft_id
+)
+from scripts.clock import AuctionClock
+from scripts.deploy_helpers import deploy_simple_auction
+from scripts.indexer import EVENTS
+from scripts.playground import toWei
+
+REVERT_REASONS = (
+    'Bid too low.',
+    'Bid for wrong NFT ID.',
+    'Cannot create auction.',
+    'Bid below reserve price.',
+)
+
+BID_TOPIC = Web3.keccak(text=EVENTS['AuctionBid'])
+EXTENDED_TOPIC = Web3.keccak(text=EVENTS['AuctionExtended'])
+
+def revert_reason(message):
+    return next((x for x in REVERT_REASONS if x in message), 'other')
+
+
+class LoadRun:
+
+    def __init__(self, auction, bidders, rounds, concurrency, jitter):
+        self.auction = auction
+        self.bidders = bidders
+        self.rounds = rounds
+        self.concurrency = concurrency
+        self.jitter = jitter
+        self.outcomes = Counter()
+        self.extensions = 0
+        self.response = []
+        self.inclusion = []
+        self._lock = threading.Lock()
+
+    def run(self):
+        limit = threading.Semaphore(self.concurrency)
+        with AuctionWatcher(self.auction.address, self.auction.abi) as watcher:
+            bidders = [Bidder(watcher, x.address, x.private_key) for x in self.bidders]
+            start = time.monotonic()
+            with ThreadPoolExecutor(len(bidders)) as pool:
+                for x in [pool.submit(self._bid_rounds, x, limit) for x in bidders]:
+                    x.result()
+            return time.monotonic() - start
+
+    def _bid_rounds(self, bidder, limit):
+        watcher = bidder.watcher
+        for _ in range(self.rounds):
+            with limit:
+                data, now = watcher.data, watcher.now()
+                value = min_bid(data, now) + randint(0, self.jitter) * data.bidIncrement
+                sent_at = time.monotonic()
+                try:
+                    pending = bidder.bid(value, next_nft_id(data, now))
+                except BidRejected as e:
+                    with self._lock: self.outcomes[revert_reason(e.reason)] += 1
+                    continue
+                finally:
+                    with self._lock: self.response.append(time.monotonic() - sent_at)
+
+            receipt = pending.receipt()
+            with self._lock:
+                self.inclusion.append(pending.latency)
+                self._count(receipt)
+
+    def _count(self, receipt):
+        if receipt['status'] != 1:
+            # Reverted bids are mined: read their reason from the node.
+            tx = chain.get_transaction(receipt['transactionHash'])
+            self.outcomes[revert_reason(tx.revert_msg or '')] += 1
+            return
+        topics = [
+            x['topics'][0] for x in receipt['logs']
+            if x['address'] == self.auction.address
+        ]
+        # A bid that finds the collection sold out is refunded, not placed.
+        self.outcomes['placed' if BID_TOPIC in topics else 'refunded'] += 1
+        self.extensions += EXTENDED_TOPIC in topics
+
+    def report(self, elapsed):
+        bids = sum(self.outcomes.values())
+        return {
+            'auction': self.auction.address,
+            'contract': self.auction._name,
+            'bidders': len(self.bidders),
+            'rounds': self.rounds,
+            'concurrency': self.concurrency,
+            'bids': bids,
+            'elapsed': elapsed,
+            'throughput': {
+                'sent': bids / elapsed,
+                'placed': self.outcomes['placed'] / elapsed,
+            },
+            'latency': {
+                'response': latency_stats(self.response),
+                'inclusion': latency_stats(self.inclusion),
+            },
+            'outcomes': dict(self.outcomes),
+            'extensions': self.extensions,
+            'final': auction_data(self.auction).as_dict(),
+        }
+
+def load(auction, bidders, rounds = 1, concurrency = 64, jitter = 2):
+    """
+    Every account of `bidders` sends `rounds` bids, at most `concurrency`
+    of them waiting for a response at once. Bids go `0..jitter` bid
+    increments above the minimum, so that some of them race each other.
+    Returns the report.
+    """
+    run = LoadRun(auction, bidders, rounds, concurrency, jitter)
+    return run.report(run.run())
+
+def main(bidders = 100, rounds = 5, path = 'load_report.json'):
+    _, _, auction = deploy_simple_auction(reserve_price=0.001, bid_increment=0.001)
+    auction.createBid(1, {'from': accounts[0], 'value': toWei(0.001)})
+    AuctionClock().to_buffer(auction, 1)
+
+    created = [accounts.add() for _ in range(int(bidders))]
+    for account in created: accounts[0].transfer(account, toWei(1))
+    try:
+        report = load(auction, created, int(rounds))
+    finally:
+        for account in created: accounts.remove(account)
+
+    with open(path, 'w') as f: json.dump(report, f, indent=2, default=str)
+    print(json.dumps(report['outcomes']), f"extensions={report['extensions']}")
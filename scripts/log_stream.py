@@ -0,0 +1,64 @@
+"""
+Batched `eth_getLogs` over block ranges.
+
+Nodes reject ranges that return too many logs (or just time out on them),
+so the chunk size adapts: it is halved when a request fails or comes back
+too big, and doubled back after every small enough response.
+"""
+from brownie import web3
+
+DEFAULT_CHUNK = 2000
+MAX_CHUNK = 100_000
+TARGET_LOGS = 5000
+
+
+class LogStream:
+
+    def __init__(
+        self,
+        addresses,
+        topics = None,
+        chunk = DEFAULT_CHUNK,
+        max_chunk = MAX_CHUNK,
+        target_logs = TARGET_LOGS,
+        web3 = web3
+    ):
+        self.addresses = [getattr(x, 'address', x) for x in addresses]
+        self.topics = topics
+        self.chunk = chunk
+        self.max_chunk = max_chunk
+        self.target_logs = target_logs
+        self.web3 = web3
+
+    def get_logs(self, from_block, to_block):
+        query = {
+            'address': self.addresses,
+            'fromBlock': from_block,
+            'toBlock': to_block
+        }
+        if self.topics is not None: query['topics'] = self.topics
+        return self.web3.eth.get_logs(query)
+
+    def logs(self, from_block, to_block):
+        """
+        Yields `(start, end, logs)` for consecutive ranges covering
+        `from_block..to_block`, both included.
+        """
+        start = from_block
+        while start <= to_block:
+            end = min(start + self.chunk - 1, to_block)
+            try:
+                logs = self.get_logs(start, end)
+            except (ValueError, IOError):
+                # Too many results, response too big or timed out.
+                if self.chunk == 1: raise
+                self.chunk = max(self.chunk // 2, 1)
+                continue
+
+            if len(logs) > self.target_logs:
+                self.chunk = max(self.chunk // 2, 1)
+            elif len(logs) < self.target_logs // 2:
+                self.chunk = min(self.chunk * 2, self.max_chunk)
+
+            yield start, end, logs
+            start = end + 1
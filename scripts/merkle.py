@@ -0,0 +1,353 @@
+"""
+Merkle trees over `(address, rewardableTokensHeld)` pairs.
+
+Leaves are `keccak256(abi.encodePacked(bidder, uint96(held)))`, exactly what
+`WeightedRewardedAuction.checkBidderRewardableTokens` checks, and parents are
+hashed as sorted pairs like solady's `MerkleProofLib`.
+
+The tree is a perfect binary tree whose missing right part is filled with
+zero leaves. Those padding subtrees are never stored: their hashes are
+precomputed once per level, so a level only keeps the nodes that cover at
+least one real leaf. Every level is a flat `bytearray` of 32 byte nodes,
+which keeps a million leaf tree in ~64MB and lets proofs be sliced out of
+the levels instead of being rehashed.
+"""
+from eth_hash.auto import keccak
+
+NODE_SIZE = 32
+ADDRESS_SIZE = 20
+HELD_SIZE = 12 # `uint96`
+ZERO_NODE = bytes(NODE_SIZE)
+
+def address_bytes(addr):
+    """
+    Accepts raw 20 bytes, hex strings and brownie accounts/contracts.
+    """
+    if isinstance(addr, (bytes, bytearray)) and len(addr) == ADDRESS_SIZE:
+        return bytes(addr)
+    addr = getattr(addr, 'address', addr)
+    raw = bytes.fromhex(str(addr)[2:])
+    if len(raw) != ADDRESS_SIZE: raise ValueError(f'Invalid address {addr}')
+    return raw
+
+def encode_leaf(addr, held):
+    """
+    `abi.encodePacked(address, uint96)`.
+    """
+    return address_bytes(addr) + int(held).to_bytes(HELD_SIZE, 'big')
+
+def hash_leaf(addr, held):
+    return keccak(encode_leaf(addr, held))
+
+def hash_pair(a, b):
+    return keccak(a + b if a <= b else b + a)
+
+def hash_leaves(addrs, helds):
+    """
+    Packs and hashes all the leaves into a single flat buffer.
+    """
+    addrs = [address_bytes(x) for x in addrs]
+    helds = list(helds)
+    if len(addrs) != len(helds):
+        raise ValueError('Every address needs its amount of tokens held.')
+    return bytearray(b''.join(
+        keccak(a + int(h).to_bytes(HELD_SIZE, 'big'))
+        for a, h in zip(addrs, helds)
+    ))
+
+def hash_level(level, zero = ZERO_NODE):
+    """
+    Hashes a whole level into its parent level. An odd last node is paired
+    with `zero`, the root of the padding subtree at that height.
+    """
+    view = memoryview(level)
+    n = len(level) // NODE_SIZE
+    parent = bytearray((n + 1) // 2 * NODE_SIZE)
+    for i in range(0, n - 1, 2):
+        a = bytes(view[i*NODE_SIZE:(i+1)*NODE_SIZE])
+        b = bytes(view[(i+1)*NODE_SIZE:(i+2)*NODE_SIZE])
+        parent[i//2*NODE_SIZE:(i//2+1)*NODE_SIZE] = keccak(
+            a + b if a <= b else b + a
+        )
+    if n % 2:
+        parent[-NODE_SIZE:] = hash_pair(bytes(view[-NODE_SIZE:]), zero)
+    return parent
+
+def zero_hashes(depth):
+    """
+    `zeros[k]` is the root of a subtree of height `k` with only zero leaves.
+    """
+    zeros = [ZERO_NODE]
+    for _ in range(depth): zeros.append(hash_pair(zeros[-1], zeros[-1]))
+    return zeros
+
+def depth_for(n):
+    return max(n - 1, 0).bit_length()
+
+
+class HolderMerkleTree:
+    """
+    All the levels of a holders tree, from the leaves (`levels[0]`) up to
+    the root (`levels[-1]`).
+    """
+
+    def __init__(self, levels):
+        self.levels = levels
+        self.zeros = zero_hashes(len(levels) - 1)
+
+    @classmethod
+    def from_leaves(cls, leaves):
+        if not leaves: raise ValueError('Cannot build a tree without leaves.')
+        levels = [bytearray(leaves)]
+        zeros = zero_hashes(depth_for(len(leaves) // NODE_SIZE))
+        for zero in zeros[:-1]:
+            levels.append(hash_level(levels[-1], zero))
+        return cls(levels)
+
+    @classmethod
+    def build(cls, addrs, helds):
+        return cls.from_leaves(hash_leaves(addrs, helds))
+
+    @classmethod
+    def from_pairs(cls, pairs):
+        """
+        Builds the tree from `(address, held)` pairs, like
+        `addr_to_derivs_held()`.
+        """
+        pairs = list(pairs)
+        return cls.build([a for a, _ in pairs], [h for _, h in pairs])
+
+    def __len__(self):
+        return len(self.levels[0]) // NODE_SIZE
+
+    @property
+    def depth(self):
+        return len(self.levels) - 1
+
+    @property
+    def root(self):
+        return bytes(self.levels[-1][:NODE_SIZE])
+
+    def node(self, height, i):
+        level = self.levels[height]
+        if (i + 1) * NODE_SIZE > len(level): return self.zeros[height]
+        return bytes(level[i*NODE_SIZE:(i+1)*NODE_SIZE])
+
+    def leaf(self, i):
+        return self.node(0, i)
+
+    def proof(self, i):
+        """
+        Proof for the `i`-th leaf, in the order `MerkleProofLib.verify`
+        consumes it.
+        """
+        if not 0 <= i < len(self): raise IndexError(i)
+        return [self.node(h, (i >> h) ^ 1) for h in range(self.depth)]
+
+    def proofs(self):
+        """
+        Yields the proof of every leaf, in leaf order.
+        """
+        return (self.proof(i) for i in range(len(self)))
+
+    def multiproof(self, positions):
+        """
+        Multiproof for the leaves at `positions`, in the format solady's
+        `MerkleProofLib.verifyMultiProof` consumes. Returns
+        `(positions, proof, flags)`, where `positions` are sorted: the
+        leaves must be passed to the contract in that order.
+
+        Every level is walked left to right, so the queue of known nodes
+        the contract keeps is always in position order. Padding siblings
+        are sent as proof nodes like any other.
+        """
+        positions = sorted(set(positions))
+        if not positions: raise ValueError('A multiproof needs leaves.')
+        if positions[0] < 0 or positions[-1] >= len(self):
+            raise IndexError(positions[-1])
+
+        proof, flags = [], []
+        known = positions
+        for h in range(self.depth):
+            parents = []
+            i = 0
+            while i < len(known):
+                j = known[i]
+                if i + 1 < len(known) and known[i+1] == j ^ 1:
+                    flags.append(True)
+                    i += 2
+                else:
+                    flags.append(False)
+                    proof.append(self.node(h, j ^ 1))
+                    i += 1
+                parents.append(j >> 1)
+            known = parents
+        return positions, proof, flags
+
+    def verify(self, proof, leaf):
+        for node in proof: leaf = hash_pair(leaf, node)
+        return leaf == self.root
+
+    def verify_multiproof(self, proof, flags, leaves):
+        """
+        Python port of `MerkleProofLib.verifyMultiProof`.
+        """
+        if len(flags) != len(leaves) - 1 + len(proof): return False
+        if not flags: return (leaves[0] if leaves else proof[0]) == self.root
+        queue = list(leaves)
+        proof = iter(proof)
+        for flag in flags:
+            a = queue.pop(0)
+            queue.append(hash_pair(a, queue.pop(0) if flag else next(proof)))
+        return queue[-1] == self.root
+
+
+class IncrementalMerkleTree(HolderMerkleTree):
+    """
+    `HolderMerkleTree` that also keeps its holders, so that setting, adding
+    or removing k of them only rehashes their O(k log n) ancestors.
+
+    New holders are appended and a removed holder is replaced by the last
+    one, so the levels are always those of `HolderMerkleTree.build` over
+    `holders()`. Every node rewritten since the last `clear_changes` is
+    recorded, to ship only what changed to whoever serves the proofs.
+    """
+
+    def __init__(self, levels):
+        super().__init__(levels)
+        self.addrs = []
+        self.helds = []
+        self.positions = {}
+        self.changed = set()
+
+    @classmethod
+    def build(cls, addrs, helds):
+        addrs = [address_bytes(x) for x in addrs]
+        helds = [int(x) for x in helds]
+        tree = super().build(addrs, helds)
+        tree.addrs, tree.helds = addrs, helds
+        tree.positions = {x: i for i, x in enumerate(addrs)}
+        if len(tree.positions) != len(addrs): raise ValueError('Duplicated holder.')
+        return tree
+
+    def holders(self):
+        """
+        `(addrs, helds)` in leaf order.
+        """
+        return list(self.addrs), list(self.helds)
+
+    def held(self, addr):
+        i = self.positions.get(address_bytes(addr))
+        return 0 if i is None else self.helds[i]
+
+    def set(self, addr, held):
+        self.update([(addr, held)])
+
+    def update(self, changes):
+        """
+        Applies `(address, held)` changes, then rehashes the touched paths
+        once. A held of 0 removes the holder.
+        """
+        dirty = set()
+        try:
+            for addr, held in changes:
+                addr, held = address_bytes(addr), int(held)
+                i = self.positions.get(addr)
+                if held == 0:
+                    if i is not None: dirty.update(self._remove(i))
+                elif i is None:
+                    dirty.add(self._append(addr, held))
+                elif held != self.helds[i]:
+                    self.helds[i] = held
+                    self._write_leaf(i)
+                    dirty.add(i)
+        finally:
+            self._rehash(dirty)
+
+    def _write_leaf(self, i):
+        self.levels[0][i*NODE_SIZE:(i+1)*NODE_SIZE] = hash_leaf(self.addrs[i], self.helds[i])
+
+    def _append(self, addr, held):
+        i = len(self.addrs)
+        self.positions[addr] = i
+        self.addrs.append(addr)
+        self.helds.append(held)
+        self.levels[0].extend(ZERO_NODE)
+        self._write_leaf(i)
+        return i
+
+    def _remove(self, i):
+        last = len(self.addrs) - 1
+        if last == 0: raise ValueError('Cannot remove the last holder.')
+        del self.positions[self.addrs[i]]
+        if i != last:
+            self.addrs[i], self.helds[i] = self.addrs[last], self.helds[last]
+            self.positions[self.addrs[i]] = i
+            self.levels[0][i*NODE_SIZE:(i+1)*NODE_SIZE] = \
+                self.levels[0][last*NODE_SIZE:(last+1)*NODE_SIZE]
+        self.addrs.pop()
+        self.helds.pop()
+        del self.levels[0][last*NODE_SIZE:]
+        return i, last
+
+    def _rehash(self, dirty):
+        n = len(self.addrs)
+        depth = depth_for(n)
+        if depth + 1 != len(self.levels):
+            del self.levels[depth + 1:]
+            while len(self.levels) < depth + 1: self.levels.append(bytearray())
+            self.zeros = zero_hashes(depth)
+            # Every proof changes length: rewrite the whole tree.
+            dirty = set(range(n))
+
+        # Removed leaves too: their sibling's proof changed.
+        self.changed.update((0, i) for i in dirty)
+        for h in range(1, depth + 1):
+            size = (n + (1 << h) - 1) >> h
+            level = self.levels[h]
+            if len(level) > size * NODE_SIZE: del level[size * NODE_SIZE:]
+            else: level.extend(bytes(size * NODE_SIZE - len(level)))
+
+            # Removed nodes are kept in `dirty`, their parent may still exist.
+            dirty = {i >> 1 for i in dirty}
+            for i in dirty:
+                if i >= size: continue
+                level[i*NODE_SIZE:(i+1)*NODE_SIZE] = hash_pair(
+                    self.node(h - 1, 2 * i), self.node(h - 1, 2 * i + 1)
+                )
+                self.changed.add((h, i))
+
+    def changed_nodes(self):
+        """
+        `(height, index, node)` of every node rewritten since the last
+        `clear_changes`, that is still part of the tree.
+        """
+        return [
+            (h, i, self.node(h, i)) for h, i in sorted(self.changed)
+            if h <= self.depth and (i + 1) * NODE_SIZE <= len(self.levels[h])
+        ]
+
+    def changed_proofs(self):
+        """
+        Yields `(position, proof)` for every leaf that changed or whose
+        proof did. Any change rewrites one node of almost every proof, so
+        prefer `changed_nodes` for big trees.
+        """
+        n = len(self)
+        ranges = []
+        for h, i in self.changed:
+            if h == 0 and i < n: ranges.append((i, i + 1))
+            if h < self.depth:
+                sibling = i ^ 1
+                ranges.append((sibling << h, min((sibling + 1) << h, n)))
+
+        end = 0
+        for start, stop in sorted(ranges):
+            for i in range(max(start, end), stop): yield i, self.proof(i)
+            end = max(end, stop)
+
+    def clear_changes(self):
+        self.changed.clear()
+
+def to_hex(node):
+    return '0x' + node.hex()
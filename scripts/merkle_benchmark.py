@@ -0,0 +1,62 @@
+"""
+Build time and peak memory of `HolderMerkleTree` for big holder snapshots,
+and the time `IncrementalMerkleTree` takes to apply `UPDATES` changes.
+
+    brownie run scripts/merkle_benchmark.py
+"""
+import os
+import tracemalloc
+from random import randint
+from time import perf_counter
+
+from scripts.merkle import HolderMerkleTree, IncrementalMerkleTree
+
+SIZES = [10_000, 100_000, 1_000_000]
+UPDATES = 100
+
+def random_snapshot(n):
+    return [os.urandom(20) for _ in range(n)], [randint(0, 20) for _ in range(n)]
+
+def bench(n):
+    addrs, helds = random_snapshot(n)
+
+    start = perf_counter()
+    tree = HolderMerkleTree.build(addrs, helds)
+    build_time = perf_counter() - start
+
+    start = perf_counter()
+    for _ in tree.proofs(): pass
+    proofs_time = perf_counter() - start
+
+    del tree
+    tracemalloc.start()
+    HolderMerkleTree.build(addrs, helds)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    tree = IncrementalMerkleTree.build(addrs, helds)
+    changes = (
+        [(addrs[randint(0, n - 1)], randint(1, 20)) for _ in range(UPDATES // 2)] +
+        [(os.urandom(20), randint(1, 20)) for _ in range(UPDATES // 4)] +
+        [(addrs[randint(0, n - 1)], 0) for _ in range(UPDATES // 4)]
+    )
+    start = perf_counter()
+    tree.update(changes)
+    update_time = perf_counter() - start
+
+    return build_time, proofs_time, peak, update_time
+
+def main():
+    print(
+        f'{"leaves":>10} {"build (s)":>10} {"proofs (s)":>11} {"peak (MB)":>10}'
+        f' {"update (ms)":>12}'
+    )
+    for n in SIZES:
+        build_time, proofs_time, peak, update_time = bench(n)
+        print(
+            f'{n:>10} {build_time:>10.2f} {proofs_time:>11.2f} {peak / 2**20:>10.1f}'
+            f' {update_time * 1000:>12.1f}'
+        )
+
+if __name__ == '__main__':
+    main()
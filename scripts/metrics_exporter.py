@@ -0,0 +1,322 @@
+"""
+Live Prometheus metrics of running `ScatterAuction` deployments.
+
+The exporter follows new blocks and, for every block, reads `auctionData()`
+and the auction events of that block only. Everything it keeps has a fixed
+size, so memory does not grow over a months-long drop:
+
+- the bid rate is computed over the last `RATE_WINDOW` blocks,
+- distributions (extensions and price per lot, settle lag, and the
+  exporter's own per-block processing time) are `Summary`s of P² quantile
+  estimates, five markers per quantile whatever the number of samples,
+- only the lots that are not settled yet are tracked.
+
+Metrics are served as Prometheus text on `/metrics`:
+
+    brownie run scripts/metrics_exporter.py main 9101 <auction> [<auction> ...]
+"""
+import bisect
+import math
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from brownie import web3
+
+from scripts.auction_data import auction_data
+from scripts.indexer import TOPICS, decode_log
+from scripts.log_stream import LogStream
+
+RATE_WINDOW = 100
+POLL_INTERVAL = 1
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+class P2Quantile:
+    """
+    Jain and Chlamtac's P² estimate of the `q` quantile, in constant memory.
+    Exact until 5 samples have been seen.
+    """
+
+    def __init__(self, q):
+        self.q = q
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * q, 1 + 4 * q, 3 + 2 * q, 5]
+        self.increments = [0, q / 2, q, (1 + q) / 2, 1]
+
+    def add(self, x):
+        h, n = self.heights, self.positions
+        if len(h) < 5:
+            bisect.insort(h, x)
+            return
+
+        if x < h[0]:
+            h[0] = x
+            k = 0
+        elif x >= h[4]:
+            h[4] = x
+            k = 3
+        else:
+            k = bisect.bisect_right(h, x) - 1
+        for i in range(k + 1, 5): n[i] += 1
+        for i in range(5): self.desired[i] += self.increments[i]
+
+        for i in (1, 2, 3):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                height = self._parabolic(i, d)
+                if not h[i - 1] < height < h[i + 1]: height = self._linear(i, d)
+                h[i] = height
+                n[i] += d
+
+    def _parabolic(self, i, d):
+        h, n = self.heights, self.positions
+        return h[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (h[i + 1] - h[i]) / (n[i + 1] - n[i]) +
+            (n[i + 1] - n[i] - d) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def _linear(self, i, d):
+        h, n = self.heights, self.positions
+        return h[i] + d * (h[i + d] - h[i]) / (n[i + d] - n[i])
+
+    def value(self):
+        h = self.heights
+        if not h: return math.nan
+        if len(h) < 5 or self.positions[4] == 5:
+            return h[min(int(self.q * len(h)), len(h) - 1)]
+        return h[2]
+
+
+class Summary:
+
+    def __init__(self, quantiles = QUANTILES):
+        self.quantiles = [P2Quantile(q) for q in quantiles]
+        self.count = 0
+        self.sum = 0
+
+    def add(self, x):
+        for quantile in self.quantiles: quantile.add(x)
+        self.count += 1
+        self.sum += x
+
+
+class RateWindow:
+    """
+    Events per second over the last `size` blocks.
+    """
+
+    def __init__(self, size = RATE_WINDOW):
+        self.blocks = deque(maxlen=size)
+
+    def add(self, timestamp, events):
+        self.blocks.append((timestamp, events))
+
+    def rate(self):
+        if len(self.blocks) < 2: return 0
+        span = self.blocks[-1][0] - self.blocks[0][0]
+        # The events of the oldest block happened before the window started.
+        events = sum(x for _, x in self.blocks) - self.blocks[0][1]
+        return events / span if span > 0 else 0
+
+
+class AuctionMetrics:
+
+    def __init__(self, auction, rate_window):
+        self.auction = auction
+        self.data = None
+        self.now = 0
+        self.bids = 0
+        self.bid_rate = RateWindow(rate_window)
+        # `nft_id -> [end_time, extensions]` of the lots not settled yet.
+        self.lots = {}
+        self.extensions = Summary()
+        self.price_to_reserve = Summary()
+        self.settle_lag = Summary()
+
+    def lot(self, nft_id):
+        lot = self.lots.get(nft_id)
+        if lot is None:
+            # Created before the exporter started.
+            end_time = self.data.endTime if self.data and self.data.nftId == nft_id else None
+            lot = self.lots[nft_id] = [end_time, 0]
+        return lot
+
+    def apply(self, row, timestamp):
+        event = row['event']
+        if event == 'AuctionCreated':
+            self.lots[row['nft_id']] = [row['end_time'], 0]
+        elif event == 'AuctionBid':
+            self.bids += 1
+        elif event == 'AuctionExtended':
+            lot = self.lot(row['nft_id'])
+            lot[0] = row['end_time']
+            lot[1] += 1
+        elif event == 'AuctionSettled':
+            end_time, extensions = self.lot(row['nft_id'])
+            del self.lots[row['nft_id']]
+            self.extensions.add(extensions)
+            if self.data is not None:
+                self.price_to_reserve.add(int(row['amount']) / self.data.reservePrice)
+            if end_time is not None: self.settle_lag.add(timestamp - end_time)
+
+    def current_extensions(self):
+        lot = self.lots.get(self.data.nftId)
+        return 0 if lot is None else lot[1]
+
+
+class MetricsExporter:
+
+    def __init__(self, auctions, start_block = None, rate_window = RATE_WINDOW, web3 = web3):
+        self.web3 = web3
+        self.metrics = {x.address: AuctionMetrics(x, rate_window) for x in auctions}
+        self.stream = LogStream(list(self.metrics), [list(TOPICS)], web3=web3)
+        if start_block is None: start_block = web3.eth.block_number
+        # Last block processed.
+        self.block = start_block - 1
+        self.blocks = 0
+        self.block_seconds = Summary()
+        self._lock = threading.Lock()
+
+    def process_block(self, number):
+        started = time.perf_counter()
+        timestamp = self.web3.eth.get_block(number)['timestamp']
+        logs = self.stream.get_logs(number, number)
+
+        with self._lock:
+            bids = dict.fromkeys(self.metrics, 0)
+            for metrics in self.metrics.values():
+                metrics.data = auction_data(metrics.auction, number)
+                metrics.now = timestamp
+            for log in logs:
+                row = decode_log(log)
+                if row is None: continue
+                self.metrics[log['address']].apply(row, timestamp)
+                bids[log['address']] += row['event'] == 'AuctionBid'
+            for address, metrics in self.metrics.items():
+                metrics.bid_rate.add(timestamp, bids[address])
+
+            self.block = number
+            self.blocks += 1
+            self.block_seconds.add(time.perf_counter() - started)
+
+    def sync(self, to_block = None):
+        """
+        Processes every new block up to `to_block`, or up to the head if it
+        is not given or not mined yet. Returns the number of blocks processed.
+        """
+        head = self.web3.eth.block_number
+        if to_block is not None: head = min(to_block, head)
+        start = self.block
+        for number in range(self.block + 1, head + 1): self.process_block(number)
+        return self.block - start
+
+    def run(self, poll_interval = POLL_INTERVAL):
+        while True:
+            self.sync()
+            time.sleep(poll_interval)
+
+    def render(self):
+        lines = []
+
+        def metric(name, kind, help, samples):
+            lines.append(f'# HELP {name} {help}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in samples:
+                lines.append(f'{name}{_labels(labels)} {_number(value)}')
+
+        def summary(name, help, summaries):
+            samples = []
+            for labels, s in summaries:
+                samples += [
+                    (dict(labels, quantile=str(x.q)), x.value()) for x in s.quantiles
+                ]
+            metric(name, 'summary', help, samples)
+            for labels, s in summaries:
+                lines.append(f'{name}_sum{_labels(labels)} {_number(s.sum)}')
+                lines.append(f'{name}_count{_labels(labels)} {s.count}')
+
+        with self._lock:
+            auctions = [
+                ({'auction': address}, x) for address, x in self.metrics.items()
+                if x.data is not None
+            ]
+            metric('scatter_auction_nft_id', 'gauge', 'Current lot.',
+                [(l, x.data.nftId) for l, x in auctions])
+            metric('scatter_auction_seconds_to_end', 'gauge',
+                'Seconds from the last block to the end of the current lot.',
+                [(l, x.data.endTime - x.now) for l, x in auctions])
+            metric('scatter_auction_price_to_reserve', 'gauge',
+                'Current highest bid over the reserve price.',
+                [(l, x.data.amount / x.data.reservePrice) for l, x in auctions])
+            metric('scatter_auction_lot_extensions', 'gauge',
+                'AuctionExtended events of the current lot.',
+                [(l, x.current_extensions()) for l, x in auctions])
+            metric('scatter_auction_bids_total', 'counter', 'Bids seen.',
+                [(l, x.bids) for l, x in auctions])
+            metric('scatter_auction_bid_rate', 'gauge',
+                'Bids per second over the last blocks.',
+                [(l, x.bid_rate.rate()) for l, x in auctions])
+            summary('scatter_auction_extensions_per_lot',
+                'AuctionExtended events per settled lot.',
+                [(l, x.extensions) for l, x in auctions])
+            summary('scatter_auction_settled_price_to_reserve',
+                'Settled price over the reserve price.',
+                [(l, x.price_to_reserve) for l, x in auctions])
+            summary('scatter_auction_settle_lag_seconds',
+                'Seconds between endTime and AuctionSettled.',
+                [(l, x.settle_lag) for l, x in auctions])
+
+            metric('scatter_exporter_last_block', 'gauge', 'Last block processed.',
+                [({}, self.block)])
+            metric('scatter_exporter_blocks_total', 'counter', 'Blocks processed.',
+                [({}, self.blocks)])
+            summary('scatter_exporter_block_seconds',
+                'Time spent processing a block.', [({}, self.block_seconds)])
+        return '\n'.join(lines) + '\n'
+
+    def serve(self, port, host = ''):
+        """
+        Serves `/metrics` from a background thread. Returns the server,
+        `shutdown()` it to stop.
+        """
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                if self.path != '/metrics':
+                    self.send_error(404)
+                    return
+                body = exporter.render().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+def _labels(labels):
+    if not labels: return ''
+    return '{' + ','.join(f'{k}="{v}"' for k, v in labels.items()) + '}'
+
+def _number(value):
+    if isinstance(value, float) and math.isnan(value): return 'NaN'
+    return repr(value)
+
+def main(port, *auctions):
+    from brownie import ScatterAuction
+
+    exporter = MetricsExporter([ScatterAuction.at(x) for x in auctions])
+    exporter.serve(int(port))
+    print(f'Serving metrics on :{port}/metrics')
+    exporter.run()
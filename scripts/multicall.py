@@ -0,0 +1,101 @@
+"""
+Client for `AuctionMulticall`: packs many view calls into a few `eth_call`s.
+
+    reads = Multicall(multicall)
+    data = reads.add(auction.auctionData)
+    shares = [reads.add(auction.getSharesFor, x) for x in bidders]
+    results = reads.execute()
+    results[data], results[shares[0]]
+
+Batches are sized up front to stay under both `batch_size` calls and the
+node's gas cap for `eth_call`, from the gas every call is expected to use.
+That is estimated once per contract and method, or given to `add`. A batch
+that still fails is split in halves until it goes through. Each call is
+decoded with its own ABI, and an optional `decode` callable turns it into a
+typed value.
+"""
+from brownie import web3
+from brownie.exceptions import VirtualMachineError
+
+BATCH_SIZE = 500
+GAS_CAP = 50_000_000
+# Spent by `aggregate` around every call: the loop, the `staticcall` and
+# copying the result.
+CALL_GAS = 5_000
+
+
+class Multicall:
+
+    def __init__(self, multicall, batch_size = BATCH_SIZE, gas_cap = GAS_CAP, web3 = web3):
+        self.multicall = multicall
+        self.batch_size = batch_size
+        self.gas_cap = gas_cap
+        self.web3 = web3
+        self.calls = []
+        self.requests = 0
+        # `(address, selector) -> gas`
+        self.gas_estimates = {}
+
+    def add(self, method, *args, decode = None, gas = None):
+        """
+        Queues `method(*args)`, a brownie contract view method, expected to
+        use `gas`. Returns the index of its result.
+        """
+        data = method.encode_input(*args)
+        if gas is None: gas = self._estimate_gas(method._address, data)
+        self.calls.append((method, (method._address, data), decode, gas))
+        return len(self.calls) - 1
+
+    def _estimate_gas(self, address, data):
+        key = (address, data[:10])
+        gas = self.gas_estimates.get(key)
+        if gas is None:
+            # Includes the intrinsic gas of a transaction, which leaves
+            # room for arguments that cost more than these ones.
+            gas = self.web3.eth.estimate_gas({'to': address, 'data': data})
+            self.gas_estimates[key] = gas
+        return gas
+
+    def batches(self, calls):
+        """
+        Splits `calls` into batches of at most `batch_size` calls and
+        `gas_cap` expected gas.
+        """
+        batch, gas = [], 0
+        for call in calls:
+            cost = call[3] + CALL_GAS
+            if batch and (len(batch) == self.batch_size or gas + cost > self.gas_cap):
+                yield batch
+                batch, gas = [], 0
+            batch.append(call)
+            gas += cost
+        if batch: yield batch
+
+    def _aggregate(self, calls, block):
+        self.requests += 1
+        try:
+            _, results = self.multicall.aggregate.call(
+                calls, {'gas': self.gas_cap}, block_identifier=block
+            )
+            return list(results)
+        except (VirtualMachineError, ValueError):
+            if len(calls) == 1: raise
+        half = len(calls) // 2
+        return self._aggregate(calls[:half], block) + self._aggregate(calls[half:], block)
+
+    def execute(self, block = None):
+        """
+        Runs every queued call at `block` (latest by default) and clears the
+        queue. Failed calls return `None`.
+        """
+        calls, self.calls = self.calls, []
+        results = []
+        for batch in self.batches(calls):
+            raw = self._aggregate([x[1] for x in batch], block)
+            for (method, _, decode, _), (success, data) in zip(batch, raw):
+                if not success:
+                    results.append(None)
+                    continue
+                value = method.decode_output(data)
+                results.append(value if decode is None else decode(value))
+        return results
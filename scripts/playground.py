@@ -6,6 +6,8 @@ from brownie import (
 from brownie import accounts
 from web3 import Web3
 from random import randint
+from scripts.merkle import HolderMerkleTree, to_hex
+from scripts.auction_data import auction_data
 
 toWei = lambda x: Web3.toWei(x, 'ether')
 fst = lambda xs: xs[0]
@@ -19,39 +21,16 @@ def reverts(f):
         return False
     return True
 
-from_param_to_auction_house_index = {
-    "bidder": 0,
-    "amount": 1,
-    "startTime": 2,
-    "endTime": 3,
-    "nftId": 4,
-    "maxSupply": 5,
-    "settled": 6,
-    "nftContract": 7,
-    "reservePrice": 8,
-    "bidIncrement": 9,
-    "duration": 10,
-    "timeBuffer": 11,
-    "nftContractBalance": 12,
-    "rewardToken": 13
-}
-
 def getparam(param, auction_house):
-    return auction_house.auctionData()[
-        from_param_to_auction_house_index[param]
-    ]
+    return getattr(auction_data(auction_house), param)
 
 def gen_merkle_root(data):
-    tree = MerkleTree()
-    for x in data: tree.append_entry(x)
-    return tree
+    return HolderMerkleTree.from_pairs(data)
 
 def get_merkle_root_and_proofs_from_addrs_and_helds(data):
-    derivs_held = [x.address + str(y) for x,y in data]
-    print(derivs_held)
-    tree = gen_merkle_root(derivs_held)
-    proofs = [tree.prove_inclusion(x) for x in derivs_held]
-    return tree.root, proofs
+    tree = gen_merkle_root(data)
+    proofs = [list(map(to_hex, proof)) for proof in tree.proofs()]
+    return to_hex(tree.root), proofs
 
 # Example merkle data for testing
 addr_to_derivs_held = lambda: [
@@ -60,7 +39,7 @@ addr_to_derivs_held = lambda: [
     (accounts[5], 7)
 ]
 
-root = '0x1ac5d8fdba8b4f6e3c8d3381bee0fb781b25f4605943d1f4c16c2c501ac6bbd0'
+root = '0xe978e39ed9c35620597af06f7ef98222778fcea1c937d9ce26549eaa9b142f3a'
 
 leaves = [
     '0xd27c13c45e6a0395f716d594e1038f64611dafe9cc8b63bf820c19164a160018',
@@ -71,13 +50,14 @@ leaves = [
 proofs = [
     [
         '0xf2117fbefe2043d8ec1daf1c5ce5bbeefc106f981de674de3263b1053d94c4e8',
-        '0xff98a8c4b3cef14e438c7598fe6d61b684ddbd6ffd2135f21f1b2cf596e89d64'
+        '0x17bb7bc6b1c1091fe5c6d709cfce534562705a2ed3ceae96fcf7cc26bec3f09b'
     ],
     [
         '0xd27c13c45e6a0395f716d594e1038f64611dafe9cc8b63bf820c19164a160018',
-        '0xff98a8c4b3cef14e438c7598fe6d61b684ddbd6ffd2135f21f1b2cf596e89d64'
+        '0x17bb7bc6b1c1091fe5c6d709cfce534562705a2ed3ceae96fcf7cc26bec3f09b'
     ],
     [
+        '0x0000000000000000000000000000000000000000000000000000000000000000',
         '0x66464c260dc03e0bb8bf313ec3f9291032fadb210481ade182517bae30eae5b0'
     ]
 ]
@@ -93,4 +73,8 @@ def change_random_hex(addr):
     return '0x' + change_random_letter(addr[2:])
 
 def main():
-    get_merkle_root_and_proofs_from_addrs_and_helds(derivs_held)
+    root, proofs = get_merkle_root_and_proofs_from_addrs_and_helds(
+        addr_to_derivs_held()
+    )
+    print(root)
+    for proof in proofs: print(proof)
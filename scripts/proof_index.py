@@ -0,0 +1,151 @@
+"""
+Compact on-disk index of a `HolderMerkleTree`, to look up the proof of a
+single wallet without rebuilding the whole tree.
+
+The file is made of fixed width sections, so it can be memory-mapped and
+read in place. Integers are little endian, except the helds, which are
+big endian like the `uint96` of the leaves they are hashed into:
+
+    header      magic, version, depth, count, root        (see `HEADER`)
+    levels      (offset, nodes) for every level            depth + 1 `LEVEL`
+    addresses   holder addresses, sorted                   count * 20 bytes
+    helds       `uint96` held per address, big endian      count * 12 bytes
+    positions   leaf index per address                     count * `uint32`
+    zeros       padding subtree hash per height            (depth + 1) * 32
+    nodes       every tree level, from the leaves up       32 bytes per node
+
+A lookup is a binary search over `addresses` plus one slice per level, and
+opening the file only parses the header.
+"""
+import mmap
+import struct
+
+from scripts.merkle import (
+    ADDRESS_SIZE,
+    HELD_SIZE,
+    NODE_SIZE,
+    address_bytes,
+)
+
+MAGIC = b'SCPI'
+VERSION = 1
+HEADER = struct.Struct('<4sHHQ32s')
+LEVEL = struct.Struct('<QQ')
+POSITION = struct.Struct('<I')
+
+def write_proof_index(path, tree, addrs, helds):
+    """
+    Writes `tree`, built from `addrs` and `helds` in that same order,
+    to `path`.
+    """
+    addrs = [address_bytes(x) for x in addrs]
+    helds = list(helds)
+    n = len(addrs)
+    if n != len(tree) or n != len(helds):
+        raise ValueError('The tree was not built from these holders.')
+
+    order = sorted(range(n), key=addrs.__getitem__)
+    for a, b in zip(order, order[1:]):
+        if addrs[a] == addrs[b]:
+            raise ValueError(f'Duplicated holder 0x{addrs[a].hex()}')
+
+    sections = [
+        b''.join(addrs[i] for i in order),
+        b''.join(int(helds[i]).to_bytes(HELD_SIZE, 'big') for i in order),
+        b''.join(POSITION.pack(i) for i in order),
+        b''.join(tree.zeros),
+    ]
+
+    offset = HEADER.size + LEVEL.size * len(tree.levels) + sum(map(len, sections))
+    table = []
+    for level in tree.levels:
+        table.append(LEVEL.pack(offset, len(level) // NODE_SIZE))
+        offset += len(level)
+
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, tree.depth, n, tree.root))
+        f.write(b''.join(table))
+        for section in sections: f.write(section)
+        for level in tree.levels: f.write(level)
+
+
+class ProofIndex:
+    """
+    Read-only, memory-mapped view of a file written by `write_proof_index`.
+
+    Proof nodes are returned as `memoryview`s over the mapping. They must be
+    released (or copied with `bytes`) before calling `close`.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+
+        magic, version, self.depth, self.count, self.root = \
+            HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'{path} is not a proof index.')
+
+        self._levels = [
+            LEVEL.unpack_from(self._mmap, HEADER.size + LEVEL.size * h)
+            for h in range(self.depth + 1)
+        ]
+        self._addresses = HEADER.size + LEVEL.size * (self.depth + 1)
+        self._helds = self._addresses + ADDRESS_SIZE * self.count
+        self._positions = self._helds + HELD_SIZE * self.count
+        self._zeros = self._positions + POSITION.size * self.count
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def close(self):
+        self._view.release()
+        self._mmap.close()
+
+    def address(self, i):
+        start = self._addresses + i * ADDRESS_SIZE
+        return self._mmap[start:start + ADDRESS_SIZE]
+
+    def find(self, addr):
+        """
+        Index of `addr` in the sorted address section, or `-1`.
+        """
+        addr = address_bytes(addr)
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.address(mid) < addr: lo = mid + 1
+            else: hi = mid
+        return lo if lo < self.count and self.address(lo) == addr else -1
+
+    def held(self, i):
+        start = self._helds + i * HELD_SIZE
+        return int.from_bytes(self._mmap[start:start + HELD_SIZE], 'big')
+
+    def position(self, i):
+        return POSITION.unpack_from(self._mmap, self._positions + i * POSITION.size)[0]
+
+    def node(self, height, i):
+        offset, nodes = self._levels[height]
+        if i >= nodes: offset, i = self._zeros + height * NODE_SIZE, 0
+        start = offset + i * NODE_SIZE
+        return self._view[start:start + NODE_SIZE]
+
+    def proof_at(self, position):
+        return [self.node(h, (position >> h) ^ 1) for h in range(self.depth)]
+
+    def lookup(self, addr):
+        """
+        Returns `(uniqueDerivsHeld, proof)` for `addr`, or `None` if it is
+        not a holder.
+        """
+        i = self.find(addr)
+        if i < 0: return None
+        return self.held(i), self.proof_at(self.position(i))
@@ -0,0 +1,111 @@
+"""
+Off-chain, all-bidders-at-once version of `WeightedRewardedAuction`'s
+reward logic.
+
+`getRewardsFor` is
+
+    base = share * rewardRatio.x / rewardRatio.y
+    base * (1 + uniqueDerivsHeld * extraRatio.x / extraRatio.y)
+
+with Solidity's truncating division at each step. uint256 products don't
+fit in fixed width arrays, so the same operations are run over Python
+integers, which are exact and still take milliseconds for tens of
+thousands of bidders.
+"""
+from collections import defaultdict
+
+from scripts.merkle import to_hex
+
+SHARES_BATCH = 1000
+
+
+class RewardsConfig:
+    __slots__ = ('reward_token', 'reward_ratio', 'extra_ratio', 'root')
+
+    def __init__(self, reward_token, reward_ratio, extra_ratio, root):
+        self.reward_token = reward_token
+        self.reward_ratio = tuple(reward_ratio)
+        self.extra_ratio = tuple(extra_ratio)
+        self.root = root
+
+    @classmethod
+    def read(cls, auction):
+        return cls(*auction.getRewardsConfig())
+
+    @property
+    def extra_rewards_supported(self):
+        return self.extra_ratio[0] != 0 and self.extra_ratio[1] != 0
+
+
+def shares_from_bids(bids):
+    """
+    Adds up the `AuctionBid` amounts of every bidder, as `createBid` does.
+    `bids` are indexer rows or decoded events with `bidder` and `amount`.
+
+    Shares are cleared when claimed, so this is the total before any claim.
+    """
+    shares = defaultdict(int)
+    for bid in bids: shares[bid['bidder']] += int(bid['amount'])
+    return dict(shares)
+
+def read_shares(auction, bidders, batch = SHARES_BATCH):
+    """
+    Current shares of `bidders`, `batch` addresses per `getSharesForMany`.
+    """
+    bidders = [getattr(x, 'address', x) for x in bidders]
+    shares = {}
+    for i in range(0, len(bidders), batch):
+        chunk = bidders[i:i+batch]
+        shares.update(zip(chunk, auction.getSharesForMany(chunk)))
+    return shares
+
+def compute_rewards(shares, config, helds = {}):
+    """
+    Reward of every bidder in `shares`, matching `getRewardsFor` to the wei.
+    `helds` maps bidders to their verified `uniqueDerivsHeld` (0 if absent).
+    """
+    rx, ry = config.reward_ratio
+    bidders = list(shares)
+    bases = [shares[b] * rx // ry for b in bidders]
+
+    if not config.extra_rewards_supported: return dict(zip(bidders, bases))
+
+    ex, ey = config.extra_ratio
+    return {
+        b: base * (1 + helds.get(b, 0) * ex // ey)
+        for b, base in zip(bidders, bases)
+    }
+
+def required_funding(auction, bidders, helds = {}):
+    """
+    Reward tokens the auction must hold for every bidder to claim.
+    Returns `(total, rewards)`.
+    """
+    rewards = compute_rewards(
+        read_shares(auction, bidders), RewardsConfig.read(auction), helds
+    )
+    return sum(rewards.values()), rewards
+
+def distribution_args(tree, positions, bidders, helds = {}):
+    """
+    Arguments of `distributeRewards(bidders, uniqueDerivsHeld, proof, flags)`
+    for `bidders`. `positions` maps holders to their leaf index in `tree`
+    and `helds` to the `uniqueDerivsHeld` of that leaf.
+
+    Holders go first, in leaf order as the multiproof requires, and the
+    rest of the bidders are paid without extra rewards.
+    """
+    bidders = list(dict.fromkeys(getattr(x, 'address', x) for x in bidders))
+    holders = [b for b in bidders if helds.get(b, 0)]
+    others = [b for b in bidders if not helds.get(b, 0)]
+    if not holders: return others, [0] * len(others), [], []
+
+    order, proof, flags = tree.multiproof(positions[b] for b in holders)
+    by_position = {positions[b]: b for b in holders}
+    holders = [by_position[i] for i in order]
+    return (
+        holders + others,
+        [helds[b] for b in holders] + [0] * len(others),
+        [to_hex(x) for x in proof],
+        flags
+    )
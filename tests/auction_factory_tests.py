@@ -0,0 +1,60 @@
+from brownie import accounts
+
+from scripts.deploy_helpers import (
+    ZERO,
+    create_stacks,
+    deploy_auction_factory,
+    deploy_cloned_scatter_auction,
+    stack_args
+)
+from scripts.playground import getparam, reverts, toWei
+
+def test_cloned_stack(clock, deploy):
+    nft, token, auction = deploy(
+        deploy_cloned_scatter_auction,
+        max_supply=5,
+        reserve_price=0.1,
+        auction_duration=600,
+        extra_bid_time=60
+    )
+    assert nft.owner() == accounts[0]
+    assert auction.owner() == accounts[0]
+    assert nft.config()['auctionHouse'] == auction
+    assert nft.config()['maxSupply'] == 5
+    assert getparam('nftContract', auction) == nft
+    assert getparam('reservePrice', auction) == toWei(0.1)
+    assert auction.getRewardsConfig()[0] == token
+
+    auction.createBid(1, {'from': accounts[1], 'value': toWei(0.1)})
+    clock.to_end(auction)
+    auction.createBid(2, {'from': accounts[2], 'value': toWei(0.1)})
+    assert nft.ownerOf(1) == accounts[1]
+    assert nft.balance() > 0
+
+def test_clones_cannot_be_initialized_again(deploy):
+    nft, token, auction = deploy(deploy_cloned_scatter_auction)
+    args = (nft, 10, toWei(0.1), toWei(0.05), 600, 60)
+    assert reverts(lambda: auction.initialize(*args, {'from': accounts[0]}))
+    assert reverts(lambda: nft.initialize(
+        "Other", "OTHER", ("", ZERO, ZERO, 10, 500, 500, ZERO), accounts[1], {'from': accounts[1]}
+    ))
+    assert reverts(lambda: auction.configureRewards(
+        ZERO, (1, 1), (0, 0), 0, {'from': accounts[1]}
+    ))
+
+def test_pipelined_stacks(deploy):
+    factory = deploy(deploy_auction_factory)
+    stacks = create_stacks(
+        factory,
+        [stack_args(f'Collection {i}', f'C{i}', max_supply=10 + i) for i in range(5)],
+        accounts[1]
+    )
+
+    addresses = {x.address for stack in stacks for x in stack}
+    assert len(addresses) == 10
+    for i, (nft, auction) in enumerate(stacks):
+        assert nft.name() == f'Collection {i}'
+        assert nft.owner() == accounts[1]
+        assert auction.owner() == accounts[1]
+        assert getparam('maxSupply', auction) == 10 + i
+        assert nft.config()['auctionHouse'] == auction
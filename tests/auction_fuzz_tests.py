@@ -0,0 +1,227 @@
+"""
+Stateful fuzzing of `ScatterAuction` on top of `AuctionableArchetype`.
+
+Hypothesis generates random sequences of bids, settlements, owner setters,
+credit withdrawals and `withdraw` calls, runs them on chain and on
+`AuctionModel`, and checks the invariants after every step. Failing
+sequences are shrunk to a minimal trace.
+
+Every `max_supply` is a separate test, so with pytest-xdist each one runs
+on its own local chain:
+
+    brownie test tests/auction_fuzz_tests.py -n auto
+
+`FUZZ_EXAMPLES` scales the run.
+"""
+import os
+
+import brownie
+import pytest
+from brownie import accounts, chain, history
+from brownie.test import strategy
+
+from scripts.auction_data import auction_data, clear_auction_data_cache
+from scripts.auction_model import AuctionModel, AuctionRevert
+from scripts.clock import AuctionClock
+from scripts.deploy_helpers import deploy_scatter_auction
+from scripts.playground import toWei
+
+SETTINGS = {
+    'max_examples': int(os.environ.get('FUZZ_EXAMPLES', 25)),
+    'stateful_step_count': 30,
+    'deadline': None,
+}
+
+PARAMS = {
+    'reserve_price': 0.01,
+    'bid_increment': 0.005,
+    'auction_duration': 60,
+    'extra_bid_time': 10,
+}
+
+# Sent with every call, so that reverted ones get mined too.
+GAS_LIMIT = 1_000_000
+
+# Added to the minimum bid.
+BID_STEPS = [-1, 0, 1, toWei(0.001), toWei(0.02)]
+
+
+class AuctionFuzzer:
+
+    st_bidder = strategy('uint8', max_value=3)
+    st_nft_offset = strategy('int8', min_value=-1, max_value=1)
+    st_bid_step = strategy('uint8', max_value=len(BID_STEPS) - 1)
+    st_delay = strategy('uint16', max_value=120)
+    st_price = strategy('uint256', max_value=toWei(0.03))
+    st_seconds = strategy('uint32', max_value=120)
+    st_enabled = strategy('bool')
+
+    def __init__(cls, nft, auction, params):
+        cls.nft = nft
+        cls.auction = auction
+        cls.params = params
+        cls.owner = accounts[0]
+        cls.bidders = accounts[1:5]
+        # Anyone can call `withdraw`, not paying its gas keeps the owner's
+        # balance change equal to its share.
+        cls.caller = accounts[9]
+        cls.platform = nft.platform()
+        cls.platform_fee = nft.config()['platformFee']
+        cls.clock = AuctionClock()
+
+    def setup(self):
+        # Every run starts from the same reverted chain.
+        clear_auction_data_cache()
+        self.model = AuctionModel(
+            self.params['max_supply'],
+            toWei(self.params['reserve_price']),
+            toWei(self.params['bid_increment']),
+            self.params['auction_duration'],
+            self.params['extra_bid_time']
+        )
+        # Gas paid by the bidders, and ETH sent to the owner and platform.
+        self.fees = 0
+        self.withdrawn = 0
+        self.initial = self._held_eth()
+
+    def _held_eth(self):
+        return (
+            sum(x.balance() for x in self.bidders) + self.fees + self.withdrawn +
+            self.auction.balance() + self.nft.balance()
+        )
+
+    def _send(self, sender, call, step):
+        """
+        Sends `call` and applies `step` to the model, both must agree
+        on whether and why it reverts.
+        """
+        height = chain.height
+        try:
+            call({'from': sender, 'gas_limit': GAS_LIMIT})
+            reason = None
+        except brownie.exceptions.VirtualMachineError as e:
+            reason = e.revert_msg
+
+        assert chain.height == height + 1
+        tx = history[-1]
+        if tx.sender in self.bidders: self.fees += tx.gas_used * tx.gas_price
+        try:
+            step(chain[-1].timestamp)
+            expected = None
+        except AuctionRevert as e:
+            expected = e.reason
+        assert reason == expected
+
+    def rule_bid(self, st_bidder, st_nft_offset, st_bid_step):
+        bidder = self.bidders[st_bidder]
+        model = self.model
+        now = self.clock.now() + 1
+        nft_id = max(model.next_nft_id(now) + st_nft_offset, 0)
+        min_bid = model.reserve_price if model.amount == 0 else model.amount + model.bid_increment
+        value = max(min_bid + BID_STEPS[st_bid_step], 1)
+        self._send(
+            bidder,
+            lambda tx: self.auction.createBid(nft_id, dict(tx, value=value)),
+            lambda now: model.create_bid(bidder.address, nft_id, value, now)
+        )
+
+    def rule_settle(self, st_bidder):
+        self._send(
+            self.bidders[st_bidder],
+            self.auction.settleAuction,
+            self.model.settle_auction
+        )
+
+    def rule_advance(self, st_delay):
+        self.clock.advance(st_delay)
+
+    def rule_withdraw_credit(self, st_bidder):
+        bidder = self.bidders[st_bidder]
+        self._send(
+            bidder,
+            self.auction.withdrawCredit,
+            lambda now: self.model.withdraw_credit(bidder.address)
+        )
+
+    def rule_set_reserve_price(self, st_price):
+        self._send(
+            self.owner,
+            lambda tx: self.auction.setReservePrice(st_price, tx),
+            lambda now: self.model.set_reserve_price(st_price)
+        )
+
+    def rule_set_bid_increment(self, st_price):
+        self._send(
+            self.owner,
+            lambda tx: self.auction.setBidIncrement(st_price, tx),
+            lambda now: self.model.set_bid_increment(st_price)
+        )
+
+    def rule_set_duration(self, st_seconds):
+        self._send(
+            self.owner,
+            lambda tx: self.auction.setDuration(st_seconds, tx),
+            lambda now: self.model.set_duration(st_seconds)
+        )
+
+    def rule_set_time_buffer(self, st_seconds):
+        self._send(
+            self.owner,
+            lambda tx: self.auction.setTimeBuffer(st_seconds, tx),
+            lambda now: self.model.set_time_buffer(st_seconds)
+        )
+
+    def rule_set_credit_mode(self, st_enabled):
+        self._send(
+            self.owner,
+            lambda tx: self.auction.setCreditMode(st_enabled, tx),
+            lambda now: self.model.set_credit_mode(st_enabled)
+        )
+
+    def rule_set_deferred_treasury(self, st_enabled):
+        self._send(
+            self.owner,
+            lambda tx: self.auction.setDeferredTreasury(st_enabled, tx),
+            lambda now: self.model.set_deferred_treasury(st_enabled)
+        )
+
+    def rule_withdraw(self):
+        owner, platform = self.owner.balance(), brownie.web3.eth.get_balance(self.platform)
+        self.nft.withdraw({'from': self.caller})
+
+        self.model.sweep_treasury()
+        total, self.model.treasury = self.model.treasury, 0
+        fee = total * self.platform_fee // 10000
+        assert brownie.web3.eth.get_balance(self.platform) - platform == fee
+        assert self.owner.balance() - owner == total - fee
+        self.withdrawn += total
+
+    def invariant_matches_model(self):
+        data = auction_data(self.auction)
+        model = self.model
+        assert data.bidder == model.bidder
+        assert data.amount == model.amount
+        assert data.endTime == model.end_time
+        assert data.nftId == model.nft_id
+        assert data.settled == model.settled
+        assert self.nft.balance() == model.treasury
+        assert self.auction.pendingTreasury() == model.pending_treasury
+
+    def invariant_balance_is_top_bid(self):
+        data = auction_data(self.auction)
+        live = 0 if data.settled or data.startTime == 0 else data.amount
+        credits = sum(self.auction.creditOf(x) for x in self.bidders)
+        assert self.auction.balance() == live + self.auction.pendingTreasury() + credits
+
+    def invariant_eth_is_conserved(self):
+        assert self._held_eth() == self.initial
+
+    def invariant_supply(self):
+        assert self.nft.totalSupply() == self.model.nft_id
+        assert self.model.nft_id <= self.params['max_supply']
+
+@pytest.mark.parametrize('max_supply', [2, 6])
+def test_auction_invariants(max_supply, state_machine, deploy):
+    params = dict(PARAMS, max_supply=max_supply)
+    nft, _, auction = deploy(deploy_scatter_auction, **params)
+    state_machine(AuctionFuzzer, nft, auction, params, settings=SETTINGS)
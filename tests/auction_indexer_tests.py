@@ -0,0 +1,79 @@
+from brownie import accounts, chain
+
+from scripts.deploy_helpers import deploy_simple_auction
+from scripts.indexer import AuctionIndexer
+from scripts.playground import toWei
+
+
+def deploy_and_index(deploy, tmp_path, **kwargs):
+    nft, _, auction = deploy(
+        deploy_simple_auction,
+        reserve_price=0.01, bid_increment=0.01, auction_duration=600, extra_bid_time=60
+    )
+    indexer = AuctionIndexer(
+        tmp_path / 'auction.db', auction, start_block=auction.tx.block_number, **kwargs
+    )
+    return nft, auction, indexer
+
+def test_indexes_auction_lifecycle(tmp_path, clock, deploy):
+    nft, auction, indexer = deploy_and_index(deploy, tmp_path)
+
+    auction.createBid(1, {'from': accounts[1], 'value': toWei(0.01)})
+    auction.createBid(1, {'from': accounts[2], 'value': toWei(0.02)})
+    clock.to_buffer(auction, 1)
+    auction.createBid(1, {'from': accounts[1], 'value': toWei(0.03)})
+    clock.to_end(auction)
+    auction.createBid(2, {'from': accounts[3], 'value': toWei(0.01)})
+
+    assert indexer.sync() == 8
+
+    created = indexer.events('AuctionCreated')
+    assert [x['nft_id'] for x in created] == [1, 2]
+    assert [x['extended'] for x in indexer.bids(nft_id=1)] == [0, 0, 1]
+    assert len(indexer.events('AuctionExtended', nft_id=1)) == 1
+    assert len(indexer.bids(bidder=accounts[1])) == 2
+
+    settled, = indexer.events('AuctionSettled')
+    assert settled['nft_id'] == 1
+    assert settled['bidder'] == accounts[1]
+    assert int(settled['amount']) == toWei(0.03)
+
+def test_restarts_from_checkpoint(tmp_path, deploy):
+    nft, auction, indexer = deploy_and_index(deploy, tmp_path, chunk=1)
+
+    auction.createBid(1, {'from': accounts[1], 'value': toWei(0.01)})
+    assert indexer.sync() == 2
+    checkpoint = indexer.checkpoint
+    indexer.close()
+
+    auction.createBid(1, {'from': accounts[2], 'value': toWei(0.02)})
+
+    indexer = AuctionIndexer(tmp_path / 'auction.db', auction)
+    assert indexer.checkpoint == checkpoint
+    assert indexer.sync() == 1
+    assert indexer.sync() == 0
+    # Blocks past the head are left for later.
+    assert indexer.sync(chain.height + 100) == 0
+    assert indexer.checkpoint == chain.height
+    assert len(indexer.bids(nft_id=1)) == 2
+
+def test_rolls_back_reorged_blocks(tmp_path, deploy):
+    nft, auction, indexer = deploy_and_index(deploy, tmp_path)
+
+    auction.createBid(1, {'from': accounts[1], 'value': toWei(0.01)})
+    indexer.sync()
+    kept = indexer.checkpoint
+
+    auction.createBid(1, {'from': accounts[2], 'value': toWei(0.02)})
+    auction.createBid(1, {'from': accounts[3], 'value': toWei(0.03)})
+    indexer.sync()
+    assert len(indexer.bids()) == 3
+
+    # `undo` keeps the snapshot taken by the deployment fixtures.
+    chain.undo(2)
+    chain.mine(1)
+    auction.createBid(1, {'from': accounts[4], 'value': toWei(0.05)})
+
+    assert indexer.handle_reorg() == kept
+    indexer.sync()
+    assert [x['bidder'] for x in indexer.bids()] == [accounts[1], accounts[4]]
@@ -0,0 +1,157 @@
+import brownie
+import pytest
+from brownie import accounts, chain
+from random import Random
+
+from scripts.auction_data import auction_data
+from scripts.auction_model import AuctionModel, AuctionRevert
+from scripts.auction_sweep import grid, sweep
+from scripts.deploy_helpers import deploy_simple_auction
+from scripts.playground import toWei
+
+PARAMS = {
+    'max_supply': 3,
+    'reserve_price': 0.01,
+    'bid_increment': 0.005,
+    'auction_duration': 60,
+    'extra_bid_time': 10
+}
+
+# Sent with every call, so that reverted ones get mined too.
+GAS_LIMIT = 1_000_000
+
+def model_for(params):
+    return AuctionModel(
+        params['max_supply'],
+        toWei(params['reserve_price']),
+        toWei(params['bid_increment']),
+        params['auction_duration'],
+        params['extra_bid_time']
+    )
+
+def assert_same_state(model, nft, auction):
+    data = auction_data(auction)
+    assert data.bidder == model.bidder
+    assert data.amount == model.amount
+    assert data.startTime == model.start_time
+    assert data.endTime == model.end_time
+    assert data.nftId == model.nft_id
+    assert data.settled == model.settled
+    assert auction.balance() == model.balance
+    assert nft.balance() == model.treasury
+    assert auction.pendingTreasury() == model.pending_treasury
+    assert data.nftContractBalance == model.treasury + model.pending_treasury
+    for nft_id, owner in model.owners.items():
+        assert nft.ownerOf(nft_id) == owner
+    for bidder, credit in model.credits.items():
+        assert auction.creditOf(bidder) == credit
+
+@pytest.mark.parametrize('deferred_treasury', [False, True])
+@pytest.mark.parametrize('credit_mode', [False, True])
+@pytest.mark.parametrize('seed', range(5))
+def test_model_matches_contract(seed, credit_mode, deferred_treasury, clock, deploy):
+    rng = Random(seed)
+    nft, _, auction = deploy(deploy_simple_auction, **PARAMS)
+    model = model_for(PARAMS)
+    bidders = accounts[1:6]
+    if credit_mode:
+        auction.setCreditMode(True, {'from': accounts[0]})
+        model.set_credit_mode(True)
+    if deferred_treasury:
+        auction.setDeferredTreasury(True, {'from': accounts[0]})
+        model.set_deferred_treasury(True)
+
+    for _ in range(40):
+        clock.advance(rng.choice([0, 1, 5, 20, 70]))
+        now = clock.now() + 1
+        bidder = rng.choice(bidders)
+        nft_id = model.next_nft_id(now) + rng.choice([0, 0, 0, -1, 1])
+        min_bid = model.reserve_price if model.amount == 0 else model.amount + model.bid_increment
+        value = max(min_bid + rng.choice([-1, 0, toWei(0.001), toWei(0.02)]), 1)
+
+        credit = model.credits.get(bidder.address, 0)
+        action = rng.random()
+        if action < 0.1:
+            call = lambda: auction.settleAuction({'from': bidder, 'gas_limit': GAS_LIMIT})
+            step = lambda now: model.settle_auction(now)
+        elif deferred_treasury and action < 0.12:
+            call = lambda: auction.sweepTreasury({'from': bidder, 'gas_limit': GAS_LIMIT})
+            step = lambda now: model.sweep_treasury()
+        elif credit_mode and action < 0.15:
+            call = lambda: auction.withdrawCredit({'from': bidder, 'gas_limit': GAS_LIMIT})
+            step = lambda now: model.withdraw_credit(bidder.address)
+        elif credit_mode and action < 0.4:
+            credit = min(credit, value) + rng.choice([0, 0, 1])
+            value -= min(credit, value)
+            call = lambda: auction.createBidWithCredit(
+                nft_id, credit, {'from': bidder, 'value': value, 'gas_limit': GAS_LIMIT}
+            )
+            step = lambda now: model.create_bid(bidder.address, nft_id, value, now, credit)
+        else:
+            call = lambda: auction.createBid(
+                nft_id, {'from': bidder, 'value': value, 'gas_limit': GAS_LIMIT}
+            )
+            step = lambda now: model.create_bid(bidder.address, nft_id, value, now)
+
+        height = chain.height
+        try:
+            call()
+            reason = None
+        except brownie.exceptions.VirtualMachineError as e:
+            reason = e.revert_msg
+
+        assert chain.height == height + 1
+        try:
+            step(chain[-1].timestamp)
+            expected = None
+        except AuctionRevert as e:
+            expected = e.reason
+
+        assert reason == expected
+        assert_same_state(model, nft, auction)
+
+def test_sweep_matches_model():
+    rng = Random(0)
+    times, bidders, values = [], [], []
+    t = 1000
+    for _ in range(300):
+        t += rng.choice([0, 1, 3, 10, 40, 120])
+        times.append(t)
+        bidders.append(rng.randrange(8))
+        values.append(rng.randrange(1, 50))
+
+    params = grid(
+        reserve_prices=[1, 5, 20],
+        bid_increments=[1, 4],
+        durations=[30, 90],
+        time_buffers=[0, 10, 30]
+    )
+    result = sweep(
+        times, bidders, values,
+        params['reserve_prices'],
+        params['bid_increments'],
+        params['durations'],
+        params['time_buffers'],
+        max_supply=10
+    )
+
+    for k in range(len(params['reserve_prices'])):
+        model = AuctionModel(
+            10,
+            int(params['reserve_prices'][k]),
+            int(params['bid_increments'][k]),
+            int(params['durations'][k]),
+            int(params['time_buffers'][k])
+        )
+        accepted = 0
+        for t, b, v in zip(times, bidders, values):
+            try:
+                accepted += model.create_bid(b, model.next_nft_id(t), v, t)
+            except AuctionRevert:
+                pass
+
+        pending = model.amount if model.start_time and not model.settled else 0
+        assert result['accepted_bids'][k] == accepted
+        assert result['revenue'][k] == model.treasury + pending
+        assert result['extensions'][k] == model.extensions
+        assert result['lots_created'][k] == model.nft_id
@@ -0,0 +1,111 @@
+import json
+
+from brownie import accounts
+
+from scripts.backtest import (
+    BIDDER_MODELS,
+    Trace,
+    backtest,
+    export_trace,
+    load_trace,
+    param_grid,
+    replay,
+    table
+)
+from scripts.deploy_helpers import deploy_simple_auction
+from scripts.indexer import AuctionIndexer
+from scripts.playground import toWei
+
+PARAMS = {
+    'max_supply': 2,
+    'reserve_price': 10,
+    'bid_increment': 5,
+    'duration': 600,
+    'time_buffer': 60,
+}
+
+# Two lots: the first one extended once, the second one sold out by a
+# refunded bid.
+EVENTS = [
+    [1000, 'AuctionCreated', 1, None, None],
+    [1000, 'AuctionBid', 1, 'a', '10'],
+    [1300, 'AuctionBid', 1, 'b', '20'],
+    [1580, 'AuctionBid', 1, 'a', '25'],
+    [1700, 'AuctionSettled', 1, 'a', '25'],
+    [1700, 'AuctionCreated', 2, None, None],
+    [1700, 'AuctionBid', 2, 'c', '12'],
+    [2000, 'AuctionBid', 2, 'b', '30'],
+    [2400, 'AuctionSettled', 2, 'b', '30'],
+]
+
+def test_replay_matches_recording(tmp_path, clock, deploy):
+    _, _, auction = deploy(
+        deploy_simple_auction,
+        max_supply=2, reserve_price=0.01, bid_increment=0.01,
+        auction_duration=600, extra_bid_time=60
+    )
+    indexer = AuctionIndexer(
+        tmp_path / 'auction.db', auction, start_block=auction.tx.block_number
+    )
+
+    auction.createBid(1, {'from': accounts[1], 'value': toWei(0.01)})
+    clock.to_buffer(auction, 1)
+    auction.createBid(1, {'from': accounts[2], 'value': toWei(0.03)})
+    clock.to_end(auction)
+    auction.createBid(2, {'from': accounts[1], 'value': toWei(0.02)})
+    clock.to_end(auction)
+    auction.createBid(3, {'from': accounts[3], 'value': toWei(0.01)})
+    indexer.sync()
+
+    export_trace(auction, indexer, tmp_path / 'trace.json')
+    trace = load_trace(tmp_path / 'trace.json')
+    assert trace.params['reserve_price'] == toWei(0.01)
+    assert trace.bidders == [accounts[1], accounts[2]]
+
+    recorded = trace.recorded()
+    assert recorded['revenue'] == toWei(0.05)
+    assert recorded['sold_out']
+
+    result = replay(trace, BIDDER_MODELS['strict'])
+    assert result['revenue'] == recorded['revenue']
+    assert result['lots_sold'] == recorded['lots_sold'] == 2
+    assert result['time_to_sell_out'] == recorded['time_to_sell_out']
+    assert result['extensions'] == 1
+    assert result['rejected_bids'] == 0
+
+def test_bidder_models():
+    trace = Trace(PARAMS, EVENTS)
+    assert trace.recorded()['time_to_sell_out'] == 1400
+
+    result = replay(trace, BIDDER_MODELS['strict'], reserve_price=15)
+    assert result['rejected_bids'] == 2
+    assert result['revenue'] == 55
+
+    # Bidder `c` never bid more than 12.
+    result = replay(trace, BIDDER_MODELS['meet_minimum'], reserve_price=15)
+    assert result['placed_bids'] == 4
+    assert result['gave_up_bids'] == 1
+    assert result['revenue'] == 55
+
+    result = replay(trace, BIDDER_MODELS['frugal'])
+    assert result['revenue'] == 20 + 15
+
+    # The first lot ends before the last bid on it, which opens the second.
+    result = replay(trace, BIDDER_MODELS['strict'], duration=500)
+    assert result['extensions'] == 0
+    assert result['rejected_bids'] == 1
+    assert result['revenue'] == 20 + 30
+    assert result['time_to_sell_out'] == 1400
+
+def test_backtest_grid(tmp_path):
+    path = tmp_path / 'trace.json'
+    path.write_text(json.dumps({'params': PARAMS, 'events': EVENTS}))
+    grid = param_grid(reserve_price=[5, 10, 15], time_buffer=[0, 60, 300])
+
+    results = backtest(path, grid, workers=2)
+    trace = load_trace(path)
+    assert results == [replay(trace, **x) for x in grid]
+
+    lines = table(results, 'revenue', 'reserve_price', 'time_buffer').splitlines()
+    assert len(lines) == 4
+    assert lines[0].split()[-3:] == ['0', '60', '300']
@@ -0,0 +1,75 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from brownie import accounts
+
+from scripts.auction_data import auction_data
+from scripts.bidding_client import AuctionWatcher, Bidder, min_bid, next_nft_id, outbid
+from scripts.deploy_helpers import deploy_simple_auction
+from scripts.playground import toWei
+
+def watch(auction):
+    return AuctionWatcher(auction.address, auction.abi, poll_interval=0.01)
+
+def test_auction_view(deploy):
+    _, _, auction = deploy(deploy_simple_auction)
+
+    with watch(auction) as watcher:
+        assert next_nft_id(watcher.data, watcher.now()) == 1
+        assert min_bid(watcher.data, watcher.now()) == toWei(0.1)
+
+        bidder = Bidder(watcher, accounts[1].address)
+        receipt = bidder.bid().receipt(timeout=10)
+        assert receipt['status'] == 1
+        watcher.wait_for_block(receipt['blockNumber'])
+
+        assert watcher.data.as_dict() == auction_data(auction).as_dict()
+        assert next_nft_id(watcher.data, watcher.now()) == 1
+        assert min_bid(watcher.data, watcher.now()) == toWei(0.15)
+
+    assert auction_data(auction).bidder == accounts[1]
+    assert bidder.latency_report()['count'] == 1
+
+def test_pipelined_bids(deploy):
+    _, _, auction = deploy(deploy_simple_auction)
+    nonce = accounts[1].nonce
+
+    with watch(auction) as watcher:
+        bidder = Bidder(watcher, accounts[1].address)
+        # Sent back to back, without waiting for inclusion.
+        pending = [bidder.bid(toWei(x), nft_id=1) for x in (0.1, 0.15, 0.2)]
+        receipts = [x.receipt(timeout=10) for x in pending]
+
+    assert [x.nonce for x in pending] == [nonce, nonce + 1, nonce + 2]
+    assert all(x['status'] == 1 for x in receipts)
+    assert auction_data(auction).amount == toWei(0.2)
+
+    report = bidder.latency_report()
+    assert report['count'] == 3 and report['pending'] == 0
+    assert 0 <= report['min'] <= report['p50'] <= report['max']
+
+def test_competing_bidders(clock, deploy):
+    nft, _, auction = deploy(deploy_simple_auction)
+    # A scripted bidder opens the lot.
+    auction.createBid(1, {'from': accounts[3], 'value': toWei(0.1)})
+
+    with watch(auction) as watcher, ThreadPoolExecutor(2) as pool:
+        low = Bidder(watcher, accounts[1].address)
+        high = Bidder(watcher, accounts[2].address)
+        losing = pool.submit(outbid, low, toWei(0.3))
+        winning = pool.submit(outbid, high, toWei(0.5))
+
+        losing.result(timeout=60)
+        clock.to_end(auction)
+        receipt = winning.result(timeout=60)
+
+    assert receipt['status'] == 1
+
+    data = auction_data(auction)
+    assert data.bidder == accounts[2]
+    assert toWei(0.3) <= data.amount <= toWei(0.35)
+    assert low.latency_report()['count'] > 0
+    assert high.latency_report()['count'] > 0
+
+    # The next bid settles lot 1 for the winner.
+    auction.createBid(2, {'from': accounts[3], 'value': toWei(0.1)})
+    assert nft.ownerOf(1) == accounts[2]
@@ -0,0 +1,68 @@
+import pytest
+from brownie import accounts, chain
+
+from scripts.auction_data import clear_auction_data_cache
+from scripts.clock import AuctionClock
+
+
+class Deployments:
+    """
+    Deploys every `(deployer, parameters)` pair once per session.
+
+    The chain is snapshotted right after each new deployment and reverted
+    after every test, so all the cached contracts are back to their freshly
+    deployed state when the next test starts. A deployment not seen before
+    reverts to that clean state first, so tests must ask for all their
+    deployments before sending any transaction.
+    """
+
+    def __init__(self):
+        self._cache = {}
+
+    def __call__(self, deployer, **params):
+        key = (deployer.__name__,) + tuple(sorted(
+            (k, getattr(v, '_name', v)) for k, v in params.items()
+        ))
+        if key not in self._cache:
+            self.reset()
+            self._cache[key] = deployer(**params)
+            chain.snapshot()
+        return self._cache[key]
+
+    def reset(self):
+        chain.revert()
+        clear_auction_data_cache()
+
+
+@pytest.fixture(scope='session')
+def deployments():
+    chain.snapshot()
+    return Deployments()
+
+@pytest.fixture(autouse=True)
+def isolation(deployments):
+    yield
+    deployments.reset()
+
+@pytest.fixture
+def deploy(deployments):
+    return deployments
+
+@pytest.fixture
+def clock():
+    return AuctionClock()
+
+@pytest.fixture
+def new_accounts():
+    created = []
+
+    def create(n, funding):
+        for _ in range(n):
+            account = accounts.add()
+            accounts[0].transfer(account, funding)
+            created.append(account)
+        return created[-n:]
+
+    yield create
+
+    for account in created: accounts.remove(account)
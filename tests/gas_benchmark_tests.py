@@ -0,0 +1,228 @@
+"""
+Gas used by every auction code path, checked against `gas_baseline.json`.
+
+A path fails when it uses more than its baseline plus `GAS_TOLERANCE`, or
+when it has no baseline. To record baselines, for new paths or after an
+intended change, run:
+
+    UPDATE_GAS_BASELINE=1 brownie test tests/gas_benchmark_tests.py
+"""
+import json
+import os
+from pathlib import Path
+
+import pytest
+from brownie import accounts, RewardedAuction, ScatterAuction, WeightedRewardedAuction
+
+from scripts.deploy_helpers import (
+    deploy_auction_factory,
+    deploy_simple_auction,
+    deploy_scatter_auction,
+    deploy_weighted_rewarded_auction,
+    stack_args
+)
+from scripts.merkle import HolderMerkleTree, to_hex
+from scripts.playground import toWei
+from scripts.rewards import distribution_args
+
+BASELINE_PATH = Path(__file__).parent / 'gas_baseline.json'
+GAS_TOLERANCE = 0.02
+UPDATE = bool(os.environ.get('UPDATE_GAS_BASELINE'))
+
+AUCTIONS = [ScatterAuction, RewardedAuction, WeightedRewardedAuction]
+
+
+@pytest.fixture(scope='module')
+def gas():
+    baseline = json.loads(BASELINE_PATH.read_text())
+    measured = {}
+
+    def check(path, tx, count = 1):
+        """
+        Checks the gas of `tx`, or of a list of transactions, per `count`
+        items they process.
+        """
+        txs = tx if isinstance(tx, list) else [tx]
+        used = sum(x.gas_used for x in txs) // count
+        measured[path] = used
+        if UPDATE: return
+        assert path in baseline, \
+            f'No gas baseline for {path}, record it with UPDATE_GAS_BASELINE=1.'
+        budget = int(baseline[path] * (1 + GAS_TOLERANCE))
+        assert used <= budget, f'{path} used {used} gas, budget is {budget}'
+
+    yield check
+
+    if UPDATE:
+        baseline.update(measured)
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=4, sort_keys=True) + '\n')
+
+def deploy_auction(deploy, auction_contract):
+    return deploy(
+        deploy_simple_auction,
+        reserve_price=0.1,
+        bid_increment=0.05,
+        auction_duration=600,
+        extra_bid_time=60,
+        auction_contract=auction_contract
+    )
+
+@pytest.mark.parametrize('auction_contract', AUCTIONS)
+def test_create_bid_paths(auction_contract, gas, clock, deploy):
+    name = auction_contract._name
+    nft, _, auction = deploy_auction(deploy, auction_contract)
+
+    tx = auction.createBid(1, {'from': accounts[1], 'value': toWei(0.1)})
+    gas(f'{name}.createBid.first', tx)
+
+    tx = auction.createBid(1, {'from': accounts[2], 'value': toWei(0.15)})
+    gas(f'{name}.createBid.outbid', tx)
+
+    clock.to_buffer(auction, 1)
+    tx = auction.createBid(1, {'from': accounts[1], 'value': toWei(0.2)})
+    assert tx.events['AuctionBid']['extended']
+    gas(f'{name}.createBid.extend', tx)
+
+    clock.to_end(auction)
+    tx = auction.createBid(2, {'from': accounts[3], 'value': toWei(0.1)})
+    assert 'AuctionSettled' in tx.events
+    gas(f'{name}.createBid.settleAndCreate', tx)
+
+    clock.to_end(auction)
+    tx = auction.settleAuction({'from': accounts[3]})
+    gas(f'{name}.settleAuction', tx)
+
+def test_credit_mode_paths(gas, deploy):
+    nft, _, auction = deploy_auction(deploy, ScatterAuction)
+    auction.setCreditMode(True, {'from': accounts[0]})
+
+    auction.createBid(1, {'from': accounts[1], 'value': toWei(0.1)})
+    tx = auction.createBid(1, {'from': accounts[2], 'value': toWei(0.15)})
+    gas('ScatterAuction.createBid.outbidToNewCredit', tx)
+
+    tx = auction.createBidWithCredit(1, toWei(0.1), {'from': accounts[1], 'value': toWei(0.1)})
+    gas('ScatterAuction.createBidWithCredit.outbidToNewCredit', tx)
+
+    # Leaves some credit, so the next outbid updates a non-zero balance.
+    tx = auction.createBidWithCredit(1, toWei(0.1), {'from': accounts[2], 'value': toWei(0.15)})
+    gas('ScatterAuction.createBidWithCredit.partialCredit', tx)
+
+    tx = auction.createBid(1, {'from': accounts[1], 'value': toWei(0.3)})
+    gas('ScatterAuction.createBid.outbidToCredit', tx)
+
+    tx = auction.withdrawCredit({'from': accounts[2]})
+    gas('ScatterAuction.withdrawCredit', tx)
+
+def test_weighted_reward_claim(gas, deploy):
+    holders = [accounts[1]] + [f'0x{i:040x}' for i in range(2, 1000)]
+    tree = HolderMerkleTree.build(holders, [3] * len(holders))
+    nft, token, auction = deploy(
+        deploy_weighted_rewarded_auction,
+        root=to_hex(tree.root)
+    )
+    token.transfer(auction, toWei(100), {'from': accounts[0]})
+
+    auction.createBid(1, {'from': accounts[1], 'value': toWei(0.1)})
+    auction.createBid(1, {'from': accounts[2], 'value': toWei(0.15)})
+
+    proof = list(map(to_hex, tree.proof(0)))
+    tx = auction.claimRewardTokensBasedOnShares(proof, 3, {'from': accounts[1]})
+    gas('WeightedRewardedAuction.claimRewardTokensBasedOnShares.proof', tx)
+
+    tx = auction.claimRewardTokensBasedOnShares([], 0, {'from': accounts[2]})
+    gas('WeightedRewardedAuction.claimRewardTokensBasedOnShares.noProof', tx)
+
+    # The claimed flag keeps the bidder's slot warm for its next bid.
+    tx = auction.createBid(1, {'from': accounts[1], 'value': toWei(0.2)})
+    gas('WeightedRewardedAuction.createBid.outbidAfterClaim', tx)
+
+    # Holdings verified by the first claim are cached for the same root.
+    tx = auction.claimRewardTokensBasedOnShares([], 0, {'from': accounts[1]})
+    gas('WeightedRewardedAuction.claimRewardTokensBasedOnShares.cached', tx)
+
+@pytest.mark.parametrize('batch_size', [1, 50, 500])
+def test_distribute_rewards(batch_size, gas, deploy, new_accounts):
+    nft, token, auction = deploy(
+        deploy_weighted_rewarded_auction,
+        reserve_price=0.0001,
+        bid_increment=0.0001
+    )
+    bidders = new_accounts(batch_size, toWei(0.1))
+    holders = [x.address for x in bidders] + [f'0x{i:040x}' for i in range(1, 1000)]
+    tree = HolderMerkleTree.build(holders, [3] * len(holders))
+    positions = {x: i for i, x in enumerate(holders)}
+    auction.configureRewards(token, (1, 1), (1, 10), to_hex(tree.root))
+    token.transfer(auction, toWei(100), {'from': accounts[0]})
+
+    for i, bidder in enumerate(bidders):
+        auction.createBid(1, {'from': bidder, 'value': toWei(0.0001) * (i + 1)})
+
+    args = distribution_args(
+        tree, positions, bidders, {x.address: 3 for x in bidders}
+    )
+    tx = auction.distributeRewards(*args, {'from': accounts[0]})
+    gas(
+        f'WeightedRewardedAuction.distributeRewards.perRecipient.{batch_size}',
+        tx, batch_size
+    )
+
+def test_archetype_paths(gas, clock, deploy):
+    nft, _, auction = deploy(
+        deploy_scatter_auction,
+        reserve_price=0.1, auction_duration=600, extra_bid_time=60
+    )
+
+    tx = auction.createBid(1, {'from': accounts[1], 'value': toWei(0.1)})
+    gas('AuctionableArchetype.createBid.first', tx)
+
+    clock.to_end(auction)
+    tx = auction.createBid(2, {'from': accounts[2], 'value': toWei(0.1)})
+    gas('AuctionableArchetype.createBid.settleAndCreate', tx)
+
+    tx = nft.withdraw({'from': accounts[3]})
+    gas('AuctionableArchetype.withdraw', tx)
+
+@pytest.mark.parametrize('mode', ['mint', 'batch', 'premint'])
+def test_amortized_lot_gas(mode, gas, clock, deploy):
+    lots = 10
+    nft, _, auction = deploy(
+        deploy_scatter_auction,
+        max_supply=lots, reserve_price=0.1, auction_duration=600, extra_bid_time=60
+    )
+    txs = []
+    if mode == 'batch':
+        auction.setPremintBatchSize(lots, {'from': accounts[0]})
+    if mode == 'premint':
+        txs.append(auction.premint(lots, {'from': accounts[0]}))
+
+    for nft_id in range(1, lots + 1):
+        txs.append(auction.createBid(nft_id, {'from': accounts[1], 'value': toWei(0.1)}))
+        clock.to_end(auction)
+    txs.append(auction.settleAuction({'from': accounts[1]}))
+
+    assert nft.balanceOf(accounts[1]) == lots
+    gas(f'AuctionableArchetype.perLot.{mode}{lots}', txs, lots)
+
+def test_deferred_treasury_paths(gas, clock, deploy):
+    nft, _, auction = deploy(
+        deploy_scatter_auction,
+        reserve_price=0.1, auction_duration=600, extra_bid_time=60
+    )
+    auction.setDeferredTreasury(True, {'from': accounts[0]})
+
+    auction.createBid(1, {'from': accounts[1], 'value': toWei(0.1)})
+    clock.to_end(auction)
+    tx = auction.createBid(2, {'from': accounts[2], 'value': toWei(0.1)})
+    gas('AuctionableArchetype.createBid.settleAndCreateDeferred', tx)
+
+    clock.to_end(auction)
+    tx = auction.settleAuction({'from': accounts[3]})
+    gas('AuctionableArchetype.settleAuctionDeferred', tx)
+
+    tx = nft.withdraw({'from': accounts[3]})
+    gas('AuctionableArchetype.withdrawDeferred', tx)
+
+def test_stack_creation(gas, deploy):
+    factory = deploy(deploy_auction_factory)
+    tx = factory.createStack(*stack_args(), {'from': accounts[0]})
+    gas('AuctionFactory.createStack', tx)
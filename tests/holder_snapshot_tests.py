@@ -0,0 +1,130 @@
+import pytest
+from brownie import MinimalAuctionableNFT, accounts, chain
+
+from scripts.holder_snapshot import HolderSnapshot, main
+from scripts.merkle import HolderMerkleTree, address_bytes
+from scripts.proof_index import ProofIndex
+
+def deploy_derivatives(count = 3):
+    collections = []
+    for i in range(count):
+        nft = MinimalAuctionableNFT.deploy(f"Derivative {i}", f"D{i}", {'from': accounts[0]})
+        nft.setMinter(accounts[0], {'from': accounts[0]})
+        collections.append(nft)
+    return collections
+
+def mint(nft, to):
+    token_id = nft.mint({'from': accounts[0]}).return_value
+    nft.transferFrom(accounts[0], to, token_id, {'from': accounts[0]})
+    return token_id
+
+def expected_helds(collections, holders, block):
+    return {
+        address_bytes(x): sum(
+            nft.balanceOf(x, block_identifier=block) > 0 for nft in collections
+        )
+        for x in holders
+    }
+
+def test_snapshot_matches_balances(deploy):
+    collections = deploy(deploy_derivatives)
+    holders = accounts[1:6]
+    start = chain.height + 1
+
+    for nft in collections: mint(nft, holders[0])
+    mint(collections[0], holders[1])
+    mint(collections[0], holders[1])
+    token_id = mint(collections[2], holders[2])
+    collections[2].transferFrom(holders[2], holders[3], token_id, {'from': holders[2]})
+    target = chain.height
+
+    # Not part of the snapshot.
+    mint(collections[1], holders[4])
+
+    snapshot = HolderSnapshot(collections, start, chunk=2)
+    assert snapshot.sync(target) == 13
+    assert snapshot.held(holders[0]) == 3
+    assert snapshot.held(holders[1]) == 1
+    assert snapshot.balance_of(collections[0], holders[1]) == 2
+    assert snapshot.held(holders[2]) == 0
+    assert snapshot.held(holders[3]) == 1
+    assert snapshot.held(holders[4]) == 0
+
+    addrs, helds = snapshot.snapshot()
+    expected = expected_helds(collections, holders, target)
+    assert dict(zip(addrs, helds)) == {k: v for k, v in expected.items() if v}
+    assert address_bytes(accounts[0]) not in addrs
+
+def test_checkpoints(deploy, tmp_path):
+    collections = deploy(deploy_derivatives)
+    holders = accounts[1:6]
+    start = chain.height + 1
+
+    mint(collections[0], holders[0])
+    mint(collections[1], holders[1])
+    snapshot = HolderSnapshot(collections, start)
+    snapshot.sync()
+    snapshot.save(tmp_path / 'checkpoint')
+    first = snapshot.write_snapshot(tmp_path / 'first')
+
+    mint(collections[2], holders[0])
+    token_id = mint(collections[1], holders[2])
+    collections[1].transferFrom(holders[2], holders[1], token_id, {'from': holders[2]})
+
+    resumed = HolderSnapshot.load(tmp_path / 'checkpoint')
+    assert resumed.block == snapshot.block
+    # Only the transfers after the checkpoint are read again.
+    assert resumed.sync() == 5
+
+    fresh = HolderSnapshot(collections, start)
+    fresh.sync(resumed.block)
+    assert resumed.snapshot() == fresh.snapshot()
+    assert resumed.held(holders[0]) == 2
+
+    tree = resumed.write_snapshot(tmp_path / 'second')
+    assert tree.root == HolderMerkleTree.build(*fresh.snapshot()).root
+    assert tree.root != first.root
+    with ProofIndex(tmp_path / 'second') as index:
+        assert index.root == tree.root
+        assert index.held(index.find(holders[0])) == 2
+
+def test_start_after_first_transfer(deploy):
+    collections = deploy(deploy_derivatives)
+    token_id = mint(collections[0], accounts[1])
+    start = chain.height + 1
+    mint(collections[1], accounts[3])
+    collections[0].transferFrom(accounts[1], accounts[2], token_id, {'from': accounts[1]})
+
+    snapshot = HolderSnapshot(collections, start)
+    with pytest.raises(ValueError, match='without a token'):
+        snapshot.sync()
+    # Nothing of the failed chunk was applied.
+    assert snapshot.block == start - 1
+    assert len(snapshot) == 0
+
+def test_checkpoint_of_other_collections(deploy, tmp_path):
+    collections = deploy(deploy_derivatives)
+    start = chain.height + 1
+    mint(collections[0], accounts[1])
+
+    snapshot = HolderSnapshot(collections[:2], start)
+    snapshot.sync()
+    snapshot.save(tmp_path / 'checkpoint')
+
+    main(tmp_path / 'checkpoint', tmp_path / 'index', chain.height, *collections[:2])
+    with pytest.raises(ValueError, match='other collections'):
+        main(tmp_path / 'checkpoint', tmp_path / 'index', chain.height, *collections)
+
+def test_sync_past_head(deploy):
+    collections = deploy(deploy_derivatives)
+    start = chain.height + 1
+    mint(collections[0], accounts[1])
+
+    snapshot = HolderSnapshot(collections, start)
+    snapshot.sync(chain.height + 10)
+    assert snapshot.block == chain.height
+
+    # Blocks mined later are still read.
+    mint(collections[1], accounts[1])
+    assert snapshot.sync() == 2
+    assert snapshot.held(accounts[1]) == 2
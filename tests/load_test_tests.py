@@ -0,0 +1,33 @@
+import json
+
+from brownie import accounts
+
+from scripts.auction_data import auction_data
+from scripts.deploy_helpers import deploy_simple_auction
+from scripts.load_test import REVERT_REASONS, load
+from scripts.playground import toWei
+
+def test_load_report(clock, deploy, new_accounts):
+    _, _, auction = deploy(
+        deploy_simple_auction,
+        reserve_price=0.001,
+        bid_increment=0.001
+    )
+    auction.createBid(1, {'from': accounts[0], 'value': toWei(0.001)})
+    clock.to_buffer(auction, 1)
+
+    bidders = new_accounts(8, toWei(1))
+    report = load(auction, bidders, rounds=2, concurrency=4)
+
+    outcomes = report['outcomes']
+    assert report['bids'] == 16 == sum(outcomes.values())
+    assert set(outcomes) <= {'placed', 'refunded', *REVERT_REASONS}
+    assert outcomes['placed'] >= 1
+    assert 1 <= report['extensions'] <= outcomes['placed']
+    assert report['latency']['inclusion']['count'] >= outcomes['placed']
+    assert report['latency']['response']['count'] == 16
+
+    data = auction_data(auction)
+    assert report['final'] == data.as_dict()
+    assert data.bidder in [x.address for x in bidders]
+    json.dumps(report, default=str)
@@ -0,0 +1,89 @@
+from random import expovariate
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+from brownie import accounts, chain
+
+from scripts.auction_data import auction_data
+from scripts.deploy_helpers import deploy_simple_auction
+from scripts.metrics_exporter import MetricsExporter, P2Quantile
+from scripts.playground import toWei
+
+PARAMS = {
+    'reserve_price': 0.1,
+    'bid_increment': 0.05,
+    'auction_duration': 600,
+    'extra_bid_time': 60,
+}
+
+def parse(text):
+    samples = {}
+    for line in text.splitlines():
+        if line.startswith('#'): continue
+        name, value = line.rsplit(' ', 1)
+        samples[name] = float(value)
+    return samples
+
+def test_p2_quantiles():
+    samples = [expovariate(1) for _ in range(20000)]
+    for q in (0.5, 0.9, 0.99):
+        estimate = P2Quantile(q)
+        for x in samples: estimate.add(x)
+        assert len(estimate.heights) == 5
+        assert estimate.value() == pytest.approx(sorted(samples)[int(q * len(samples))], rel=0.05)
+
+def test_exporter_metrics(clock, deploy):
+    _, _, auction = deploy(deploy_simple_auction, **PARAMS)
+    exporter = MetricsExporter([auction], chain.height + 1)
+
+    auction.createBid(1, {'from': accounts[1], 'value': toWei(0.1)})
+    auction.createBid(1, {'from': accounts[2], 'value': toWei(0.2)})
+    clock.to_buffer(auction, 1)
+    auction.createBid(1, {'from': accounts[1], 'value': toWei(0.25)})
+    end_time = auction_data(auction).endTime
+    clock.to_end(auction, 30)
+    tx = auction.createBid(2, {'from': accounts[3], 'value': toWei(0.15)})
+
+    assert exporter.sync(chain.height + 10) == 6
+    assert exporter.block == chain.height
+    assert exporter.sync() == 0
+    samples = parse(exporter.render())
+    label = f'{{auction="{auction.address}"}}'
+
+    assert samples['scatter_auction_nft_id' + label] == 2
+    assert samples['scatter_auction_bids_total' + label] == 4
+    assert samples['scatter_auction_bid_rate' + label] > 0
+    assert samples['scatter_auction_price_to_reserve' + label] == 1.5
+    assert samples['scatter_auction_lot_extensions' + label] == 0
+    assert samples['scatter_auction_seconds_to_end' + label] == (
+        auction_data(auction).endTime - tx.timestamp
+    )
+
+    assert samples['scatter_auction_extensions_per_lot_count' + label] == 1
+    assert samples['scatter_auction_extensions_per_lot_sum' + label] == 1
+    assert samples['scatter_auction_settled_price_to_reserve_sum' + label] == 2.5
+    assert samples['scatter_auction_settle_lag_seconds_count' + label] == 1
+    assert samples['scatter_auction_settle_lag_seconds_sum' + label] == tx.timestamp - end_time
+
+    assert samples['scatter_exporter_last_block'] == chain.height
+    assert samples['scatter_exporter_blocks_total'] == 6
+    assert samples['scatter_exporter_block_seconds_count'] == 6
+
+def test_metrics_endpoint(deploy):
+    _, _, auction = deploy(deploy_simple_auction, **PARAMS)
+    exporter = MetricsExporter([auction], chain.height)
+    exporter.sync()
+
+    server = exporter.serve(0, '127.0.0.1')
+    try:
+        url = f'http://127.0.0.1:{server.server_address[1]}'
+        with urlopen(url + '/metrics') as response:
+            assert response.headers['Content-Type'].startswith('text/plain')
+            samples = parse(response.read().decode())
+        assert samples['scatter_auction_nft_id{auction="%s"}' % auction.address] == 0
+
+        with pytest.raises(HTTPError):
+            urlopen(url + '/other')
+    finally:
+        server.shutdown()
@@ -0,0 +1,117 @@
+from brownie import ReentrantLotBidder, accounts, chain
+
+from scripts.auction_data import live_lots
+from scripts.deploy_helpers import deploy_multi_lot_auction
+from scripts.playground import reverts, toWei
+
+PARAMS = {
+    'max_supply': 5,
+    'reserve_price': 0.1,
+    'bid_increment': 0.05,
+    'auction_duration': 600,
+    'extra_bid_time': 60,
+    'lot_count': 3
+}
+
+def test_lots_run_in_parallel(deploy):
+    nft, _, auction = deploy(deploy_multi_lot_auction, **PARAMS)
+    lots = live_lots(auction)
+    assert sorted(lots) == [1, 2, 3]
+    assert auction.lotCount() == 3
+    assert nft.balanceOf(auction) == 3
+
+    auction.createBid(1, {'from': accounts[1], 'value': toWei(0.1)})
+    auction.createBid(3, {'from': accounts[2], 'value': toWei(0.2)})
+    auction.createBid(1, {'from': accounts[3], 'value': toWei(0.15)})
+
+    lots = live_lots(auction)
+    assert lots[1]['bidder'] == accounts[3] and lots[1]['amount'] == toWei(0.15)
+    assert lots[2]['amount'] == 0
+    assert lots[3]['bidder'] == accounts[2] and lots[3]['amount'] == toWei(0.2)
+    assert auction.balance() == toWei(0.35)
+
+    assert reverts(lambda: auction.createBid(4, {'from': accounts[1], 'value': toWei(0.1)}))
+    assert reverts(lambda: auction.createBid(1, {'from': accounts[1], 'value': toWei(0.19)}))
+
+def test_lots_settle_and_get_replaced(clock, deploy):
+    nft, _, auction = deploy(deploy_multi_lot_auction, **PARAMS)
+    auction.createBid(2, {'from': accounts[1], 'value': toWei(0.1)})
+
+    clock.jump_to(auction.lot(2)['endTime'] - 1)
+    assert reverts(lambda: auction.settleLot.call(
+        2, {'from': accounts[5]}, block_identifier=chain.height
+    ))
+
+    clock.jump_to(auction.lot(2)['endTime'])
+    assert reverts(lambda: auction.createBid(2, {'from': accounts[2], 'value': toWei(0.5)}))
+
+    tx = auction.settleLot(2, {'from': accounts[5]})
+    assert tx.events['AuctionSettled']['nftId'] == 2
+    assert tx.events['AuctionCreated']['nftId'] == 4
+    assert nft.ownerOf(2) == accounts[1]
+    assert nft.balance() == toWei(0.1)
+    assert sorted(live_lots(auction)) == [1, 3, 4]
+    assert reverts(lambda: auction.settleLot(2, {'from': accounts[5]}))
+
+    # Nobody bid on lots 1 and 3: they keep their NFT and run again.
+    tx = auction.settleLot(1, {'from': accounts[5]})
+    assert 'AuctionSettled' not in tx.events
+    assert tx.events['AuctionCreated']['nftId'] == 1
+    assert auction.lot(1)['endTime'] == tx.timestamp + PARAMS['auction_duration']
+    auction.settleLot(3, {'from': accounts[5]})
+    assert nft.ownerOf(1) == nft.ownerOf(3) == auction
+    assert sorted(live_lots(auction)) == [1, 3, 4]
+    assert not auction.hasEnded(block_identifier=chain.height)
+
+    # Only one lot is left under the max supply.
+    auction.createBid(1, {'from': accounts[2], 'value': toWei(0.1)})
+    clock.jump_to(auction.lot(1)['endTime'])
+    tx = auction.settleLot(1, {'from': accounts[5]})
+    assert nft.ownerOf(1) == accounts[2]
+    assert tx.events['AuctionCreated']['nftId'] == 5
+    assert sorted(live_lots(auction)) == [3, 4, 5]
+    assert auction.openLots({'from': accounts[5]}).return_value == 0
+
+def deploy_reentrant_bidder(auction):
+    return ReentrantLotBidder.deploy(auction, {'from': accounts[0]})
+
+def test_settle_to_reentrant_bidder(clock, deploy):
+    nft, _, auction = deploy(deploy_multi_lot_auction, **PARAMS)
+    bidder = deploy(deploy_reentrant_bidder, auction=auction)
+    bidder.createBid(2, {'from': accounts[1], 'value': toWei(0.1)})
+
+    clock.jump_to(auction.lot(2)['endTime'])
+    tx = auction.settleLot(2, {'from': accounts[5]})
+    assert nft.ownerOf(2) == bidder
+    # `openLots` was called back once the slot already held lot 4.
+    assert tx.events['AuctionCreated']['nftId'] == 4
+    assert len(tx.events['AuctionCreated']) == 1
+    assert sorted(live_lots(auction)) == [1, 3, 4]
+    assert auction.lot(4)['nftId'] == 4
+
+    auction.createBid(4, {'from': accounts[2], 'value': toWei(0.1)})
+    assert auction.lot(4)['bidder'] == accounts[2]
+    assert nft.ownerOf(4) == auction
+
+def test_lot_extension_and_credit(clock, deploy):
+    nft, _, auction = deploy(deploy_multi_lot_auction, **PARAMS)
+    auction.setCreditMode(True, {'from': accounts[0]})
+
+    end_time = auction.lot(3)['endTime']
+    auction.createBid(3, {'from': accounts[1], 'value': toWei(0.1)})
+    clock.jump_to(end_time - 30)
+    tx = auction.createBid(3, {'from': accounts[2], 'value': toWei(0.15)})
+
+    assert tx.events['AuctionBid']['extended']
+    assert auction.lot(3)['endTime'] == tx.timestamp + 60
+    assert auction.lot(1)['endTime'] == end_time
+    assert auction.creditOf(accounts[1]) == toWei(0.1)
+
+def test_lot_count_access(deploy):
+    nft, _, auction = deploy(deploy_multi_lot_auction, **PARAMS)
+    assert reverts(lambda: auction.setLotCount(4, {'from': accounts[1]}))
+    assert reverts(lambda: auction.setLotCount(2, {'from': accounts[0]}))
+
+    auction.setLotCount(4, {'from': accounts[0]})
+    assert auction.openLots({'from': accounts[1]}).return_value == 1
+    assert sorted(live_lots(auction)) == [1, 2, 3, 4]
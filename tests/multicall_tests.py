@@ -0,0 +1,86 @@
+import os
+from contextlib import contextmanager
+
+from brownie import accounts, web3
+
+from scripts.auction_data import AuctionData
+from scripts.deploy_helpers import deploy_multicall, deploy_scatter_auction
+from scripts.multicall import Multicall
+from scripts.playground import toWei, proofs, root, addr_to_derivs_held
+
+N_BIDDERS = 1000
+
+
+@contextmanager
+def count_eth_calls():
+    provider = web3.provider
+    make_request = provider.make_request
+    counter = {'eth_call': 0}
+
+    def counting(method, params):
+        if method == 'eth_call': counter['eth_call'] += 1
+        return make_request(method, params)
+
+    provider.make_request = counting
+    try:
+        yield counter
+    finally:
+        provider.make_request = make_request
+
+def test_multicall_reads_for_many_bidders(deploy):
+    nft, token, auction = deploy(deploy_scatter_auction, root=root)
+    multicall = deploy(deploy_multicall)
+
+    for i, bidder in enumerate(accounts[1:6]):
+        auction.createBid(1, {'from': bidder, 'value': toWei(0.1 + 0.05 * i)})
+        token.transfer(bidder, toWei(i), {'from': accounts[0]})
+
+    bidders = [x.address for x in accounts] + [
+        '0x' + os.urandom(20).hex() for _ in range(N_BIDDERS - len(accounts))
+    ]
+    holder, held = addr_to_derivs_held()[1]
+
+    with count_eth_calls() as single:
+        expected = [auction.auctionData(), auction.hasEnded()]
+        expected.append(auction.checkBidderRewardableTokens(proofs[1], holder, held))
+        for x in bidders:
+            expected += [auction.getSharesFor(x), token.balanceOf(x), nft.balanceOf(x)]
+
+    with count_eth_calls() as batched:
+        reads = Multicall(multicall, batch_size=400)
+        reads.add(auction.auctionData, decode=lambda x: AuctionData(x, None))
+        reads.add(auction.hasEnded)
+        reads.add(auction.checkBidderRewardableTokens, proofs[1], holder, held)
+        for x in bidders:
+            reads.add(auction.getSharesFor, x)
+            reads.add(token.balanceOf, x)
+            reads.add(nft.balanceOf, x)
+        results = reads.execute()
+
+    assert isinstance(results[0], AuctionData)
+    assert tuple(results[0].as_dict().values()) == tuple(expected[0])
+    assert results[1:] == expected[1:]
+    # Reads of accounts[k] start at 3 + 3 * k.
+    assert results[6] == toWei(0.1)
+    assert results[10] == toWei(1)
+    assert results[2]
+
+    assert single['eth_call'] == len(expected)
+    assert batched['eth_call'] == reads.requests == -(-len(expected) // 400)
+    # One estimate per method.
+    assert len(reads.gas_estimates) == 6
+
+def test_batches_sized_by_gas(deploy):
+    nft, token, auction = deploy(deploy_scatter_auction, root=root)
+    multicall = deploy(deploy_multicall)
+
+    # 105k gas per call with `CALL_GAS`, so 9 calls per batch.
+    reads = Multicall(multicall, gas_cap=10**6)
+    for x in accounts: reads.add(token.balanceOf, x, gas=100_000)
+    reads.add(auction.hasEnded, gas=100_000)
+    assert [len(x) for x in reads.batches(reads.calls)] == [9, 2]
+
+    with count_eth_calls() as batched:
+        results = reads.execute()
+    assert batched['eth_call'] == reads.requests == 2
+    assert results == [token.balanceOf(x) for x in accounts] + [auction.hasEnded()]
@@ -1,13 +1,14 @@
 from scripts.deploy_helpers import deploy_scatter_auction
-from time import sleep
-from brownie import chain, accounts
+from brownie import accounts
 from scripts.playground import toWei
 from scripts.playground import getparam
+from scripts.playground import reverts
 
 PLATFORM = '0x3C44CdDdB6a900fa2b585dd299e03d12FA4293BC'
 
-def test_withdraws():
-    nft, reward, auction = deploy_scatter_auction(
+def test_withdraws(clock, deploy):
+    nft, reward, auction = deploy(
+        deploy_scatter_auction,
         reserve_price=0.1,
         auction_duration=5,
         extra_bid_time=3,
@@ -18,21 +19,19 @@ def test_withdraws():
     auction.createBid(1, {'from': accounts[2], 'value': toWei(0.15)})
     auction.createBid(1, {'from': accounts[1], 'value': toWei(0.3)})
     
-    sleep(5)
-    chain.mine(1)
+    clock.to_end(auction)
 
     auction.createBid(2, {'from': accounts[3], 'value': toWei(0.1)})
-    sleep(3)
+    clock.advance(3)
     auction.createBid(2, {'from': accounts[2], 'value': toWei(0.15)})
-    sleep(1)
+    clock.advance(1)
     auction.createBid(2, {'from': accounts[3], 'value': toWei(0.3)})
-    sleep(1)
+    clock.advance(1)
     auction.createBid(2, {'from': accounts[2], 'value': toWei(0.4)})
-    sleep(1)
+    clock.advance(1)
     auction.createBid(2, {'from': accounts[4], 'value': toWei(0.5)})
-    sleep(3)
 
-    chain.mine(1)
+    clock.to_end(auction)
 
     auction.settleAuction({'from': accounts[5]})
 
@@ -48,3 +47,116 @@ def test_withdraws():
     assert plat.balance() == initial_platform_bal + toWei(0.04)
 
 
+def test_deferred_treasury_withdraw(clock, deploy):
+    nft, reward, auction = deploy(
+        deploy_scatter_auction,
+        reserve_price=0.1,
+        auction_duration=5,
+        extra_bid_time=3,
+        bid_increment=0.05
+    )
+    auction.setDeferredTreasury(True, {'from': accounts[0]})
+
+    auction.createBid(1, {'from': accounts[1], 'value': toWei(0.3)})
+    clock.to_end(auction)
+    tx = auction.createBid(2, {'from': accounts[2], 'value': toWei(0.5)})
+    assert 'AuctionSettled' in tx.events
+    clock.to_end(auction)
+    auction.settleAuction({'from': accounts[5]})
+
+    assert nft.balance() == 0
+    assert auction.pendingTreasury() == toWei(0.8)
+    assert getparam('nftContractBalance', auction) == toWei(0.8)
+
+    plat = accounts.at(PLATFORM, force=True)
+    initial_platform_bal = plat.balance()
+    initial_owner_bal = accounts[0].balance()
+
+    tx = nft.withdraw({'from': accounts[5]})
+    assert tx.events['AuctionTreasurySwept']['amount'] == toWei(0.8)
+
+    assert auction.pendingTreasury() == 0
+    assert auction.balance() == 0
+    assert accounts[0].balance() == initial_owner_bal + toWei(0.76)
+    assert plat.balance() == initial_platform_bal + toWei(0.04)
+
+def test_withdraw_with_eoa_auction_house(deploy):
+    nft, token, auction = deploy(deploy_scatter_auction, reserve_price=0.1)
+    house = accounts[6]
+    nft.setAuctionHouse(house, {'from': accounts[0]})
+    nft.lockAuctionHouse("forever", {'from': accounts[0]})
+    nft.mint({'from': house, 'value': toWei(0.5)})
+
+    initial_owner_bal = accounts[0].balance()
+    nft.withdraw({'from': accounts[5]})
+    assert nft.balance() == 0
+    assert accounts[0].balance() == initial_owner_bal + toWei(0.475)
+
+def test_withdraw_without_sweep_treasury(deploy):
+    nft, token, auction = deploy(deploy_scatter_auction, reserve_price=0.1)
+    # `TestToken` has neither `sweepTreasury` nor a fallback.
+    nft.setAuctionHouse(token, {'from': accounts[0]})
+    nft.lockAuctionHouse("forever", {'from': accounts[0]})
+    accounts[1].transfer(nft, toWei(0.1))
+
+    initial_owner_bal = accounts[0].balance()
+    nft.withdraw({'from': accounts[5]})
+    assert nft.balance() == 0
+    assert accounts[0].balance() == initial_owner_bal + toWei(0.095)
+
+def test_premint_batches(clock, deploy):
+    nft, reward, auction = deploy(
+        deploy_scatter_auction,
+        max_supply=5,
+        reserve_price=0.1,
+        auction_duration=5,
+        extra_bid_time=3
+    )
+    assert reverts(lambda: nft.mintBatch(2, {'from': accounts[0]}))
+    assert reverts(lambda: auction.setPremintBatchSize(3, {'from': accounts[1]}))
+    auction.setPremintBatchSize(3, {'from': accounts[0]})
+
+    tx = auction.createBid(1, {'from': accounts[1], 'value': toWei(0.1)})
+    assert tx.events['AuctionLotsPreminted'].values() == [1, 3]
+    assert nft.balanceOf(auction) == 3
+    assert auction.premintedUntil() == 3
+
+    for nft_id in [2, 3]:
+        clock.to_end(auction)
+        tx = auction.createBid(nft_id, {'from': accounts[1], 'value': toWei(0.1)})
+        assert 'AuctionLotsPreminted' not in tx.events
+
+    # Only the two lots left under `maxSupply` get minted.
+    clock.to_end(auction)
+    tx = auction.createBid(4, {'from': accounts[1], 'value': toWei(0.1)})
+    assert tx.events['AuctionLotsPreminted'].values() == [4, 5]
+    assert nft.totalSupply() == 5
+    assert reverts(lambda: auction.premint(1, {'from': accounts[0]}))
+
+    clock.to_end(auction)
+    auction.createBid(5, {'from': accounts[1], 'value': toWei(0.1)})
+    clock.to_end(auction)
+    auction.settleAuction({'from': accounts[1]})
+    assert nft.balanceOf(accounts[1]) == 5
+
+def test_premint_respects_mint_lock(clock, deploy):
+    nft, reward, auction = deploy(
+        deploy_scatter_auction,
+        max_supply=5,
+        reserve_price=0.1,
+        auction_duration=5,
+        extra_bid_time=3
+    )
+    assert reverts(lambda: auction.premint(6, {'from': accounts[0]}))
+    assert reverts(lambda: auction.premint(2, {'from': accounts[1]}))
+    auction.premint(2, {'from': accounts[0]})
+    nft.lockMint('forever', {'from': accounts[0]})
+
+    # Lots minted before the lock can still be auctioned.
+    auction.createBid(1, {'from': accounts[1], 'value': toWei(0.1)})
+    clock.to_end(auction)
+    auction.createBid(2, {'from': accounts[1], 'value': toWei(0.1)})
+    clock.to_end(auction)
+    assert reverts(
+        lambda: auction.createBid(3, {'from': accounts[1], 'value': toWei(0.1)})
+    )
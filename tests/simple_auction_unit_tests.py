@@ -1,6 +1,5 @@
-from brownie import accounts, chain
+from brownie import ScatterAuction, accounts, chain
 from web3 import Web3
-from time import sleep
 import pytest
 
 from scripts.playground import (
@@ -9,20 +8,25 @@ from scripts.playground import (
     getparam
 )
 
+from scripts.auction_data import auction_data
+
 from scripts.deploy_helpers import (
     deploy_simple_auction
     # as any_other_deployer to test LSP
 )
 
-def test_right_parameters():
+def test_right_parameters(deploy):
     expected_max_supply = 312
-    nft, _, auction = deploy_simple_auction(max_supply = expected_max_supply)
+    nft, _, auction = deploy(deploy_simple_auction, max_supply = expected_max_supply)
     assert getparam("maxSupply", auction) == expected_max_supply
     assert getparam("nftContract", auction) == nft.address
  
-def test_bid_ids():
+def test_bid_ids(deploy):
     bidder = accounts[1]
-    nft, _, auction = deploy_simple_auction(reserve_price=0.01, bid_increment=0.01)
+    nft, _, auction = deploy(
+        deploy_simple_auction,
+        reserve_price=0.01, bid_increment=0.01
+    )
 
     ids = [0, 1, 2, getparam('maxSupply', auction)+1, 12312312312, 1]
     prices = list(map(toWei, [0.1]*2 + [0.2]*4))
@@ -37,9 +41,12 @@ def test_bid_ids():
     assert reverts(mkbid(ids[4], prices[4]))
     assert not reverts(mkbid(ids[5], prices[5]))
     
-def test_bid_increment():
+def test_bid_increment(deploy):
     bidder = accounts[1]
-    nft, _, auction = deploy_simple_auction(reserve_price=0.01, bid_increment=0.01)
+    nft, _, auction = deploy(
+        deploy_simple_auction,
+        reserve_price=0.01, bid_increment=0.01
+    )
     prices = map(toWei, [0.01*i for i in range(1, 10)])
     prices2 = map(lambda x: x-1, prices)
     
@@ -51,19 +58,23 @@ def test_bid_increment():
         assert not reverts(mkbid(x))
         assert reverts(mkbid(y))
 
-def test_balances_for_one_bidder():
+def test_balances_for_one_bidder(deploy):
     bidder = accounts[1]
     initial_bal = bidder.balance()
-    nft, _, auction = deploy_simple_auction(reserve_price=0.01, bid_increment=0.01)
+    nft, _, auction = deploy(
+        deploy_simple_auction,
+        reserve_price=0.01, bid_increment=0.01
+    )
 
     prices = list(map(toWei, [0.01*i for i in range(1, 10)]))
     list(map(lambda x: auction.createBid(1, {'value': x, 'from': bidder}), prices))
 
     assert bidder.balance() == initial_bal - prices[-1]
 
-def test_bid_parameters():
+def test_bid_parameters(deploy):
     bidder = accounts[1]
-    nft, _, auction = deploy_simple_auction(
+    nft, _, auction = deploy(
+        deploy_simple_auction,
         reserve_price=0.01, auction_duration=5, extra_bid_time=3
     )
     auction.createBid(1, {'value': toWei(0.01), 'from': bidder})
@@ -75,20 +86,65 @@ def test_bid_parameters():
     assert getparam("startTime", auction) > 0
     assert getparam("endTime", auction) > getparam("startTime", auction)
 
-def test_auction_ending():
+def test_auction_data_snapshot(deploy):
     bidder = accounts[1]
-    nft, _, auction = deploy_simple_auction(
+    nft, _, auction = deploy(deploy_simple_auction, reserve_price=0.01)
+
+    data = auction_data(auction)
+    assert data is auction_data(auction)
+    assert data.nftContract == nft.address
+    assert data.amount == 0
+
+    auction.createBid(1, {'value': toWei(0.01), 'from': bidder})
+
+    assert auction_data(auction) is not data
+    assert auction_data(auction, data.block) is data
+    assert auction_data(auction).amount == toWei(0.01)
+    assert auction_data(auction).bidder == bidder
+    assert tuple(auction.auctionData()) == tuple(auction_data(auction).as_dict().values())
+
+def test_auction_ending(clock, deploy):
+    bidder = accounts[1]
+    nft, _, auction = deploy(
+        deploy_simple_auction,
         reserve_price=0.01, auction_duration=3, extra_bid_time=2
     )
     auction.createBid(1, {'value': toWei(0.01), 'from': bidder})
-    sleep(5)
-    chain.mine(1)
+    clock.to_end(auction)
 
-    assert auction.hasEnded()
+    assert auction.hasEnded(block_identifier=chain.height)
 
-def test_auction_settling():
+def test_time_buffer_extension(clock, deploy):
     bidder = accounts[1]
-    nft, _, auction = deploy_simple_auction(
+    nft, _, auction = deploy(
+        deploy_simple_auction,
+        reserve_price=0.01,
+        bid_increment=0.01,
+        auction_duration=600,
+        extra_bid_time=60
+    )
+    auction.createBid(1, {'value': toWei(0.01), 'from': bidder})
+    end_time = getparam("endTime", auction)
+
+    clock.to_buffer(auction, -10)
+    tx = auction.createBid(1, {'value': toWei(0.02), 'from': bidder})
+    assert not tx.events['AuctionBid']['extended']
+    assert getparam("endTime", auction) == end_time
+
+    clock.to_buffer(auction, 1)
+    tx = auction.createBid(1, {'value': toWei(0.03), 'from': bidder})
+    assert tx.events['AuctionBid']['extended']
+    assert getparam("endTime", auction) == tx.timestamp + 60
+
+    clock.to_end(auction, -1)
+    assert not auction.hasEnded(block_identifier=chain.height)
+    clock.to_end(auction)
+    assert auction.hasEnded(block_identifier=chain.height)
+
+def test_auction_settling(clock, deploy):
+    bidder = accounts[1]
+    nft, _, auction = deploy(
+        deploy_simple_auction,
         reserve_price=0.01, auction_duration=3, extra_bid_time=2
     )
     auction.createBid(1, {'value': toWei(0.01), 'from': bidder})
@@ -98,8 +154,7 @@ def test_auction_settling():
     assert nft.balanceOf(bidder) == 0
     assert nft.balanceOf(auction.address) == 1
 
-    sleep(5)
-    chain.mine(1)
+    clock.to_end(auction)
 
     auction.settleAuction({'from': bidder})
     assert nft.balanceOf(bidder) == 1
@@ -107,16 +162,16 @@ def test_auction_settling():
     assert auction.balance() == 0
     assert nft.balance() == toWei(0.01)
 
-def test_auction_new_bid_initialization():
+def test_auction_new_bid_initialization(clock, deploy):
     bidder = accounts[1]
-    nft, _, auction = deploy_simple_auction(
+    nft, _, auction = deploy(
+        deploy_simple_auction,
         reserve_price=0.01, auction_duration=3, extra_bid_time=2
     )
     auction.createBid(1, {'value': toWei(0.01), 'from': bidder})
     assert auction.balance() == toWei(0.01)
 
-    sleep(5)
-    chain.mine(1)
+    clock.to_end(auction)
 
     assert nft.balance() == 0 # It has to be settled
    
@@ -129,8 +184,7 @@ def test_auction_new_bid_initialization():
     assert nft.balanceOf(new_bidder) == 0
     assert auction.balance() == toWei(0.01)
 
-    sleep(5)
-    chain.mine(1)
+    clock.to_end(auction)
 
     assert auction.balance() == toWei(0.01)
     assert nft.balance() == toWei(0.01)
@@ -139,15 +193,15 @@ def test_auction_new_bid_initialization():
     assert auction.balance() == 0
     assert nft.balance() == toWei(0.01) * 2
 
-def test_withdraw_eth():
+def test_withdraw_eth(clock, deploy):
     bidder = accounts[1]
-    nft, _, auction = deploy_simple_auction(
+    nft, _, auction = deploy(
+        deploy_simple_auction,
         reserve_price=0.01, auction_duration=3, extra_bid_time=2
     )
     auction.createBid(1, {'value': toWei(0.01), 'from': bidder})
 
-    sleep(5)
-    chain.mine(1)
+    clock.to_end(auction)
 
     initial_bal = accounts[0].balance()
     
@@ -160,9 +214,10 @@ def test_withdraw_eth():
     assert nft.balance() == 0
     assert accounts[0].balance() > initial_bal + toWei(0.009)
 
-def test_total_withdraw_after_total_supply():
+def test_total_withdraw_after_total_supply(clock, deploy):
     bidder = accounts[1]
-    nft, _, auction = deploy_simple_auction(
+    nft, _, auction = deploy(
+        deploy_simple_auction,
         max_supply=1, 
         reserve_price=0.01,
         auction_duration=3,
@@ -170,8 +225,7 @@ def test_total_withdraw_after_total_supply():
     )
     auction.createBid(1, {'value': toWei(0.01), 'from': bidder})
 
-    sleep(5)
-    chain.mine(1)
+    clock.to_end(auction)
     
     initial_bal = accounts[0].balance()
     assert auction.balance() == toWei(0.01)
@@ -182,9 +236,10 @@ def test_total_withdraw_after_total_supply():
     assert nft.balance() == 0
     assert accounts[0].balance() > initial_bal
 
-def test_cant_bid_after_total_supply():
+def test_cant_bid_after_total_supply(clock, deploy):
     bidder = accounts[1]
-    nft, _, auction = deploy_simple_auction(
+    nft, _, auction = deploy(
+        deploy_simple_auction,
         max_supply=1, 
         reserve_price=0.01,
         auction_duration=3,
@@ -192,8 +247,7 @@ def test_cant_bid_after_total_supply():
     )
     auction.createBid(1, {'value': toWei(0.01), 'from': bidder})
 
-    sleep(5)
-    chain.mine(1)
+    clock.to_end(auction)
 
     new_bidder = accounts[2]
     assert not reverts(
@@ -217,14 +271,101 @@ def test_cant_bid_after_total_supply():
     assert nft.balanceOf(new_bidder) == 0
     assert nft.balanceOf(bidder) == 1
 
-@pytest.mark.skip
-def test_multiple_biddings_and_mintings():
-    assert False
+def test_credit_mode(deploy):
+    bidder, rival = accounts[1], accounts[2]
+    nft, _, auction = deploy(
+        deploy_simple_auction,
+        reserve_price=0.01, bid_increment=0.01
+    )
+    assert reverts(lambda: auction.setCreditMode(True, {'from': bidder}))
+    auction.setCreditMode(True, {'from': accounts[0]})
+    assert auction.creditMode()
+
+    auction.createBid(1, {'value': toWei(0.01), 'from': bidder})
+    initial_bal = bidder.balance()
+    auction.createBid(1, {'value': toWei(0.02), 'from': rival})
+
+    assert bidder.balance() == initial_bal
+    assert auction.creditOf(bidder) == toWei(0.01)
+    assert auction.balance() == toWei(0.03)
+
+    assert reverts(lambda: auction.createBidWithCredit(
+        1, toWei(0.02), {'value': toWei(0.01), 'from': bidder}
+    ))
+    tx = auction.createBidWithCredit(
+        1, toWei(0.01), {'value': toWei(0.02), 'from': bidder}
+    )
+    assert tx.events['AuctionBid']['amount'] == toWei(0.03)
+    assert getparam('amount', auction) == toWei(0.03)
+    assert auction.creditOf(bidder) == 0
+    assert auction.creditOf(rival) == toWei(0.02)
+
+    auction.setCreditMode(False, {'from': accounts[0]})
+    rival_bal = rival.balance()
+    tx = auction.withdrawCredit({'from': rival})
+    assert rival.balance() == rival_bal + toWei(0.02) - tx.gas_used * tx.gas_price
+    assert auction.creditOf(rival) == 0
+    assert reverts(lambda: auction.withdrawCredit({'from': rival}))
+    assert auction.balance() == toWei(0.03)
+
+def test_multiple_biddings_and_mintings(clock, deploy):
+    bidders = accounts[1:4]
+    nft, _, auction = deploy(
+        deploy_simple_auction,
+        reserve_price=0.01, bid_increment=0.01, auction_duration=60, extra_bid_time=10
+    )
+
+    for nft_id in range(1, 4):
+        for i, bidder in enumerate(bidders):
+            auction.createBid(nft_id, {'value': toWei(0.01 * (i + 1)), 'from': bidder})
+        assert getparam('bidder', auction) == bidders[-1]
+        assert auction.balance() == toWei(0.03)
+        clock.to_end(auction)
+
+    # The next bid settles lot 3.
+    auction.createBid(4, {'value': toWei(0.01), 'from': bidders[0]})
+    assert getparam('nftId', auction) == 4
+    assert nft.balanceOf(bidders[-1]) == 3
+    assert nft.balance() == toWei(0.09)
+    assert auction.balance() == toWei(0.01)
+
+def test_multiple_biddings_and_mintings_until_sold_out(clock, deploy):
+    bidder, rival = accounts[1], accounts[2]
+    nft, _, auction = deploy(
+        deploy_simple_auction,
+        max_supply=3, reserve_price=0.01, auction_duration=60, extra_bid_time=10
+    )
 
-@pytest.mark.skip
-def test_multiple_biddings_and_mintings_until_sold_out():
-    assert False
+    for nft_id in range(1, 4):
+        auction.createBid(nft_id, {'value': toWei(0.01), 'from': bidder})
+        auction.createBid(nft_id, {'value': toWei(0.06), 'from': rival})
+        clock.to_end(auction)
+
+    # Settles the last lot and refunds the bid.
+    initial_bal = bidder.balance()
+    tx = auction.createBid(4, {'value': toWei(0.01), 'from': bidder})
+    assert bidder.balance() == initial_bal - tx.gas_used * tx.gas_price
+    assert 'AuctionBid' not in tx.events
+    assert getparam('settled', auction)
+    assert getparam('nftId', auction) == 3
+
+    assert nft.balanceOf(rival) == 3
+    assert nft.nextTokenId() == 4
+    assert nft.balance() == toWei(0.18)
+    assert auction.balance() == 0
+
+    assert reverts(lambda: auction.createBid(4, {'value': toWei(0.01), 'from': bidder}))
+    assert reverts(lambda: auction.settleAuction({'from': bidder}))
 
-@pytest.mark.skip
 def test_bid_before_initialization():
-    assert False
+    auction = ScatterAuction.deploy({'from': accounts[0]})
+    bidder = accounts[1]
+
+    assert reverts(lambda: auction.createBid(1, {'value': toWei(0.1), 'from': bidder}))
+    assert reverts(lambda: auction.settleAuction({'from': bidder}))
+    assert reverts(lambda: auction.setReservePrice(toWei(0.1), {'from': accounts[0]}))
+    assert reverts(lambda: auction.initialize(
+        bidder, 1, toWei(0.1), toWei(0.05), 60, 10, {'from': bidder}
+    ))
+    assert getparam('startTime', auction) == 0
+    assert auction.balance() == 0
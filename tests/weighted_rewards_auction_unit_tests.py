@@ -13,12 +13,24 @@ from scripts.playground import (
     change_random_hex,
     reverts
 )
-from random import randint
+from scripts.merkle import HolderMerkleTree, IncrementalMerkleTree, address_bytes, to_hex
+from scripts.proof_index import ProofIndex, write_proof_index
+from scripts.rewards import (
+    RewardsConfig,
+    compute_rewards,
+    distribution_args,
+    read_shares,
+    required_funding,
+    shares_from_bids
+)
+from random import Random, randint, sample
+import os
 
 ZERO = f'0x{"0"*40}'
 
-def test_merkle_root_proof():
-    nft, reward, auction = deploy_weighted_rewarded_auction(
+def test_merkle_root_proof(deploy):
+    nft, reward, auction = deploy(
+        deploy_weighted_rewarded_auction,
         reserve_price = 0.01,
         bid_increment = 0.01,
         root=root
@@ -31,8 +43,9 @@ def test_merkle_root_proof():
             proof, addr.address, helds
         )
 
-def test_merkle_root_invalid_proof():
-    nft, reward, auction = deploy_weighted_rewarded_auction(
+def test_merkle_root_invalid_proof(deploy):
+    nft, reward, auction = deploy(
+        deploy_weighted_rewarded_auction,
         reserve_price = 0.01,
         bid_increment = 0.01,
         root=root
@@ -57,8 +70,56 @@ def test_merkle_root_invalid_proof():
             proof, change_random_hex(addr.address), helds
         )
 
-def test_empty_rewards_claim():
-    nft, reward, auction = deploy_weighted_rewarded_auction(
+def test_generated_merkle_proofs(deploy):
+    addrs = [os.urandom(20) for _ in range(37)] + [x.address for x in accounts]
+    helds = [randint(0, 50) for _ in addrs]
+    tree = HolderMerkleTree.build(addrs, helds)
+
+    nft, reward, auction = deploy(
+        deploy_weighted_rewarded_auction,
+        reserve_price = 0.01,
+        bid_increment = 0.01,
+        root=to_hex(tree.root)
+    )
+
+    for i, (addr, held) in enumerate(zip(addrs, helds)):
+        proof = list(map(to_hex, tree.proof(i)))
+        addr = '0x' + addr.hex() if isinstance(addr, bytes) else addr
+        assert auction.checkBidderRewardableTokens(proof, addr, held)
+        assert not auction.checkBidderRewardableTokens(proof, addr, held + 1)
+
+def test_proof_index_claim(tmp_path, deploy):
+    holders = [x.address for x in accounts] + [os.urandom(20) for _ in range(100)]
+    helds = [randint(1, 9) for _ in holders]
+    tree = HolderMerkleTree.build(holders, helds)
+    write_proof_index(tmp_path / 'holders.idx', tree, holders, helds)
+
+    nft, reward, auction = deploy(
+        deploy_weighted_rewarded_auction,
+        reserve_price = 0.1,
+        bid_increment = 0.05,
+        root=to_hex(tree.root)
+    )
+    reward.transfer(auction, toWei(100), {'from': accounts[0]})
+
+    bidder = accounts[4]
+    auction.createBid(1, {'from': bidder, 'value': toWei(0.1)})
+
+    with ProofIndex(tmp_path / 'holders.idx') as index:
+        assert index.root == tree.root
+        assert index.lookup(os.urandom(20)) is None
+
+        held, proof = index.lookup(bidder)
+        proof = [to_hex(node) for node in proof]
+
+    assert held == helds[4]
+    expected = auction.getRewardsFor(bidder, held)
+    auction.claimRewardTokensBasedOnShares(proof, held, {'from': bidder})
+    assert reward.balanceOf(bidder) == expected
+
+def test_empty_rewards_claim(deploy):
+    nft, reward, auction = deploy(
+        deploy_weighted_rewarded_auction,
         reserve_price = 0.01,
         bid_increment = 0.01,
         root=root
@@ -85,8 +146,9 @@ def test_empty_rewards_claim():
     assert reward.balanceOf(bidder) == 0
     assert reward.balanceOf(rewarded_bidder) == 0
 
-def test_reward_claim_without_tokens_in_contract():
-    nft, reward, auction = deploy_weighted_rewarded_auction(
+def test_reward_claim_without_tokens_in_contract(deploy):
+    nft, reward, auction = deploy(
+        deploy_weighted_rewarded_auction,
         reserve_price = 0.1,
         bid_increment = 0.05,
         root=root
@@ -133,8 +195,9 @@ def test_reward_claim_without_tokens_in_contract():
         rewarded_bidder, rewarded_bidder_holds
     )
 
-def test_reward_claim():
-    nft, reward, auction = deploy_weighted_rewarded_auction(
+def test_reward_claim(deploy):
+    nft, reward, auction = deploy(
+        deploy_weighted_rewarded_auction,
         reserve_price = 0.1,
         bid_increment = 0.05,
         root=root
@@ -180,6 +243,8 @@ def test_reward_claim():
     )
 
     assert reward.balanceOf(rewarded_bidder) > 0
+    assert auction.hasClaimedRewards(rewarded_bidder)
+    assert auction.getSharesFor(rewarded_bidder) == 0
     assert reward.balanceOf(bidder) == rewards[bidder]
     assert reward.balanceOf(rewarded_bidder) == rewards[rewarded_bidder]
     assert (
@@ -187,8 +252,239 @@ def test_reward_claim():
         initia_bal - rewards[bidder] - rewards[rewarded_bidder]
     )
 
-def test_access():
-    nft, reward, auction = deploy_weighted_rewarded_auction(
+def test_batch_rewards_match_contract(deploy):
+    nft, reward, auction = deploy(
+        deploy_weighted_rewarded_auction,
+        reserve_price = 0.01,
+        bid_increment = 0.0013,
+        reward_ratio = (7, 3),
+        extra_ratio = (5, 7),
+        root=root
+    )
+    bidders = accounts[1:8]
+    bids = []
+    min_bid = toWei(0.01)
+    for _ in range(30):
+        bidder = bidders[randint(0, len(bidders) - 1)]
+        value = min_bid + randint(0, 10**9)
+        tx = auction.createBid(1, {'from': bidder, 'value': value})
+        bids.append(tx.events['AuctionBid'])
+        min_bid = value + toWei(0.0013)
+
+    helds = {x.address: randint(0, 9) for x in bidders}
+    shares = read_shares(auction, bidders, batch=3)
+    assert {k: v for k, v in shares.items() if v} == shares_from_bids(bids)
+    assert RewardsConfig.read(auction).reward_ratio == (7, 3)
+
+    rewards = compute_rewards(shares, RewardsConfig.read(auction), helds)
+    for bidder in bidders:
+        assert rewards[bidder.address] == auction.getRewardsFor(
+            bidder, helds[bidder.address]
+        )
+
+    total, _ = required_funding(auction, bidders, helds)
+    assert total == sum(rewards.values())
+
+def test_packed_rewards_config(deploy):
+    nft, reward, auction = deploy(
+        deploy_weighted_rewarded_auction,
+        reward_ratio = (2**56 - 1, 3),
+        extra_ratio = (5, 7),
+        root=root
+    )
+    config = RewardsConfig.read(auction)
+    assert config.reward_ratio == (2**56 - 1, 3)
+    assert config.extra_ratio == (5, 7)
+
+    # Every component is limited to 56 bits, wei-precision ratios included.
+    for reward_ratio, extra_ratio in [
+        ((2**56, 1), (0, 0)),
+        ((10**18, 1), (0, 0)),
+        ((1, 10**18), (0, 0)),
+        ((1, 1), (5, 2**56)),
+    ]:
+        assert reverts(lambda: auction.configureRewards(
+            reward, reward_ratio, extra_ratio, root, {'from': accounts[0]}
+        ))
+    assert RewardsConfig.read(auction).reward_ratio == (2**56 - 1, 3)
+
+    bidder = accounts[1]
+    assert not auction.hasClaimedRewards(bidder)
+    auction.createBid(1, {'from': bidder, 'value': toWei(0.1)})
+    assert auction.getRewardsFor(bidder, 4) == (
+        toWei(0.1) * (2**56 - 1) // 3 * (1 + 4 * 5 // 7)
+    )
+
+def test_verified_holdings_cache(deploy):
+    holders = [x.address for x in accounts[1:4]]
+    helds = [2, 5, 7]
+    tree = HolderMerkleTree.build(holders, helds)
+    nft, reward, auction = deploy(
+        deploy_weighted_rewarded_auction,
+        reserve_price = 0.01,
+        bid_increment = 0.01,
+        root=to_hex(tree.root)
+    )
+    reward.transfer(auction, toWei(100), {'from': accounts[0]})
+    bidder = accounts[2]
+
+    assert auction.getVerifiedHoldings(bidder) == (False, 0)
+    auction.createBid(1, {'from': bidder, 'value': toWei(0.01)})
+    proof = list(map(to_hex, tree.proof(1)))
+    auction.claimRewardTokensBasedOnShares(proof, 5, {'from': bidder})
+    assert auction.getVerifiedHoldings(bidder) == (True, 5)
+
+    # Same root: the cached holdings are used, whatever is sent.
+    auction.createBid(1, {'from': bidder, 'value': toWei(0.02)})
+    expected = auction.getRewardsFor(bidder, 5)
+    balance = reward.balanceOf(bidder)
+    auction.claimRewardTokensBasedOnShares([], 0, {'from': bidder})
+    assert reward.balanceOf(bidder) == balance + expected
+
+    # A new root invalidates the cache.
+    config = RewardsConfig.read(auction)
+    auction.configureRewards(
+        reward, config.reward_ratio, config.extra_ratio, root, {'from': accounts[0]}
+    )
+    assert auction.getVerifiedHoldings(bidder) == (False, 0)
+
+    auction.createBid(1, {'from': bidder, 'value': toWei(0.03)})
+    expected = auction.getRewardsFor(bidder, 0)
+    balance = reward.balanceOf(bidder)
+    auction.claimRewardTokensBasedOnShares([], 5, {'from': bidder})
+    assert reward.balanceOf(bidder) == balance + expected
+
+def test_incremental_merkle_tree():
+    rng = Random(22)
+    holders = [rng.randbytes(20) for _ in range(37)]
+    tree = IncrementalMerkleTree.build(holders, [rng.randint(1, 9) for _ in holders])
+
+    for _ in range(30):
+        proofs = [tree.proof(i) for i in range(len(tree))]
+        addrs, _ = tree.holders()
+        tree.clear_changes()
+
+        changes = [(rng.randbytes(20), rng.randint(1, 9)) for _ in range(rng.randint(0, 3))]
+        changes += [(x, rng.randint(0, 9)) for x in rng.sample(addrs, rng.randint(1, 4))]
+        tree.update(changes)
+
+        fresh = HolderMerkleTree.build(*tree.holders())
+        assert tree.root == fresh.root
+        assert tree.levels == fresh.levels
+
+        changed = dict(tree.changed_proofs())
+        for i in range(len(tree)):
+            if i in changed: assert changed[i] == fresh.proof(i)
+            else: assert tree.addrs[i] == addrs[i] and proofs[i] == fresh.proof(i)
+
+    with pytest.raises(ValueError):
+        IncrementalMerkleTree.build(holders[:1], [1]).set(holders[0], 0)
+
+def test_incremental_merkle_tree_depth_change():
+    holders = [bytes([i + 1]) * 20 for i in range(33)]
+    tree = IncrementalMerkleTree.build(holders[:5], [1] * 5)
+    assert tree.depth == 3
+
+    # 4 leaves fit in a tree of depth 2: every proof gets shorter.
+    tree.clear_changes()
+    tree.set(holders[4], 0)
+    assert tree.depth == 2
+    fresh = HolderMerkleTree.build(*tree.holders())
+    assert dict(tree.changed_proofs()) == {i: fresh.proof(i) for i in range(4)}
+
+    # Past 32 leaves, every proof gets longer.
+    tree.update((x, 1) for x in holders[4:32])
+    tree.clear_changes()
+    tree.set(holders[32], 1)
+    assert tree.depth == 6
+    fresh = HolderMerkleTree.build(*tree.holders())
+    assert tree.root == fresh.root
+    assert dict(tree.changed_proofs()) == {i: fresh.proof(i) for i in range(33)}
+
+def test_incremental_merkle_tree_remove_last():
+    holders = [bytes([i + 1]) * 20 for i in range(12)]
+    tree = IncrementalMerkleTree.build(holders, [1] * 12)
+    proofs = [tree.proof(i) for i in range(11)]
+
+    # The sibling of leaf 10 becomes the zero node.
+    tree.clear_changes()
+    tree.set(holders[11], 0)
+    changed = dict(tree.changed_proofs())
+    assert 10 in changed
+    for i in range(11):
+        proof = changed.get(i, proofs[i])
+        assert tree.verify(proof, tree.leaf(i))
+        assert proof == tree.proof(i)
+
+def test_incremental_root_update(deploy):
+    holders = [os.urandom(20) for _ in range(20)] + [x.address for x in accounts[1:4]]
+    tree = IncrementalMerkleTree.build(holders, [3] * len(holders))
+    nft, reward, auction = deploy(
+        deploy_weighted_rewarded_auction,
+        reserve_price = 0.01,
+        bid_increment = 0.01,
+        root=to_hex(tree.root)
+    )
+
+    tree.update([(accounts[1], 8), (accounts[4], 2), (holders[0], 0)])
+    config = RewardsConfig.read(auction)
+    auction.configureRewards(
+        reward, config.reward_ratio, config.extra_ratio, to_hex(tree.root),
+        {'from': accounts[0]}
+    )
+
+    for account in accounts[1:5]:
+        held = tree.held(account)
+        proof = list(map(to_hex, tree.proof(tree.positions[address_bytes(account)])))
+        assert auction.checkBidderRewardableTokens(proof, account.address, held)
+        assert not auction.checkBidderRewardableTokens(proof, account.address, held + 1)
+
+def test_distribute_rewards(deploy):
+    holders = [os.urandom(20) for _ in range(50)] + [x.address for x in accounts[1:6]]
+    helds = [randint(1, 9) for _ in holders]
+    tree = HolderMerkleTree.build(holders, helds)
+    positions = {x: i for i, x in enumerate(holders)}
+    helds = dict(zip(holders, helds))
+
+    nft, reward, auction = deploy(
+        deploy_weighted_rewarded_auction,
+        reserve_price = 0.01,
+        bid_increment = 0.01,
+        root=to_hex(tree.root)
+    )
+    reward.transfer(auction, toWei(100), {'from': accounts[0]})
+
+    bidders = accounts[1:9]
+    for i, bidder in enumerate(bidders):
+        auction.createBid(1, {'from': bidder, 'value': toWei(0.01) * (i + 1)})
+
+    expected = {
+        x.address: auction.getRewardsFor(x, helds.get(x.address, 0))
+        for x in bidders
+    }
+    args = distribution_args(tree, positions, reversed(bidders), helds)
+
+    bad_helds = list(args[1])
+    bad_helds[0] += 1
+    assert reverts(lambda: auction.distributeRewards(
+        args[0], bad_helds, args[2], args[3], {'from': accounts[0]}
+    ))
+    assert reverts(lambda: auction.distributeRewards(*args, {'from': bidders[0]}))
+
+    auction.distributeRewards(*args, {'from': accounts[0]})
+    for bidder in bidders:
+        assert reward.balanceOf(bidder) == expected[bidder.address]
+        assert auction.getSharesFor(bidder) == 0
+        held = helds.get(bidder.address, 0)
+        assert auction.getVerifiedHoldings(bidder) == (held != 0, held)
+
+    # Paid bidders are skipped.
+    auction.distributeRewards(*args, {'from': accounts[0]})
+    assert reward.balanceOf(auction) == toWei(100) - sum(expected.values())
+
+def test_access(deploy):
+    nft, reward, auction = deploy(
+        deploy_weighted_rewarded_auction,
         reserve_price = 0.1,
         bid_increment = 0.05,
         root=root
@@ -204,6 +500,7 @@ def test_access():
         lambda: auction.configureRewards(ZERO, (0,0), (0,0), 0, {'from': hacker}),
         lambda: auction.createBid(1, {'from': hacker, 'value': toWei(0.1499)}),
         lambda: auction.withdrawRewardToken({'from': hacker}),
+        lambda: auction.distributeRewards([bidder], [0], [], [], {'from': hacker}),
         lambda: auction.setTimeBuffer(1, {'from': hacker}),
         lambda: auction.setDuration(1, {'from': hacker}),
         lambda: auction.settleAuction({'from': hacker})